@@ -0,0 +1,580 @@
+"""
+/***************************************************************************
+ **SWATPlus-IAHRIS
+ **A software that links SWATPlus to IAHRIS to automatically generate reports on Indicators of Hydrologic Alteration in RIverS.
+ **Headless batch mode: one IAHRIS report set per channel, spread across a process pool.
+----------------------------------------------------
+        begin                : **May-2025
+        copyright            : **COPYRIGHT
+        email                : **alopbal@upv.es
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 3 of the License, or     *
+ *   any later version.                                                    *
+ *                                                                         *
+ ***************************************************************************/
+
+Usage:
+    python main.py batch --scenarios C:\\Model\\Scenarios --nat Default --alt Reservoir
+        --units all --output C:\\Reports --workers 4
+
+The inputs are written and the reports post-processed by --workers processes while
+up to --iahris-jobs IAHRIS runs go on at the same time (see scheduler.py). Every
+job has its own working folder and IAHRIS project (see pipeline.new_job_id).
+
+Reports of inputs that were already reported are copied from report_cache.py
+instead of running IAHRIS again.
+
+Several alternatives (--alt Reservoir,Dam,Canal) are compared with the same natural
+flow in a single IAHRIS project per channel: the natural series is extracted and
+loaded once, and there is one report per alternative (in a folder named after it).
+"""
+
+import argparse
+import os
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import csv_flow
+import iahris_pipeline as pipeline
+import instrumentation
+import report_cache
+import scenario_store
+import scheduler
+import swatplus_text
+from config import IAHRIS_PARALLEL
+
+
+# Months with missing days listed in the warning of a monthly input file
+MAX_LISTED_MONTHS = 10
+
+
+def build_parser(prog="main.py batch"):
+    """Parser of the command-line arguments of the batch mode (also used by watch)"""
+
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description="Generate IAHRIS reports for many SWAT+ channels without the GUI.",
+    )
+    parser.add_argument(
+        "--scenarios", help="SWAT+ 'Scenarios' folder (required for SWAT+ inputs)"
+    )
+    parser.add_argument(
+        "--nat", required=True, help="Natural scenario name or natural flow CSV file"
+    )
+    parser.add_argument(
+        "--alt",
+        required=True,
+        help="Altered scenario name or altered flow CSV file (or a comma separated "
+        "list of them to compare several alternatives with the same natural flow)",
+    )
+    parser.add_argument(
+        "--units",
+        default="all",
+        help="'all' or a comma separated list of channel units (e.g. 1,5,12)",
+    )
+    parser.add_argument("--start-nat", type=int, help="First year of the natural period")
+    parser.add_argument("--end-nat", type=int, help="Last year of the natural period")
+    parser.add_argument("--start-alt", type=int, help="First year of the altered period")
+    parser.add_argument("--end-alt", type=int, help="Last year of the altered period")
+    parser.add_argument(
+        "--output", required=True, help="Folder to save the reports (one per unit)"
+    )
+    parser.add_argument(
+        "--themes",
+        default="all",
+        help="'all', 'none' or a comma separated list of: "
+        + ", ".join(pipeline.THEMES),
+    )
+    parser.add_argument(
+        "--monthly",
+        action="store_true",
+        help="Experimental (batch and watch only, not in the GUI): monthly IAHRIS "
+        "inputs (contributions in hm3 summed by SQLite) instead of daily ones, for "
+        "first-pass assessments. The flags of the IAHRIS script for monthly "
+        "(MENSUAL) inputs have not been checked against IAHRIS",
+    )
+    parser.add_argument(
+        "--extraction",
+        choices=["single-pass", "per-unit"],
+        default="single-pass",
+        help="Read 'channel_sd_day' once for all channels (single-pass) or once per channel",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=max(1, (os.cpu_count() or 2) // 2),
+        help="Number of worker processes (inputs and post-processing)",
+    )
+    parser.add_argument(
+        "--iahris-jobs",
+        type=int,
+        default=IAHRIS_PARALLEL,
+        help="Number of IAHRIS runs at the same time (default: SWATPLUS_IAHRIS_PARALLEL or 1)",
+    )
+    return parser
+
+
+def parse_args(argv):
+    """Command-line arguments of the batch mode"""
+    return build_parser().parse_args(argv)
+
+
+def is_csv(source):
+    """True if the nat/alt argument is a CSV file instead of a scenario name"""
+    return source.lower().endswith(".csv")
+
+
+def source_names(sources):
+    """List of the comma separated nat/alt sources of an argument"""
+    return [source.strip() for source in sources.split(",") if source.strip()]
+
+
+def scenario_name(source):
+    """Scenario name of a nat/alt source (the file name for CSV files)"""
+    return pipeline.csv_scenario_name(source) if is_csv(source) else source
+
+
+def source_metadata(args, source):
+    """Channels (None for CSV files) and min/max years of a nat/alt source"""
+
+    if is_csv(source):
+        try:
+            series = csv_flow.load_flow_csv(source)
+        except csv_flow.CsvFlowError as error:
+            raise SystemExit(f"{source}: {error.title}. {error}")
+        first_year, last_year = series.year_range()
+        return None, first_year, last_year
+
+    if not args.scenarios:
+        raise SystemExit("--scenarios is required for SWAT+ scenario inputs")
+    sqlite = pipeline.scenario_output(args.scenarios, source)
+    if not os.path.exists(sqlite):
+        raise SystemExit(
+            f"SWAT+ outputs not found: {sqlite} (or TxtInOut/{swatplus_text.TEXT_FILE})"
+        )
+    return pipeline.scenario_metadata(sqlite)
+
+
+def select_units(units, channels_nat, channels_alt):
+    """Channel units to process (shared by both scenarios when 'all')"""
+
+    available = [c for c in (channels_alt or channels_nat or []) if c]
+    if channels_nat and channels_alt:
+        available = [c for c in channels_alt if c in set(channels_nat)]
+
+    if units == "all":
+        return available
+
+    selected = [u.strip() for u in units.split(",") if u.strip()]
+    missing = [u for u in selected if available and u not in available]
+    if missing:
+        raise SystemExit(f"Channel units not found: {', '.join(missing)}")
+    return selected
+
+
+def build_jobs(args):
+    """One job (dict of plain values, picklable) per channel unit"""
+
+    alts = source_names(args.alt)
+    channels_nat, min_nat, max_nat = source_metadata(args, args.nat)
+    metadata_alt = [source_metadata(args, alt) for alt in alts]
+
+    # IAHRIS identifies the alternatives of a project by their (short) names
+    short_names = [scenario_name(alt)[: pipeline.IAHRIS_NAME_LENGTH] for alt in alts]
+    duplicated = sorted({name for name in short_names if short_names.count(name) > 1})
+    if duplicated:
+        raise SystemExit(
+            f"Alternatives must differ in their first {pipeline.IAHRIS_NAME_LENGTH} "
+            f"characters: {', '.join(duplicated)}"
+        )
+
+    # Channels and period shared by all the alternatives
+    channels_alt = None
+    for channels, _, _ in metadata_alt:
+        if channels is not None:
+            shared = set(channels)
+            previous = channels if channels_alt is None else channels_alt
+            channels_alt = [c for c in previous if c in shared]
+    min_alt = max(m[1] for m in metadata_alt)
+    max_alt = min(m[2] for m in metadata_alt)
+
+    start_nat = args.start_nat or min_nat
+    end_nat = args.end_nat or max_nat
+    start_alt = args.start_alt or min_alt
+    end_alt = args.end_alt or max_alt
+
+    # IAHRIS needs at least 15 consecutive years in both periods
+    if end_nat - start_nat < 14 or end_alt - start_alt < 14:
+        raise SystemExit(
+            "The selected periods for analysis must cover at least 15 consecutive years."
+        )
+
+    if args.themes == "all":
+        themes = list(pipeline.THEMES)
+    elif args.themes == "none":
+        themes = []
+    else:
+        themes = [t.strip() for t in args.themes.split(",") if t.strip()]
+        unknown = [t for t in themes if t not in pipeline.THEMES]
+        if unknown:
+            raise SystemExit(f"Unknown themes: {', '.join(unknown)}")
+
+    if channels_nat is None and channels_alt is None:
+        units = [None]  # CSV vs CSV: a single report
+    else:
+        units = select_units(args.units, channels_nat, channels_alt)
+
+    batch_id = pipeline.new_job_id()
+    jobs = []
+    for unit in units:
+        name = f"channel_{unit}" if unit is not None else "csv"
+        project_name = f"{batch_id}_{name}"
+        jobs.append(
+            {
+                "unit": unit,
+                "scenarios": args.scenarios,
+                "nat": args.nat,
+                "alts": alts,
+                # One report folder per alternative (always when watching several)
+                "alt_folders": len(alts) > 1 or getattr(args, "alt_folders", False),
+                "start_nat": start_nat,
+                "end_nat": end_nat,
+                "start_alt": start_alt,
+                "end_alt": end_alt,
+                # Created when the job (or the single pass) writes its inputs
+                "temp_folder": pipeline.work_folder_path(project_name),
+                "report_folder": os.path.join(args.output, name),
+                "project_name": project_name,
+                "themes": themes,
+                "monthly": getattr(args, "monthly", False),
+                "written": set(),  # inputs already written in a single pass
+            }
+        )
+    return jobs
+
+
+def month_warnings(name, gaps):
+    """[WARNING] lines of the months with missing days of a monthly input (see
+    pipeline.write_monthly_input); 'name' tells which input"""
+
+    lines = []
+    for months, what in zip(
+        gaps, ("written without value", "left out at the ends of the period")
+    ):
+        if months:
+            shown = ", ".join(months[:MAX_LISTED_MONTHS])
+            more = "..." if len(months) > MAX_LISTED_MONTHS else ""
+            lines.append(
+                f"[WARNING] {name}: {len(months)} month(s) with missing days {what}: "
+                f"{shown}{more}"
+            )
+    return lines
+
+
+def write_input(job, source, start_year, end_year, output_csv_path, header):
+    """Stream a nat/alt source of the job unit to an IAHRIS input file
+
+    Returns the warnings of a monthly input (see month_warnings).
+    """
+
+    if is_csv(source):
+        written = pipeline.write_csv_input(
+            source, start_year, end_year, output_csv_path, header, job["monthly"]
+        )
+    else:
+        sqlite = pipeline.scenario_output(job["scenarios"], source)
+        written = pipeline.write_swatplus_input(
+            sqlite,
+            job["unit"],
+            start_year,
+            end_year,
+            output_csv_path,
+            header,
+            job["monthly"],
+        )
+    if not job["monthly"]:
+        return []
+    return month_warnings(f"unit {job['unit']}, {scenario_name(source)}", written[1])
+
+
+def input_names(job):
+    """Scenario name and IAHRIS input file path of the natural source of a job and
+    (scenario name, input file path, report folder) of each alternative"""
+
+    scenario_nat = scenario_name(job["nat"])
+    nat = (scenario_nat, os.path.join(job["temp_folder"], f"{scenario_nat}_nat.csv"))
+
+    alternatives = []
+    for alt in job["alts"]:
+        scenario_alt = scenario_name(alt)
+        path = os.path.join(job["temp_folder"], f"{scenario_alt}_alt.csv")
+        report_folder = job["report_folder"]
+        if job["alt_folders"]:
+            report_folder = os.path.join(report_folder, scenario_alt)
+        alternatives.append((scenario_alt, path, report_folder))
+    return nat, alternatives
+
+
+def input_header(job, alternative):
+    """Header of the IAHRIS input of the natural source (alternative None) or of
+    an alternative (index in job["alts"])"""
+    scenario_nat = scenario_name(job["nat"])
+    if alternative is None:
+        return pipeline.nat_header(scenario_nat, job["monthly"])
+    return pipeline.alt_header(
+        scenario_nat, scenario_name(job["alts"][alternative]), job["monthly"]
+    )
+
+
+def input_path(job, alternative):
+    """IAHRIS input file of the natural source (alternative None) or of an alternative"""
+    (_, path_nat), alternatives = input_names(job)
+    return path_nat if alternative is None else alternatives[alternative][1]
+
+
+def write_single_pass_source(jobs, alternative):
+    """Write the inputs of one SWAT+ source (the natural one or an alternative) of
+    all jobs reading its 'channel_sd_day' only once
+
+    Returns the (unit, path) written and the warnings of the monthly inputs (runs
+    in a worker process).
+    """
+
+    side = "nat" if alternative is None else "alt"
+    source = jobs[0]["nat"] if alternative is None else jobs[0]["alts"][alternative]
+    if is_csv(source):
+        return [], []
+
+    jobs_by_unit = {job["unit"]: job for job in jobs}
+    sqlite = pipeline.scenario_output(jobs[0]["scenarios"], source)
+    end_year = jobs[0][f"end_{side}"]
+    monthly = jobs[0]["monthly"]
+    written, warnings = [], []
+    try:
+        with instrumentation.stage("single_pass", source=source, monthly=monthly) as record:
+            record["rows"] = 0
+            if monthly:
+                # One row per channel and month out of SQLite
+                extracted = pipeline.extract_all_swatplus_months(
+                    sqlite, jobs[0][f"start_{side}"], end_year, units=jobs_by_unit
+                )
+            else:
+                extracted = pipeline.extract_all_swatplus_flows(
+                    sqlite, jobs[0][f"start_{side}"], end_year, units=jobs_by_unit
+                )
+            for unit, data in extracted:
+                job = jobs_by_unit[unit]
+                path = input_path(job, alternative)
+                os.makedirs(job["temp_folder"], exist_ok=True)
+                if monthly:
+                    _, gaps = pipeline.write_monthly_input(
+                        data, path, input_header(job, alternative)
+                    )
+                    name = f"unit {unit}, {scenario_name(source)}"
+                    warnings += month_warnings(name, gaps)
+                else:
+                    pipeline.write_iahris_input(
+                        data, path, input_header(job, alternative), end_year
+                    )
+                written.append((unit, path))
+                record["rows"] += len(data)
+    finally:
+        # Connections of the worker process are not kept after the job
+        scenario_store.close_all()
+    return written, warnings
+
+
+def write_single_pass_inputs(jobs, workers=1):
+    """Write the SWAT+ inputs of all jobs reading each 'channel_sd_day' only once
+
+    The natural source and the alternatives are extracted concurrently.
+    """
+
+    jobs_by_unit = {job["unit"]: job for job in jobs}
+    sources = [None] + list(range(len(jobs[0]["alts"])))
+    with ProcessPoolExecutor(max_workers=max(1, min(workers, len(sources)))) as executor:
+        futures = [
+            executor.submit(write_single_pass_source, jobs, alternative)
+            for alternative in sources
+        ]
+        for future in futures:
+            written, warnings = future.result()
+            for unit, path in written:
+                jobs_by_unit[unit]["written"].add(path)
+            for warning in warnings:
+                print(warning)
+
+
+def write_job_input(job, alternative):
+    """Write an IAHRIS input of a job unless it was written in a single pass
+    (returns the warnings of a monthly input)"""
+
+    path = input_path(job, alternative)
+    if path in job["written"]:
+        return []
+    if alternative is None:
+        source, side = job["nat"], "nat"
+    else:
+        source, side = job["alts"][alternative], "alt"
+    try:
+        return write_input(
+            job,
+            source,
+            job[f"start_{side}"],
+            job[f"end_{side}"],
+            path,
+            input_header(job, alternative),
+        )
+    finally:
+        # Read-only connections of this thread (see scenario_store)
+        scenario_store.close_all()
+
+
+def prepare_job(job, previous=None):
+    """Write the IAHRIS inputs and script of a channel unit (worker process stage)
+
+    Alternatives whose inputs were already reported are copied from the report
+    cache and left out of the script. Returns the path of the script (None if
+    every alternative was cached), the cache key of every alternative, the
+    cached ones (alternative -> (master report, copied file names)) and the
+    warnings of the monthly inputs.
+    """
+
+    (scenario_nat, output_csv_path_nat), alternatives = input_names(job)
+    os.makedirs(job["temp_folder"], exist_ok=True)
+    for _, _, report_folder in alternatives:
+        os.makedirs(report_folder, exist_ok=True)
+
+    # IAHRIS input data of the natural flow and (concurrently) of the alternatives
+    warnings = write_job_input(job, None)
+    with ThreadPoolExecutor(max_workers=len(alternatives)) as executor:
+        for future in [
+            executor.submit(write_job_input, job, alternative)
+            for alternative in range(len(alternatives))
+        ]:
+            warnings += future.result()
+
+    # Reports of the same inputs generated before
+    keys, cached = [], {}
+    for alternative, (_, output_csv_path_alt, report_folder) in enumerate(alternatives):
+        keys.append(report_cache.input_key([output_csv_path_nat, output_csv_path_alt]))
+        master, names = report_cache.restore(keys[-1], report_folder)
+        if master is not None:
+            cached[alternative] = (master, names)
+    if len(cached) == len(alternatives):
+        return None, keys, cached, warnings
+
+    # One project, the natural point loaded once
+    bat_file_path = pipeline.write_alternatives_bat(
+        job["temp_folder"],
+        job["project_name"],
+        scenario_nat,
+        output_csv_path_nat,
+        [a for i, a in enumerate(alternatives) if i not in cached],
+    )
+    return bat_file_path, keys, cached, warnings
+
+
+def run_iahris(job, prepared):
+    """Launch IAHRIS for a channel unit (IAHRIS thread pool stage)"""
+    try:
+        if prepared[0] is not None:
+            pipeline.run_bat(prepared[0])
+    finally:
+        # Remove the working folder of the unit
+        shutil.rmtree(job["temp_folder"], ignore_errors=True)
+    return prepared
+
+
+def finish_job(job, prepared):
+    """Label the master reports and extract the thematic reports (worker process stage)
+
+    The new reports are added to the report cache. Returns the master report of
+    every alternative and the warnings of the inputs.
+    """
+
+    _, keys, cached, warnings = prepared
+    reports = []
+    for alternative, (_, _, report_folder) in enumerate(input_names(job)[1]):
+        if alternative in cached:
+            # Only the thematic reports that were not cached are exported
+            last_generated_xlsx, names = cached[alternative]
+            themes = [t for t in job["themes"] if pipeline.THEMES[t][1] not in names]
+        else:
+            last_generated_xlsx = pipeline.last_generated_report(report_folder)
+            if last_generated_xlsx is None:
+                raise RuntimeError(
+                    f"IAHRIS did not generate a report in {report_folder}"
+                )
+            pipeline.label_master_report(last_generated_xlsx)
+            themes = job["themes"]
+
+        exported = []
+        if themes:
+            exported = pipeline.export_themes(last_generated_xlsx, report_folder, themes)
+        if alternative not in cached or exported:
+            report_cache.put(keys[alternative], last_generated_xlsx, exported)
+        reports.append(last_generated_xlsx)
+
+    return reports, warnings
+
+
+def main(argv=None):
+    """Entry point of 'python main.py batch ...'"""
+    return run(parse_args(sys.argv[2:] if argv is None else argv))
+
+
+def run(args):
+    """Generate the reports of the batch arguments and return the exit code"""
+
+    if not os.path.exists(pipeline.IAHRIS_ROOT):
+        raise SystemExit(
+            f"{pipeline.IAHRIS_ROOT} not found. Relaunch the installer."
+        )
+
+    jobs = build_jobs(args)
+    if not jobs:
+        print("No channel units to process")
+        return 0
+    alternatives = len(jobs[0]["alts"])
+    print(
+        f"{len(jobs) * alternatives} report(s) to generate with {args.workers} "
+        f"worker(s) and up to {args.iahris_jobs} IAHRIS run(s) at a time"
+    )
+
+    failed = 0
+    try:
+        # Extract every channel of the SWAT+ scenarios in one scan of 'channel_sd_day'
+        if args.extraction == "single-pass" and jobs[0]["unit"] is not None:
+            write_single_pass_inputs(jobs, args.workers)
+
+        with ProcessPoolExecutor(max_workers=args.workers) as processes, ThreadPoolExecutor(
+            max_workers=max(1, args.iahris_jobs)
+        ) as iahris:
+            stages = [(prepare_job, processes), (run_iahris, iahris), (finish_job, processes)]
+            for job, result, error in scheduler.run_stages(jobs, stages):
+                if error is not None:
+                    failed += 1
+                    print(f"[FAILED] unit {job['unit']}: {error}")
+                    continue
+                reports, warnings = result
+                for warning in warnings:
+                    print(warning)
+                for report in reports:
+                    print(f"[OK] unit {job['unit']}: {report}")
+    finally:
+        # Working folders of the jobs that did not get to run IAHRIS
+        for job in jobs:
+            shutil.rmtree(job["temp_folder"], ignore_errors=True)
+        # Connections opened for the metadata of the scenarios
+        scenario_store.close_all()
+
+    generated = (len(jobs) - failed) * alternatives
+    print(f"{generated} report(s) generated, {failed * alternatives} failed")
+    return 1 if failed else 0
@@ -0,0 +1,51 @@
+"""Validation of the Date/Flow CSV files (select_file_nat / select_file_alt)"""
+
+import os
+
+import csv_flow
+import iahris_pipeline as pipeline
+
+
+def test_validate_flow_csv(benchmark, watershed):
+    """Parse and check a CSV file (first time it is opened)"""
+    series = benchmark(csv_flow.validate_flow_csv, watershed.csv)
+    assert len(series) == watershed.days
+
+
+def test_load_flow_csv_sidecar(benchmark, watershed):
+    """CSV file opened again in a new session (from its .npz sidecar)"""
+
+    def load():
+        csv_flow.LOADED.clear()
+        return csv_flow.load_flow_csv(watershed.csv)
+
+    load()
+    series = benchmark(load)
+    assert len(series) == watershed.days
+
+
+def test_write_integer_flow_csv(benchmark, watershed, tmp_path):
+    """IAHRIS input of a CSV file with integer flows (written as integers, as the
+    former pandas to_csv did)"""
+
+    series = csv_flow.validate_flow_csv(watershed.csv)
+    input_csv = os.path.join(str(tmp_path), "Integers.csv")
+    with open(input_csv, "w", newline="") as csv_file:
+        csv_file.write("Date,Flow\n")
+        for date, flow in zip(series.dates().tolist(), series.values.round()):
+            csv_file.write(f"{date.month}/{date.day}/{date.year},{int(flow)}\n")
+
+    output_csv = os.path.join(str(tmp_path), "Integers_nat.csv")
+    rows = benchmark(
+        pipeline.write_csv_input,
+        input_csv,
+        watershed.start,
+        watershed.end,
+        output_csv,
+        pipeline.nat_header("Integers"),
+    )
+    assert rows == watershed.days
+    with open(output_csv) as iahris_input:
+        next(iahris_input)
+        date, flow, _ = next(iahris_input).split(";")
+    assert flow == str(int(series.values[0].round()))
@@ -0,0 +1,54 @@
+"""Daily flows of the channels read from 'channel_sd_day'"""
+
+import iahris_pipeline as pipeline
+
+
+def test_extract_channel(benchmark, watershed):
+    """One channel (full table scan of the SWAT+ database)"""
+    series = benchmark(
+        pipeline.extract_swatplus_flow,
+        watershed.sqlite,
+        watershed.unit,
+        watershed.start,
+        watershed.end,
+    )
+    assert len(series) == watershed.days
+
+
+def test_extract_channel_indexed(benchmark, watershed, indexed_sqlite):
+    """One channel (range of the sidecar index)"""
+    series = benchmark(
+        pipeline.extract_swatplus_flow,
+        indexed_sqlite,
+        watershed.unit,
+        watershed.start,
+        watershed.end,
+    )
+    assert len(series) == watershed.days
+
+
+def test_extract_channel_columns(benchmark, watershed, columnar_sqlite):
+    """One channel (slice of the memory-mapped columnar copy)"""
+    series = benchmark(
+        pipeline.extract_swatplus_flow,
+        columnar_sqlite,
+        watershed.unit,
+        watershed.start,
+        watershed.end,
+    )
+    assert len(series) == watershed.days
+
+
+def test_extract_all_channels(benchmark, watershed):
+    """Every channel in one ordered scan (batch single-pass extraction)"""
+
+    def extract_all():
+        return sum(
+            len(series)
+            for _, series in pipeline.extract_all_swatplus_flows(
+                watershed.sqlite, watershed.start, watershed.end
+            )
+        )
+
+    rows = benchmark.pedantic(extract_all, rounds=3)
+    assert rows == watershed.channels * watershed.days
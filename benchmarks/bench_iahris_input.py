@@ -0,0 +1,36 @@
+"""IAHRIS input files written from SWAT+ outputs and from flow series"""
+
+import os
+
+import iahris_pipeline as pipeline
+
+
+def test_write_swatplus_input(benchmark, watershed, tmp_path):
+    """Stream a channel from SQLite to an IAHRIS input file"""
+    output_csv = os.path.join(str(tmp_path), "Default_nat.csv")
+    rows = benchmark(
+        pipeline.write_swatplus_input,
+        watershed.sqlite,
+        watershed.unit,
+        watershed.start,
+        watershed.end,
+        output_csv,
+        pipeline.nat_header("Default"),
+    )
+    assert rows == watershed.days
+
+
+def test_write_iahris_input(benchmark, watershed, tmp_path):
+    """Format and write a FlowSeries already in memory"""
+    series = pipeline.extract_swatplus_flow(
+        watershed.sqlite, watershed.unit, watershed.start, watershed.end
+    )
+    output_csv = os.path.join(str(tmp_path), "Default_alt.csv")
+    rows = benchmark(
+        pipeline.write_iahris_input,
+        series,
+        output_csv,
+        pipeline.alt_header("Default", "Default"),
+        watershed.end,
+    )
+    assert rows == watershed.days
@@ -0,0 +1,44 @@
+"""Scenario metadata: channels and years of 'channel_sd_day' (select_Scenario_*)"""
+
+import iahris_pipeline as pipeline
+import metadata_cache
+
+
+def test_channel_summary(benchmark, watershed):
+    """One GROUP BY scan of the table (metadata cache cleared before every round)"""
+    summary = benchmark.pedantic(
+        pipeline.channel_summary,
+        args=(watershed.sqlite,),
+        setup=metadata_cache.clear,
+        rounds=5,
+    )
+    assert len(summary) == watershed.channels
+
+
+def test_channel_summary_indexed(benchmark, watershed, indexed_sqlite):
+    """Index-only scan of the sidecar index"""
+    summary = benchmark.pedantic(
+        pipeline.channel_summary,
+        args=(indexed_sqlite,),
+        setup=metadata_cache.clear,
+        rounds=5,
+    )
+    assert len(summary) == watershed.channels
+
+
+def test_channel_summary_columns(benchmark, watershed, columnar_sqlite):
+    """Offsets and first days of the columnar copy"""
+    summary = benchmark.pedantic(
+        pipeline.channel_summary,
+        args=(columnar_sqlite,),
+        setup=metadata_cache.clear,
+        rounds=5,
+    )
+    assert len(summary) == watershed.channels
+
+
+def test_scenario_metadata_cached(benchmark, watershed):
+    """Scenario selected again (metadata from the persistent cache)"""
+    pipeline.scenario_metadata(watershed.sqlite)
+    channels, min_year, max_year = benchmark(pipeline.scenario_metadata, watershed.sqlite)
+    assert (min_year, max_year) == (watershed.start, watershed.end)
@@ -0,0 +1,16 @@
+"""Alteration metrics of every channel of the watershed (screening mode)"""
+
+import iahris_pipeline as pipeline
+import screening
+
+
+def test_screen_watershed(benchmark, watershed):
+    """Metrics of all the channels, flows already read (the scenario against itself)"""
+    units, series_list = zip(
+        *pipeline.extract_all_swatplus_flows(
+            watershed.sqlite, watershed.start, watershed.end
+        )
+    )
+    rows = benchmark(screening.screen, list(units), list(series_list), list(series_list))
+    assert len(rows) == watershed.channels
+    assert all(row["mean_index"] == 1.0 for row in rows)
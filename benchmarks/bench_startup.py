@@ -0,0 +1,47 @@
+"""Start-up of the headless modes and of the GUI (new Python process every round)"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that the headless modes must not import
+HEAVY = ("PyQt6", "pandas")
+
+# Main window built offscreen (no display needed)
+GUI_SCRIPT = """
+from PyQt6 import QtWidgets
+import gui
+app = QtWidgets.QApplication([])
+window = gui.MainWindow()
+"""
+
+
+def run_python(code):
+    """Run code in a new interpreter from the installation folder; its stdout"""
+    environment = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        env=environment,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+
+@pytest.mark.parametrize("module", ["batch", "indicators", "watch"])
+def test_headless_import(benchmark, module):
+    """Import of a headless mode (also what every batch worker process pays)"""
+    code = f"import sys, {module}; print(sorted(set({HEAVY!r}) & set(sys.modules)))"
+    loaded = benchmark.pedantic(run_python, args=(code,), rounds=5)
+    assert loaded.strip() == "[]"
+
+
+def test_gui_main_window(benchmark):
+    """Import of the GUI and construction of the main window"""
+    pytest.importorskip("PyQt6.QtWidgets")
+    benchmark.pedantic(run_python, args=(GUI_SCRIPT,), rounds=5)
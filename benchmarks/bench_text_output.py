@@ -0,0 +1,46 @@
+"""SWAT+ text output (TxtInOut/channel_sd_day.txt) read with swatplus_text"""
+
+import swatplus_text
+
+
+def test_text_channel_summary(benchmark, watershed):
+    """Channels and years of the whole file (unit and yr columns only)"""
+    summary = benchmark.pedantic(swatplus_text.channel_summary, args=(watershed.text,), rounds=3)
+    assert len(summary) == watershed.channels
+
+
+def test_text_extract_channel(benchmark, watershed):
+    """One channel (the other rows are filtered on their unit column)"""
+    series = benchmark.pedantic(
+        swatplus_text.extract_flow,
+        args=(watershed.text, watershed.unit, watershed.start, watershed.end),
+        rounds=3,
+    )
+    assert len(series) == watershed.days
+
+
+def test_text_extract_channel_with_summary(benchmark, watershed):
+    """One channel, reading only its line of every day (found with the summary)"""
+    summary = swatplus_text.channel_summary(watershed.text)
+    series = benchmark.pedantic(
+        swatplus_text.extract_flow,
+        args=(watershed.text, watershed.unit, watershed.start, watershed.end),
+        kwargs={"summary": summary},
+        rounds=3,
+    )
+    assert len(series) == watershed.days
+
+
+def test_text_extract_all_channels(benchmark, watershed):
+    """Every channel in one pass"""
+
+    def extract_all():
+        return sum(
+            len(series)
+            for _, series in swatplus_text.extract_all_flows(
+                watershed.text, watershed.start, watershed.end
+            )
+        )
+
+    rows = benchmark.pedantic(extract_all, rounds=3)
+    assert rows == watershed.channels * watershed.days
@@ -0,0 +1,89 @@
+"""
+Fixtures of the benchmarks: synthetic SWAT+ outputs generated once per session.
+
+The sizes are channels x years, from SWATPLUS_IAHRIS_BENCH_SIZES (default
+"10x15,200x30"); every benchmark runs on each size. The caches of SWATPlus-IAHRIS
+go to a temporary folder, so that the benchmarks never read or fill the user's.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+import pytest
+
+# Before the modules of SWATPlus-IAHRIS read their configuration
+os.environ["SWATPLUS_IAHRIS_CACHE"] = tempfile.mkdtemp(prefix="swatplus-iahris-bench-")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import channel_columns  # noqa: E402
+import channel_index  # noqa: E402
+import synthetic  # noqa: E402
+
+
+START_YEAR = 1980
+
+SIZES = [
+    tuple(int(value) for value in size.lower().split("x"))
+    for size in os.environ.get("SWATPLUS_IAHRIS_BENCH_SIZES", "10x15,200x30").split(",")
+    if size.strip()
+]
+
+
+class Watershed:
+    """Synthetic scenario of a benchmark size"""
+
+    def __init__(self, folder, channels, years):
+        self.folder = folder
+        self.channels = channels
+        self.years = years
+        self.start = START_YEAR
+        self.end = START_YEAR + years - 1
+        self.days = int(
+            (np.datetime64(f"{self.end + 1}-01-01") - np.datetime64(f"{self.start}-01-01"))
+            .astype(np.int64)
+        )
+        self.sqlite = synthetic.write_watershed(
+            folder, channels, years, START_YEAR, ("Default",), csv_units=(1,), text=True
+        )[0]
+        self.text = synthetic.text_output_path(self.sqlite)
+        self.csv = os.path.join(folder, "Default_1.csv")
+
+        # Channel in the middle of the table (neither the first nor the last rows)
+        self.unit = (channels + 1) // 2
+
+    def __repr__(self):
+        return f"{self.channels}x{self.years}"
+
+
+@pytest.fixture(scope="session", params=SIZES, ids=[f"{c}x{y}" for c, y in SIZES])
+def watershed(request, tmp_path_factory):
+    channels, years = request.param
+    return Watershed(str(tmp_path_factory.mktemp(f"w{channels}x{years}")), channels, years)
+
+
+@pytest.fixture(scope="session")
+def indexed_sqlite(watershed, tmp_path_factory):
+    """Copy of the scenario database with a sidecar index (see channel_index)"""
+    folder = tmp_path_factory.mktemp(f"indexed{watershed!r}")
+    sqlite = os.path.join(str(folder), "swatplus_output.sqlite")
+    shutil.copy2(watershed.sqlite, sqlite)
+    channel_index.build_sidecar_index(sqlite)
+    return sqlite
+
+
+@pytest.fixture(scope="session")
+def columnar_sqlite(watershed, tmp_path_factory):
+    """Copy of the scenario database with a columnar copy (see channel_columns)"""
+    folder = tmp_path_factory.mktemp(f"columns{watershed!r}")
+    sqlite = os.path.join(str(folder), "swatplus_output.sqlite")
+    shutil.copy2(watershed.sqlite, sqlite)
+    channel_columns.build_columns(sqlite)
+    return sqlite
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(os.environ["SWATPLUS_IAHRIS_CACHE"], ignore_errors=True)
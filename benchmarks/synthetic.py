@@ -0,0 +1,315 @@
+"""
+/***************************************************************************
+ **SWATPlus-IAHRIS
+ **A software that links SWATPlus to IAHRIS to automatically generate reports on Indicators of Hydrologic Alteration in RIverS.
+ **Synthetic SWAT+ output databases and flow CSV files for the benchmarks.
+----------------------------------------------------
+        begin                : **May-2025
+        copyright            : **COPYRIGHT
+        email                : **alopbal@upv.es
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 3 of the License, or     *
+ *   any later version.                                                    *
+ *                                                                         *
+ ***************************************************************************/
+
+Writes Scenarios/<name>/Results/swatplus_output.sqlite files laid out as SWAT+
+writes them: a 'channel_sd_day' table with the SWAT+ columns (jday, mon, day, yr,
+unit, gis_id, name, area, ..., flo_in, flo_out, ...) and the rows of every day
+for all the channels one day after another (so the rows of a channel are spread
+over the whole table, as in real outputs). Flows follow a seasonal cycle with
+persistent (AR(1)) noise, storm peaks and summer zero flows in the small channels;
+the first scenario is natural and the next ones are regulated (smoothed and
+reduced, as downstream of a reservoir). The same rows can also be written to
+TxtInOut/channel_sd_day.txt (the fixed-width text output of SWAT+), and Date/Flow
+CSV files in the format of csv_format_example.csv for some channels.
+
+    python benchmarks/synthetic.py --output C:\\Bench --channels 500 --years 30
+        [--start 1980] [--scenarios Default,Reservoir] [--csv 1,2] [--seed 0] [--text]
+
+Sizes range from a few channels over 15 years to 5,000 channels over 100 years
+(about 180 million rows, several GB).
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+
+import numpy as np
+
+
+# Columns of 'channel_sd_day' in SWAT+ outputs (the flows are in m3/s)
+COLUMNS = [
+    ("jday", "integer"),
+    ("mon", "integer"),
+    ("day", "integer"),
+    ("yr", "integer"),
+    ("unit", "integer"),
+    ("gis_id", "integer"),
+    ("name", "text"),
+    ("area", "real"),
+    ("precip", "real"),
+    ("evap", "real"),
+    ("seep", "real"),
+    ("flo_stor", "real"),
+    ("flo_in", "real"),
+    ("flo_out", "real"),
+    ("peakr", "real"),
+    ("sed_in", "real"),
+    ("sed_out", "real"),
+    ("water_temp", "real"),
+]
+
+# Rows inserted per transaction
+INSERT_ROWS = 500000
+
+# Fixed-width rows of channel_sd_day.txt (Fortran 4i6, 2i8, 2x, a16, e15.4 fields)
+TEXT_TITLE = " SWAT+ synthetic output (SWATPlus-IAHRIS benchmarks)\n"
+TEXT_HEADER = "%6s%6s%6s%6s%8s%8s  %-16s" + "%15s" * (len(COLUMNS) - 7) + "\n"
+TEXT_ROW = "%6d%6d%6d%6d%8d%8d  %-16s" + "%15.4E" * (len(COLUMNS) - 7) + "\n"
+TEXT_UNITS = ["ha", "mm", "m^3", "m^3", "m^3", "m^3/s", "m^3/s", "m^3/s", "tons", "tons", "degc"]
+
+
+def channel_areas(channels, rng):
+    """Drainage area (km2) of every channel: many small channels, a few large ones"""
+    return np.sort(rng.lognormal(mean=4.0, sigma=1.5, size=channels))[::-1].copy()
+
+
+def daily_flows(dates, areas, rng, state, regulation=0.0):
+    """(days x channels) flows of some days, continuing from the previous block
+
+    'state' holds the AR(1) noise ("noise") and the reservoir releases ("released")
+    at the end of the previous block. 'regulation' (0 = natural, up to 1) smooths
+    the flows and reduces them, as downstream of a reservoir.
+    """
+
+    doy = (dates - dates.astype("datetime64[Y]")).astype(np.int64)
+
+    # Seasonal cycle: wet winter and spring, dry summer (Mediterranean rivers)
+    season = 1.0 + 0.8 * np.cos(2 * np.pi * (doy - 45) / 365.25)
+
+    # Persistent noise (AR(1) in log space), carried over from the previous block
+    shocks = rng.normal(0.0, 0.35, size=(len(dates), len(areas)))
+    noise = np.empty_like(shocks)
+    previous = state["noise"]
+    for i, shock in enumerate(shocks):
+        previous = 0.9 * previous + shock
+        noise[i] = previous
+    state["noise"] = previous
+
+    # Storm peaks
+    storms = rng.random(size=noise.shape) < 0.01
+    peaks = np.where(storms, rng.exponential(6.0, size=noise.shape), 0.0)
+
+    flows = 0.01 * areas * season[:, None] * (np.exp(noise) + peaks)
+
+    # Small channels go dry in summer
+    dry = (areas < np.percentile(areas, 20)) & np.ones((len(dates), 1), dtype=bool)
+    dry &= (season < 0.5)[:, None]
+    flows[dry] = 0.0
+
+    if regulation:
+        # Releases: a running mean of the inflows (carried between blocks) reduced
+        # by the withdrawals
+        regulated = np.empty_like(flows)
+        released = state.get("released")
+        if released is None:
+            released = flows[0]
+        for i, flow in enumerate(flows):
+            released = released + (flow - released) / (1.0 + 60.0 * regulation)
+            regulated[i] = released
+        state["released"] = released
+        flows = (1.0 - 0.3 * regulation) * regulated
+
+    return flows
+
+
+def text_output_path(sqlite):
+    """channel_sd_day.txt in the TxtInOut folder next to the Results folder"""
+    scenario_folder = os.path.dirname(os.path.dirname(sqlite))
+    return os.path.join(scenario_folder, "TxtInOut", "channel_sd_day.txt")
+
+
+def write_scenario(
+    sqlite, channels, years, start_year=1980, seed=0, regulation=0.0, text=False
+):
+    """Write a synthetic swatplus_output.sqlite (and its channel_sd_day.txt if
+    'text') and return its number of rows"""
+
+    os.makedirs(os.path.dirname(sqlite), exist_ok=True)
+    if os.path.exists(sqlite):
+        os.remove(sqlite)
+
+    text_file = None
+    if text:
+        os.makedirs(os.path.dirname(text_output_path(sqlite)), exist_ok=True)
+        text_file = open(text_output_path(sqlite), "w", newline="")
+        text_file.write(TEXT_TITLE)
+        text_file.write(TEXT_HEADER % tuple(name for name, _ in COLUMNS))
+        text_file.write(TEXT_HEADER % tuple([""] * 7 + TEXT_UNITS))
+
+    rng = np.random.default_rng(seed)
+    areas = channel_areas(channels, rng)
+    units = np.arange(1, channels + 1)
+    names = [f"cha{unit:04d}" for unit in units.tolist()]
+    state = {"noise": np.zeros(channels), "released": None}
+
+    conn = sqlite3.connect(sqlite)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute(
+        "CREATE TABLE channel_sd_day ({})".format(
+            ", ".join(f"{name} {kind}" for name, kind in COLUMNS)
+        )
+    )
+    insert = "INSERT INTO channel_sd_day VALUES ({})".format(
+        ", ".join("?" * len(COLUMNS))
+    )
+
+    # Blocks of whole days, so that the rows stay ordered by day and then by unit
+    block_days = max(1, INSERT_ROWS // channels)
+    first = np.datetime64(f"{start_year}-01-01", "D")
+    n_days = int((np.datetime64(f"{start_year + years}-01-01", "D") - first).astype(np.int64))
+    rows = 0
+    for block_start in range(0, n_days, block_days):
+        block_end = min(block_start + block_days, n_days)
+        dates = first + np.arange(block_start, block_end)
+        flows = daily_flows(dates, areas, rng, state, regulation)
+
+        years_of = dates.astype("datetime64[Y]").astype(np.int64) + 1970
+        months = dates.astype("datetime64[M]").astype(np.int64) % 12 + 1
+        days = (dates - dates.astype("datetime64[M]")).astype(np.int64) + 1
+        jdays = (dates - dates.astype("datetime64[Y]")).astype(np.int64) + 1
+
+        # Day columns repeated for every channel, channel columns for every day
+        n = flows.size
+        flo_out = flows.ravel()
+        precip = rng.gamma(0.3, 10.0, size=n)
+        columns = [
+            np.repeat(jdays, channels).tolist(),
+            np.repeat(months, channels).tolist(),
+            np.repeat(days, channels).tolist(),
+            np.repeat(years_of, channels).tolist(),
+            np.tile(units, len(dates)).tolist(),
+            np.tile(units, len(dates)).tolist(),
+            names * len(dates),
+            np.tile(areas * 100.0, len(dates)).tolist(),  # ha
+            precip.tolist(),
+            (0.02 * precip).tolist(),
+            (0.001 * flo_out).tolist(),
+            (86400.0 * flo_out).tolist(),
+            (1.02 * flo_out).tolist(),
+            flo_out.tolist(),
+            (1.8 * flo_out).tolist(),
+            (0.05 * flo_out).tolist(),
+            (0.04 * flo_out).tolist(),
+            [12.0] * n,
+        ]
+        conn.executemany(insert, zip(*columns))
+        conn.commit()
+        if text_file is not None:
+            text_file.writelines(TEXT_ROW % row for row in zip(*columns))
+        rows += n
+
+    conn.close()
+    if text_file is not None:
+        text_file.close()
+    return rows
+
+
+def write_flow_csv(sqlite, unit, output_csv):
+    """Date/Flow CSV (M/D/YYYY dates, as csv_format_example.csv) of a channel"""
+
+    conn = sqlite3.connect(sqlite)
+    try:
+        rows = conn.execute(
+            "SELECT mon, day, yr, flo_out FROM channel_sd_day WHERE unit = ? "
+            "ORDER BY yr, mon, day",
+            (unit,),
+        ).fetchall()
+    finally:
+        conn.close()
+
+    with open(output_csv, "w", newline="") as csv_file:
+        csv_file.write("Date,Flow\n")
+        csv_file.writelines(
+            f"{mon}/{day}/{yr},{flow:.4g}\n" for mon, day, yr, flow in rows
+        )
+    return len(rows)
+
+
+def write_watershed(
+    output, channels, years, start_year=1980, scenarios=("Default", "Reservoir"),
+    csv_units=(), seed=0, text=False,
+):
+    """Write a Scenarios folder (and the CSV files of some channels) and return
+    the paths of the databases"""
+
+    databases = []
+    for i, scenario in enumerate(scenarios):
+        sqlite = os.path.join(
+            output, "Scenarios", scenario, "Results", "swatplus_output.sqlite"
+        )
+        # Same watershed (areas) in every scenario, regulated after the first one
+        write_scenario(
+            sqlite,
+            channels,
+            years,
+            start_year,
+            seed,
+            regulation=0.0 if i == 0 else min(1.0, 0.5 * i),
+            text=text,
+        )
+        databases.append(sqlite)
+
+        for unit in csv_units:
+            write_flow_csv(sqlite, unit, os.path.join(output, f"{scenario}_{unit}.csv"))
+    return databases
+
+
+def main(argv=None):
+    """Entry point of 'python benchmarks/synthetic.py ...'"""
+
+    parser = argparse.ArgumentParser(
+        prog="synthetic.py",
+        description="Synthetic SWAT+ outputs (channel_sd_day) and flow CSV files.",
+    )
+    parser.add_argument("--output", required=True, help="Folder of the Scenarios folder")
+    parser.add_argument("--channels", type=int, default=100, help="Number of channels")
+    parser.add_argument("--years", type=int, default=30, help="Number of years")
+    parser.add_argument("--start", type=int, default=1980, help="First year")
+    parser.add_argument(
+        "--scenarios", default="Default,Reservoir", help="Comma separated scenario names"
+    )
+    parser.add_argument("--csv", default="", help="Channels also written as CSV (e.g. 1,2)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument(
+        "--text", action="store_true", help="Also write TxtInOut/channel_sd_day.txt"
+    )
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    csv_units = [int(unit) for unit in args.csv.split(",") if unit.strip()]
+    databases = write_watershed(
+        args.output,
+        args.channels,
+        args.years,
+        args.start,
+        scenarios,
+        csv_units,
+        args.seed,
+        args.text,
+    )
+    for sqlite in databases:
+        print(f"{sqlite}: {args.channels} channels x {args.years} years")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+"""
+/***************************************************************************
+ **SWATPlus-IAHRIS
+ **A software that links SWATPlus to IAHRIS to automatically generate reports on Indicators of Hydrologic Alteration in RIverS.
+ **Columnar copy of 'channel_sd_day' (flows sorted by channel) for instant channel lookups.
+----------------------------------------------------
+        begin                : **May-2025
+        copyright            : **COPYRIGHT
+        email                : **alopbal@upv.es
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 3 of the License, or     *
+ *   any later version.                                                    *
+ *                                                                         *
+ ***************************************************************************/
+
+Reports only need 'flo_out' of one channel over a range of years, which a
+row-oriented table (or text file) ordered by day answers by reading every row.
+The conversion is opt-in and one-off:
+    python main.py columns <Scenarios folder, swatplus_output.sqlite or channel_sd_day.txt>
+
+It writes a folder next to the SWAT+ outputs (swatplus_output.sqlite ->
+swatplus_output.columns) with NumPy arrays: the channels ('unit'), the first day
+of every channel as an integer date (days since 1970-01-01), the offset of every
+channel in 'flo_out', and 'flo_out' itself sorted by channel and date (float64).
+Series are daily and continuous, so the rows of a year range are found with index
+arithmetic and only those values are read from the memory-mapped file. The
+folder stores the size and mtime of the source and is ignored once they change.
+"""
+
+import argparse
+import glob
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import time
+
+import numpy as np
+
+from channel_index import source_signature
+from flow_series import FlowSeries
+
+
+# Format of the folder (a new version ignores the folders of the previous ones)
+COLUMNS_VERSION = 1
+
+SOURCE_FILE = "source.json"
+ARRAYS = ("units", "starts", "offsets", "flo_out")
+
+
+def columns_path(source):
+    """Folder of the columnar copy of a SWAT+ database or text output"""
+    return os.path.splitext(source)[0] + ".columns"
+
+
+def has_fresh_columns(source):
+    """True if the columnar copy exists and matches the current SWAT+ outputs"""
+
+    try:
+        with open(os.path.join(columns_path(source), SOURCE_FILE)) as source_file:
+            saved = json.load(source_file)
+        signature = source_signature(source)
+    except (OSError, ValueError):
+        return False
+    return saved.get("version") == COLUMNS_VERSION and (
+        saved.get("size"),
+        saved.get("mtime_ns"),
+    ) == signature
+
+
+def load(source):
+    """Memory-mapped arrays (units, starts, offsets, flo_out) of the columnar copy"""
+    folder = columns_path(source)
+    return [
+        np.load(os.path.join(folder, f"{name}.npy"), mmap_mode="r") for name in ARRAYS
+    ]
+
+
+def channel_summary(source):
+    """(unit, min year, max year, rows) of every channel, from the arrays only"""
+
+    units, starts, offsets, _ = load(source)
+    counts = np.diff(offsets)
+    first = np.asarray(starts).astype("datetime64[D]")
+    last = (np.asarray(starts) + counts - 1).astype("datetime64[D]")
+    min_years = first.astype("datetime64[Y]").astype(np.int64) + 1970
+    max_years = last.astype("datetime64[Y]").astype(np.int64) + 1970
+    return list(
+        zip(units.tolist(), min_years.tolist(), max_years.tolist(), counts.tolist())
+    )
+
+
+def channel_series(starts, offsets, flo_out, i, start_year, end_year, dtype):
+    """FlowSeries of the channel at position i between two years (only the values
+    of those years are read)"""
+    series = FlowSeries(starts[i], flo_out[offsets[i] : offsets[i + 1]])
+    series = series.slice_years(start_year, end_year)
+    return FlowSeries(series.start, np.array(series.values, dtype=dtype))
+
+
+def extract_flow(source, unit, start_year, end_year, dtype="float64"):
+    """Daily 'flo_out' of a channel as a FlowSeries"""
+
+    units, starts, offsets, flo_out = load(source)
+    i = int(np.searchsorted(units, int(unit)))
+    if i == len(units) or units[i] != int(unit):
+        return FlowSeries(0, np.empty(0, dtype=dtype))
+    return channel_series(starts, offsets, flo_out, i, start_year, end_year, dtype)
+
+
+def extract_all_flows(source, start_year, end_year, units=None, dtype="float64"):
+    """Yield (unit, FlowSeries) for every channel (or the 'units', as strings)"""
+
+    all_units, starts, offsets, flo_out = load(source)
+    units = set(units) if units is not None else None
+    for i, unit in enumerate(all_units.tolist()):
+        unit = str(unit)
+        if units is not None and unit not in units:
+            continue
+        yield unit, channel_series(starts, offsets, flo_out, i, start_year, end_year, dtype)
+
+
+def build_columns(source):
+    """Write the columnar copy of a SWAT+ database or text output (rows copied)"""
+
+    import iahris_pipeline as pipeline
+
+    folder = columns_path(source)
+    temp_folder = folder + ".tmp"
+    old_folder = folder + ".old"
+    shutil.rmtree(temp_folder, ignore_errors=True)
+    os.makedirs(temp_folder)
+
+    # Signature taken before reading (outputs rewritten meanwhile make it stale)
+    size, mtime_ns = source_signature(source)
+
+    try:
+        # Read from the SWAT+ outputs, not from the current copy (kept until the
+        # new one is complete)
+        summary = sorted(pipeline.channel_summary(source, columns=False))
+        counts = np.array([row[3] for row in summary], dtype=np.int64)
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+        units = np.array([row[0] for row in summary], dtype=np.int64)
+        starts = np.zeros(len(units), dtype=np.int64)
+
+        # 'flo_out' written channel after channel (one scan of the outputs)
+        flo_out = np.lib.format.open_memmap(
+            os.path.join(temp_folder, "flo_out.npy"),
+            mode="w+",
+            dtype=np.float64,
+            shape=(int(offsets[-1]),),
+        )
+        positions = {str(unit): i for i, unit in enumerate(units.tolist())}
+        for unit, series in pipeline.extract_all_swatplus_flows(
+            source, 0, 9999, columns=False
+        ):
+            if unit not in positions:
+                raise ValueError(
+                    f"Channel {unit} is not in the channel summary (outputs rewritten "
+                    "during the conversion?)"
+                )
+            i = positions[unit]
+            if len(series) != counts[i]:
+                raise ValueError(f"Channel {unit} has repeated or missing days")
+            starts[i] = series.start
+            flo_out[offsets[i] : offsets[i + 1]] = series.values
+        flo_out.flush()
+        del flo_out
+
+        np.save(os.path.join(temp_folder, "units.npy"), units)
+        np.save(os.path.join(temp_folder, "starts.npy"), starts)
+        np.save(os.path.join(temp_folder, "offsets.npy"), offsets)
+        with open(os.path.join(temp_folder, SOURCE_FILE), "w") as source_file:
+            json.dump(
+                {"version": COLUMNS_VERSION, "size": size, "mtime_ns": mtime_ns},
+                source_file,
+            )
+
+        # The previous copy is only replaced by a complete one
+        shutil.rmtree(old_folder, ignore_errors=True)
+        if os.path.exists(folder):
+            os.replace(folder, old_folder)
+        os.replace(temp_folder, folder)
+    finally:
+        shutil.rmtree(temp_folder, ignore_errors=True)
+        shutil.rmtree(old_folder, ignore_errors=True)
+
+
+def columns_size(source):
+    """Bytes of the columnar copy"""
+    folder = columns_path(source)
+    return sum(os.path.getsize(os.path.join(folder, name)) for name in os.listdir(folder))
+
+
+def main(argv=None):
+    """Entry point of 'python main.py columns ...'"""
+
+    import iahris_pipeline as pipeline
+
+    parser = argparse.ArgumentParser(
+        prog="main.py columns",
+        description="Columnar copy of 'channel_sd_day' for instant channel lookups.",
+    )
+    parser.add_argument(
+        "path",
+        help="SWAT+ 'Scenarios' folder, a swatplus_output.sqlite or a channel_sd_day.txt",
+    )
+    parser.add_argument(
+        "--remove", action="store_true", help="Remove the columnar copies instead"
+    )
+    args = parser.parse_args(sys.argv[2:] if argv is None else argv)
+
+    if os.path.isdir(args.path):
+        sources = [
+            pipeline.scenario_output(args.path, name)
+            for name in sorted(os.listdir(args.path))
+            if os.path.isdir(os.path.join(args.path, name))
+        ]
+        sources = [source for source in sources if os.path.exists(source)]
+    else:
+        sources = glob.glob(args.path)
+
+    for source in sources:
+        if args.remove:
+            shutil.rmtree(columns_path(source), ignore_errors=True)
+            print(f"{source}: columnar copy removed")
+            continue
+
+        start = time.perf_counter()
+        try:
+            build_columns(source)
+        except (OSError, ValueError, KeyError, sqlite3.DatabaseError) as error:
+            print(f"{source}: {error}")
+            continue
+        print(
+            "{}: {:.1f} MB written in {:.1f} s".format(
+                source, columns_size(source) / 1024 / 1024, time.perf_counter() - start
+            )
+        )
+
+    return 0
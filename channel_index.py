@@ -0,0 +1,272 @@
+"""
+/***************************************************************************
+ **SWATPlus-IAHRIS
+ **A software that links SWATPlus to IAHRIS to automatically generate reports on Indicators of Hydrologic Alteration in RIverS.
+ **Optional covering index of 'channel_sd_day' (in the SWAT+ database or in a sidecar file).
+----------------------------------------------------
+        begin                : **May-2025
+        copyright            : **COPYRIGHT
+        email                : **alopbal@upv.es
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 3 of the License, or     *
+ *   any later version.                                                    *
+ *                                                                         *
+ ***************************************************************************/
+
+SWAT+ Editor does not index 'channel_sd_day', so every lookup by 'unit' is a full
+table scan. The index is opt-in:
+    python main.py index <Scenarios folder or swatplus_output.sqlite> [--in-database]
+
+By default the index is written to a sidecar file next to the SWAT+ database
+(swatplus_output.sqlite -> swatplus_output.index.sqlite) with a copy of the
+(unit, yr, mon, day, flo_out) columns clustered by unit and date, so the SWAT+
+output stays untouched. The sidecar stores the size and mtime of the source and is
+ignored once they change.
+"""
+
+import argparse
+import glob
+import os
+import pathlib
+import sqlite3
+import sys
+import time
+
+
+# Name of the covering index in the SWAT+ database
+INDEX_NAME = "idx_channel_sd_day_unit_yr"
+INDEX_COLUMNS = "unit, yr, mon, day, flo_out"
+
+
+def sidecar_path(sqlite):
+    """Path of the sidecar index file of a SWAT+ database"""
+    return os.path.splitext(sqlite)[0] + ".index.sqlite"
+
+
+def source_signature(sqlite):
+    """Size and modification time (ns) of the SWAT+ database"""
+    stat = os.stat(sqlite)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def read_only_uri(path, immutable=False):
+    """file: URI that opens a database read-only (never locked for writing)
+
+    immutable=True also skips the locks and the change detection of SQLite, for
+    files that are never written while open (the sidecar index).
+    """
+    uri = pathlib.Path(os.path.abspath(path)).as_uri()
+    return uri + ("?immutable=1" if immutable else "?mode=ro")
+
+
+def has_fresh_sidecar(sqlite):
+    """True if the sidecar index exists and matches the current SWAT+ database"""
+
+    sidecar = sidecar_path(sqlite)
+    if not os.path.exists(sidecar):
+        return False
+
+    # Read-only (a sidecar being replaced is never locked for writing)
+    conn = sqlite3.connect(read_only_uri(sidecar), uri=True)
+    try:
+        row = conn.execute("SELECT size, mtime_ns FROM source").fetchone()
+    except sqlite3.DatabaseError:
+        return False
+    finally:
+        conn.close()
+    return row is not None and tuple(row) == source_signature(sqlite)
+
+
+def lookup_database(sqlite):
+    """Database to query for 'channel_sd_day' (fresh sidecar if any, else the SWAT+ one)"""
+    if has_fresh_sidecar(sqlite):
+        return sidecar_path(sqlite)
+    return sqlite
+
+
+def build_database_index(sqlite):
+    """Create the covering index inside the SWAT+ database (the only connection that
+    writes to it, on explicit request with --in-database)"""
+    conn = sqlite3.connect(sqlite)
+    try:
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON channel_sd_day ({INDEX_COLUMNS})"
+        )
+        conn.execute("ANALYZE channel_sd_day")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def build_sidecar_index(sqlite):
+    """Copy (unit, yr, mon, day, flo_out) to an indexed sidecar file"""
+
+    sidecar = sidecar_path(sqlite)
+    temp_sidecar = sidecar + ".tmp"
+    if os.path.exists(temp_sidecar):
+        os.remove(temp_sidecar)
+
+    # Signature taken before copying (a database rewritten meanwhile makes it stale)
+    size, mtime_ns = source_signature(sqlite)
+
+    # uri=True lets ATTACH open the SWAT+ database read-only
+    conn = sqlite3.connect(temp_sidecar, uri=True)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("ATTACH DATABASE ? AS src", (read_only_uri(sqlite),))
+        # Clustered on (unit, yr, mon, day): the table itself is the covering index
+        # ('seq' keeps the source rowid so repeated dates are never merged)
+        conn.execute(
+            """
+            CREATE TABLE channel_sd_day (
+                unit INTEGER, yr INTEGER, mon INTEGER, day INTEGER, seq INTEGER,
+                flo_out REAL,
+                PRIMARY KEY (unit, yr, mon, day, seq)
+            ) WITHOUT ROWID
+            """
+        )
+        conn.execute(
+            """
+            INSERT INTO channel_sd_day
+            SELECT unit, yr, mon, day, rowid, flo_out
+            FROM src.channel_sd_day ORDER BY unit, yr, mon, day, rowid
+            """
+        )
+        conn.execute("CREATE TABLE source (size INTEGER, mtime_ns INTEGER)")
+        conn.execute("INSERT INTO source VALUES (?, ?)", (size, mtime_ns))
+        conn.commit()
+        conn.execute("DETACH DATABASE src")
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+
+    os.replace(temp_sidecar, sidecar)
+
+
+def time_lookups(database, unit):
+    """Seconds of the scenario metadata query and of the extraction of one unit"""
+
+    # Read-only: timing the lookups never locks or modifies the SWAT+ output
+    conn = sqlite3.connect(read_only_uri(database), uri=True)
+    try:
+        start = time.perf_counter()
+        conn.execute(
+            "SELECT unit, MIN(yr), MAX(yr), COUNT(*) FROM channel_sd_day GROUP BY unit"
+        ).fetchall()
+        metadata = time.perf_counter() - start
+
+        start = time.perf_counter()
+        conn.execute(
+            "SELECT yr, mon, day, flo_out FROM channel_sd_day WHERE unit = ?", (unit,)
+        ).fetchall()
+        extraction = time.perf_counter() - start
+    finally:
+        conn.close()
+
+    return metadata, extraction
+
+
+def build_index(sqlite, in_database=False):
+    """Build the covering index and return the timings (seconds) before/after it"""
+
+    conn = sqlite3.connect(read_only_uri(sqlite), uri=True)
+    try:
+        row = conn.execute("SELECT unit FROM channel_sd_day LIMIT 1").fetchone()
+    finally:
+        conn.close()
+    if row is None:
+        raise ValueError(f"'channel_sd_day' is empty in {sqlite}")
+    unit = row[0]
+
+    # Lookups without index
+    before = time_lookups(sqlite, unit)
+
+    # One-off cost of the index
+    start = time.perf_counter()
+    if in_database:
+        build_database_index(sqlite)
+    else:
+        build_sidecar_index(sqlite)
+    build = time.perf_counter() - start
+
+    # Lookups with index
+    after = time_lookups(lookup_database(sqlite), unit)
+
+    return {
+        "metadata_before": before[0],
+        "metadata_after": after[0],
+        "extraction_before": before[1],
+        "extraction_after": after[1],
+        "build": build,
+    }
+
+
+def format_report(sqlite, timings):
+    """Text report of the time saved by the index"""
+
+    saved = (timings["metadata_before"] - timings["metadata_after"]) + (
+        timings["extraction_before"] - timings["extraction_after"]
+    )
+    lines = [
+        sqlite,
+        "  scenario metadata: {:.3f} s -> {:.3f} s".format(
+            timings["metadata_before"], timings["metadata_after"]
+        ),
+        "  channel extraction: {:.3f} s -> {:.3f} s".format(
+            timings["extraction_before"], timings["extraction_after"]
+        ),
+        "  index build (one-off): {:.3f} s".format(timings["build"]),
+    ]
+    if saved > 0:
+        lines.append(
+            "  saved per scenario selection + report: {:.3f} s "
+            "(index pays off after {:.1f} runs)".format(
+                saved, timings["build"] / saved
+            )
+        )
+    else:
+        lines.append("  no time saved (the table is too small to benefit)")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Entry point of 'python main.py index ...'"""
+
+    parser = argparse.ArgumentParser(
+        prog="main.py index",
+        description="Build the covering index of 'channel_sd_day' for faster lookups.",
+    )
+    parser.add_argument(
+        "path", help="SWAT+ 'Scenarios' folder or a swatplus_output.sqlite file"
+    )
+    parser.add_argument(
+        "--in-database",
+        action="store_true",
+        help="Create the index inside the SWAT+ database instead of a sidecar file",
+    )
+    args = parser.parse_args(sys.argv[2:] if argv is None else argv)
+
+    if os.path.isdir(args.path):
+        databases = sorted(
+            glob.glob(
+                os.path.join(args.path, "*", "Results", "swatplus_output.sqlite")
+            )
+        )
+    else:
+        databases = [args.path]
+
+    for sqlite in databases:
+        try:
+            timings = build_index(sqlite, in_database=args.in_database)
+        except (sqlite3.DatabaseError, ValueError) as error:
+            print(f"{sqlite}: {error}")
+            continue
+        print(format_report(sqlite, timings))
+
+    return 0
@@ -0,0 +1,62 @@
+"""
+/***************************************************************************
+ **SWATPlus-IAHRIS
+ **A software that links SWATPlus to IAHRIS to automatically generate reports on Indicators of Hydrologic Alteration in RIverS.
+ **Folders used by SWATPlus-IAHRIS (can be overridden with environment variables).
+----------------------------------------------------
+        begin                : **May-2025
+        copyright            : **COPYRIGHT
+        email                : **alopbal@upv.es
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 3 of the License, or     *
+ *   any later version.                                                    *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import os
+import sys
+
+
+# Installation folder of SWATPlus-IAHRIS (created by the installer)
+IAHRIS_ROOT = os.environ.get("SWATPLUS_IAHRIS_ROOT", "C:\\SWATPlus-IAHRIS")
+IAHRIS_FOLDER = os.path.join(IAHRIS_ROOT, "IAHRIS4.0")
+TEMP_FOLDER = os.path.join(IAHRIS_ROOT, "temp")
+
+# Folder of the persistent caches (scenario metadata, ...)
+CACHE_FOLDER = os.environ.get(
+    "SWATPLUS_IAHRIS_CACHE",
+    os.path.join(os.path.expanduser("~"), ".swatplus-iahris", "cache"),
+)
+
+# Root of the per-job working folders (IAHRIS inputs and scripts), e.g. a RAM disk
+WORK_FOLDER = os.environ.get("SWATPLUS_IAHRIS_WORK", TEMP_FOLDER)
+
+# IAHRIS executable (run from IAHRIS_FOLDER); another command can stand in for it
+IAHRIS_COMMAND = os.environ.get("SWATPLUS_IAHRIS_COMMAND", "IAHRIS.exe")
+
+# Number of IAHRIS runs allowed at the same time
+IAHRIS_PARALLEL = int(os.environ.get("SWATPLUS_IAHRIS_PARALLEL", "1"))
+
+# Maximum size of the cache of generated reports in MB (0 disables it)
+REPORT_CACHE_MB = int(os.environ.get("SWATPLUS_IAHRIS_REPORT_CACHE_MB", "1024"))
+
+# Trace file of the per-stage profiling (empty: profiling off, see instrumentation)
+PROFILE_FILE = os.environ.get("SWATPLUS_IAHRIS_PROFILE", "")
+
+
+# https://stackoverflow.com/questions/7674790/bundling-data-files-with-pyinstaller-onefile/13790741#13790741
+def resource_path(relative_path):
+    """Get absolute path to resource, works for dev and for PyInstaller"""
+    try:
+        # PyInstaller creates a temp folder and stores path in _MEIPASS
+        base_path = sys._MEIPASS
+    except Exception:
+        base_path = os.path.abspath(".")
+
+    return os.path.join(base_path, relative_path)
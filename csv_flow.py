@@ -0,0 +1,271 @@
+"""
+/***************************************************************************
+ **SWATPlus-IAHRIS
+ **A software that links SWATPlus to IAHRIS to automatically generate reports on Indicators of Hydrologic Alteration in RIverS.
+ **Reading and validation of the Date/Flow CSV files (natural and altered flows).
+----------------------------------------------------
+        begin                : **May-2025
+        copyright            : **COPYRIGHT
+        email                : **alopbal@upv.es
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 3 of the License, or     *
+ *   any later version.                                                    *
+ *                                                                         *
+ ***************************************************************************/
+
+The CSV must have 'Date' and 'Flow' columns (see csv_format_example.csv). Dates are
+parsed with an explicit format, detected once from the first rows among
+DATE_FORMATS, and the whole file is checked in one vectorised pass: daily
+continuity, missing flows and negative flows. Errors give the line numbers.
+
+Validated files are kept in memory and in a binary sidecar (.npz in the cache
+folder) keyed by path, size and mtime, so report generation, new year windows and
+reopening the same file later do not parse the CSV again.
+"""
+
+import collections
+import csv
+import glob
+import hashlib
+import os
+
+import numpy as np
+
+from config import CACHE_FOLDER
+from flow_series import FlowSeries
+
+
+# Accepted date formats, in order of preference (M/D/YYYY as in csv_format_example.csv)
+DATE_FORMATS = ("%m/%d/%Y", "%Y-%m-%d", "%d/%m/%Y")
+
+# Rows used to detect the date format
+SAMPLE_ROWS = 1000
+
+# Number of positions listed in the error messages
+MAX_REPORTED = 10
+
+# Validated series kept in memory and as .npz sidecars (most recently used)
+MAX_LOADED = 8
+MAX_SIDECARS = 64
+SIDECAR_FOLDER = os.path.join(CACHE_FOLDER, "flow_csv")
+SIDECAR_VERSION = 2  # 2: flows keep their CSV type (integer or float)
+LOADED = collections.OrderedDict()
+
+
+class CsvFlowError(ValueError):
+    """Invalid flow CSV file (title and message are shown in the GUI warning)"""
+
+    def __init__(self, title, message):
+        super().__init__(message)
+        self.title = title
+
+
+def read_header(input_csv):
+    """Column names of the CSV file"""
+    with open(input_csv, newline="", encoding="utf-8-sig") as csv_file:
+        return next(csv.reader(csv_file), [])
+
+
+def detect_date_format(dates):
+    """Format of DATE_FORMATS that parses most sample dates (None if none parses any)"""
+    import pandas as pd
+
+    sample = pd.Series(dates[:SAMPLE_ROWS]).dropna()
+    best_format, best_count = None, 0
+    for date_format in DATE_FORMATS:
+        count = pd.to_datetime(sample, format=date_format, errors="coerce").notna().sum()
+        if count > best_count:
+            best_format, best_count = date_format, count
+    return best_format
+
+
+def parse_dates(dates, date_format):
+    """datetime64[D] array (NaT where the date does not match the format)"""
+    import pandas as pd
+
+    return pd.to_datetime(dates, format=date_format, errors="coerce").to_numpy(
+        dtype="datetime64[D]"
+    )
+
+
+def lines(positions):
+    """Line numbers in the file of data row positions (line 1 is the header)"""
+    shown = ", ".join(str(position + 2) for position in positions[:MAX_REPORTED])
+    return shown + ("..." if len(positions) > MAX_REPORTED else "")
+
+
+def read_flow_csv(input_csv):
+    """Read the Date/Flow columns: date strings, detected date format and flows"""
+
+    # pandas is only imported when a CSV is parsed (not from the .npz sidecars)
+    import pandas as pd
+
+    # Check if the CSV has the required columns (also separators)
+    header = [name.strip() for name in read_header(input_csv)]
+    if "Date" not in header or "Flow" not in header:
+        raise CsvFlowError(
+            "Invalid CSV Format",
+            "The CSV file must have 'Date' as the first column and 'Flow' as the second column. Please ensure the columns are correctly named and ordered.",
+        )
+
+    # Only the two columns (names with surrounding spaces too, e.g. 'Date , Flow ');
+    # 'Flow' keeps the type pandas infers for it (integer flows stay integers, so
+    # the IAHRIS input files write them as the former to_csv did)
+    try:
+        df = pd.read_csv(
+            input_csv,
+            usecols=lambda name: name.strip() in ("Date", "Flow"),
+            skipinitialspace=True,
+        )
+    except (ValueError, pd.errors.ParserError) as error:
+        raise CsvFlowError(
+            "Invalid CSV Format", f"The CSV file could not be read: {error}"
+        )
+    df = df.rename(columns=str.strip)
+    if sorted(df.columns) != ["Date", "Flow"]:
+        raise CsvFlowError(
+            "Invalid CSV Format",
+            "The CSV file must have exactly one 'Date' and one 'Flow' column.",
+        )
+    df["Date"] = df["Date"].astype("string")
+    if df["Flow"].dtype.kind not in "iuf":
+        # Non-numeric flows: locate them
+        flows = pd.to_numeric(df["Flow"], errors="coerce").to_numpy(dtype="float64")
+        bad = np.flatnonzero(np.isnan(flows) & df["Flow"].notna().to_numpy())
+        raise CsvFlowError(
+            "Invalid Flow Data",
+            f"The 'Flow' column must be numeric. Non-numeric values in lines: {lines(bad)}.",
+        )
+    flows = df["Flow"].to_numpy()
+
+    dates = df["Date"].to_numpy(dtype=object, na_value=None)
+    date_format = detect_date_format(dates)
+    return dates, date_format, flows
+
+
+def validate_flow_csv(input_csv):
+    """Check a flow CSV file in one pass and return it as a FlowSeries
+
+    Raises CsvFlowError with the title/message of the GUI warning and the lines of
+    the first problems found (gaps, unparseable dates, missing or negative flows).
+    """
+
+    dates, date_format, flows = read_flow_csv(input_csv)
+
+    if date_format is None or len(dates) < 2:
+        raise CsvFlowError(
+            "Invalid Date Frequency",
+            "The 'Date' column must have a daily frequency without any gaps. Dates must be written as MM/DD/YYYY (e.g. 1/31/1970), YYYY-MM-DD or DD/MM/YYYY.",
+        )
+
+    # Daily continuity: every date parsed and exactly one day after the previous one
+    days = parse_dates(dates, date_format)
+    unparsed = np.flatnonzero(np.isnat(days))
+    if len(unparsed):
+        raise CsvFlowError(
+            "Invalid Date Frequency",
+            f"The 'Date' column has values that are not dates ({date_format}) in lines: {lines(unparsed)}. Also, verify that the last row in the file is correct.",
+        )
+
+    gaps = np.flatnonzero(np.diff(days.astype(np.int64)) != 1) + 1
+    if len(gaps):
+        raise CsvFlowError(
+            "Invalid Date Frequency",
+            f"The 'Date' column must have a daily frequency without any gaps. Please ensure the dates are consecutive and there are no missing days. Gaps, repeated or unordered dates in lines: {lines(gaps)}.",
+        )
+
+    # Check if the 'Flow' column has no gaps or negative values
+    missing = np.flatnonzero(np.isnan(flows))
+    negative = np.flatnonzero(flows < 0)
+    if len(missing) or len(negative):
+        details = []
+        if len(missing):
+            details.append(f"missing values in lines: {lines(missing)}")
+        if len(negative):
+            details.append(f"negative values in lines: {lines(negative)}")
+        raise CsvFlowError(
+            "Invalid Flow Data",
+            "The 'Flow' column must have no gaps or negative values. Found "
+            + "; ".join(details)
+            + ".",
+        )
+
+    return FlowSeries(days[0].astype(np.int64), flows)
+
+
+def file_key(input_csv):
+    """Normalised path, size and mtime (ns) of a CSV file"""
+    stat = os.stat(input_csv)
+    return os.path.normcase(os.path.abspath(input_csv)), stat.st_size, stat.st_mtime_ns
+
+
+def sidecar_path(key):
+    """Path of the .npz sidecar of a CSV file"""
+    name = hashlib.sha1(key[0].encode("utf-8")).hexdigest()
+    return os.path.join(SIDECAR_FOLDER, name + ".npz")
+
+
+def read_sidecar(key):
+    """Validated series stored for this path, size and mtime (None if missing)"""
+    try:
+        with np.load(sidecar_path(key)) as data:
+            if "version" not in data or int(data["version"]) != SIDECAR_VERSION:
+                return None
+            if (int(data["size"]), int(data["mtime_ns"])) != key[1:]:
+                return None
+            return FlowSeries(int(data["start"]), data["values"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def write_sidecar(key, series):
+    """Store a validated series and keep the MAX_SIDECARS most recent ones"""
+    try:
+        os.makedirs(SIDECAR_FOLDER, exist_ok=True)
+        temp_path = sidecar_path(key) + ".tmp.npz"
+        np.savez(
+            temp_path,
+            start=series.start,
+            values=series.values,
+            size=key[1],
+            mtime_ns=key[2],
+            version=SIDECAR_VERSION,
+        )
+        os.replace(temp_path, sidecar_path(key))
+
+        sidecars = sorted(
+            glob.glob(os.path.join(SIDECAR_FOLDER, "*.npz")), key=os.path.getmtime
+        )
+        for old_sidecar in sidecars[:-MAX_SIDECARS]:
+            os.remove(old_sidecar)
+    except OSError:
+        pass
+
+
+def load_flow_csv(input_csv):
+    """Validated FlowSeries of a CSV file, parsed only once per file version
+
+    Looks in memory, then in the .npz sidecar, and only then parses and validates
+    the CSV (raising CsvFlowError as validate_flow_csv).
+    """
+
+    key = file_key(input_csv)
+    series = LOADED.get(key)
+    if series is None:
+        series = read_sidecar(key)
+        if series is None:
+            series = validate_flow_csv(input_csv)
+            write_sidecar(key, series)
+
+    # Most recently used series in memory
+    LOADED[key] = series
+    LOADED.move_to_end(key)
+    while len(LOADED) > MAX_LOADED:
+        LOADED.popitem(last=False)
+
+    return series
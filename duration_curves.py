@@ -0,0 +1,253 @@
+"""
+/***************************************************************************
+ **SWATPlus-IAHRIS
+ **A software that links SWATPlus to IAHRIS to automatically generate reports on Indicators of Hydrologic Alteration in RIverS.
+ **Batched flow duration curves (annual, monthly and seasonal) of many channels or scenarios.
+----------------------------------------------------
+        begin                : **May-2025
+        copyright            : **COPYRIGHT
+        email                : **alopbal@upv.es
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 3 of the License, or     *
+ *   any later version.                                                    *
+ *                                                                         *
+ ***************************************************************************/
+
+The input is a (series x days) matrix of daily flows (channels of a scenario or
+scenarios of a channel) starting on the same day, NaN where there is no data. As in
+reports nº 6 to 6e of IAHRIS, a curve is the average over the hydrologic years
+(October to September) of the curve of each year, at the exceedance PERCENTILES
+(Weibull plotting position). For every period (year, month or season) the days of
+all the series and years are gathered into one (series x years x days) array,
+sorted once and interpolated with index arithmetic, so a whole watershed takes one
+sort per period.
+
+    python main.py curves --scenarios C:\\Model\\Scenarios --names Default,Reservoir
+        --units all --output curves.csv   (or curves.parquet if pyarrow is installed)
+"""
+
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+
+# Exceedance probabilities of the curves
+PERCENTILES = np.array(
+    [0.01, 0.05, 0.10, 0.20, 0.30, 0.40, 0.50, 0.60, 0.70, 0.80, 0.90, 0.95, 0.99]
+)
+
+# First month of the hydrologic year (October)
+FIRST_MONTH = 10
+MONTHS = ["Oct", "Nov", "Dec", "Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep"]
+
+# Seasons as months of the hydrologic year (0 = October)
+SEASONS = {
+    "Autumn": (0, 1, 2),
+    "Winter": (3, 4, 5),
+    "Spring": (6, 7, 8),
+    "Summer": (9, 10, 11),
+}
+
+# Years with fewer days of data in a period are left out of its average curve
+MIN_COVERAGE = 0.9
+
+
+def hydrologic_calendar(start, n_days):
+    """Hydrologic year (index from the first one) and month (0 = Oct) of every day"""
+    dates = np.arange(start, start + n_days).astype("datetime64[D]")
+    months = dates.astype("datetime64[M]").astype(np.int64)
+    hydro_months = months - (FIRST_MONTH - 1)
+    years = hydro_months // 12
+    if n_days == 0:
+        return years, hydro_months
+    return years - years[0], hydro_months % 12
+
+
+def period_layout(years, months, selected_months):
+    """(years x days) positions of the days of some months in every hydrologic year
+
+    Returns the positions in the day axis (-1 for padding) and the number of days
+    of the period in a complete year.
+    """
+
+    in_period = np.isin(months, selected_months)
+    day_positions = np.flatnonzero(in_period)
+    period_years = years[day_positions]
+
+    n_years = years[-1] + 1
+    counts = np.bincount(period_years, minlength=n_years)
+    width = counts.max(initial=0)
+
+    # Rank of every day inside its year
+    firsts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    ranks = np.arange(len(day_positions)) - firsts[period_years]
+
+    positions = np.full((n_years, width), -1, dtype=np.int64)
+    positions[period_years, ranks] = day_positions
+    return positions, width
+
+
+def average_curve(flows, positions, expected_days, percentiles=PERCENTILES):
+    """(series x percentiles) average of the yearly duration curves of a period"""
+
+    # (series x years x days) flows of the period, NaN for padding and missing data
+    gathered = np.where(positions >= 0, flows[:, np.maximum(positions, 0)], np.nan)
+
+    # Descending order (NaN last) and number of valid days of every series and year
+    ordered = -np.sort(-gathered, axis=-1)
+    valid = np.count_nonzero(~np.isnan(gathered), axis=-1)
+
+    # Weibull plotting position: the flow of rank i is exceeded i / (n + 1)
+    rank = np.clip(percentiles * (valid[..., None] + 1), 1, np.maximum(valid, 1)[..., None])
+    lower = np.floor(rank).astype(np.int64)
+    upper = np.minimum(lower + 1, np.maximum(valid, 1)[..., None])
+    fraction = rank - lower
+    low = np.take_along_axis(ordered, lower - 1, axis=-1)
+    high = np.take_along_axis(ordered, upper - 1, axis=-1)
+    curves = low + fraction * (high - low)
+
+    # Average over the years with enough data
+    complete = valid >= MIN_COVERAGE * expected_days
+    curves = np.where(complete[..., None], curves, np.nan)
+    with np.errstate(invalid="ignore"):
+        counts = complete.sum(axis=1)[:, None]
+        return np.where(counts > 0, np.nansum(curves, axis=1) / np.maximum(counts, 1), np.nan)
+
+
+def duration_curves(flows, start, percentiles=PERCENTILES):
+    """Annual, monthly and seasonal curves of a (series x days) flow matrix
+
+    'start' is the epoch day of the first column. Returns a dict period ->
+    (series x percentiles) array, periods being 'Annual', the months and the seasons.
+    """
+
+    flows = np.asarray(flows, dtype=np.float64)
+    if flows.ndim == 1:
+        flows = flows[None, :]
+    years, months = hydrologic_calendar(start, flows.shape[1])
+
+    periods = {"Annual": tuple(range(12))}
+    periods.update({name: (m,) for m, name in enumerate(MONTHS)})
+    periods.update(SEASONS)
+
+    # Without days every curve is empty (NaN)
+    if flows.shape[1] == 0:
+        empty = np.full((flows.shape[0], len(percentiles)), np.nan)
+        return {name: empty.copy() for name in periods}
+
+    curves = {}
+    for name, selected_months in periods.items():
+        positions, width = period_layout(years, months, selected_months)
+        curves[name] = average_curve(flows, positions, width, percentiles)
+    return curves
+
+
+def stack_series(series_list):
+    """(start, series x days matrix) of FlowSeries aligned on the days of all of them"""
+    series_list = [series for series in series_list if len(series)]
+    if not series_list:
+        return 0, np.empty((0, 0))
+    start = min(series.start for series in series_list)
+    end = max(series.end for series in series_list)
+    flows = np.full((len(series_list), end - start + 1), np.nan)
+    for row, series in zip(flows, series_list):
+        row[series.start - start : series.end - start + 1] = series.values
+    return start, flows
+
+
+def curves_table(labels, curves, percentiles=PERCENTILES):
+    """DataFrame with one row per series and period and one column per percentile"""
+
+    columns = [f"P{round(p * 100):g}" for p in percentiles]
+    frames = []
+    for period, values in curves.items():
+        frame = pd.DataFrame(values, columns=columns)
+        frame.insert(0, "period", period)
+        frame.insert(0, "series", labels)
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+def write_table(table, output_path):
+    """Write the curves to CSV (';' separated) or Parquet (.parquet, needs pyarrow)"""
+    if output_path.lower().endswith(".parquet"):
+        table.to_parquet(output_path, index=False)
+    else:
+        table.to_csv(output_path, sep=";", index=False, float_format="%.6g")
+
+
+def scenario_flows(args, name, units):
+    """(labels, FlowSeries) of the selected units of a scenario or of a CSV file"""
+
+    import batch
+    import iahris_pipeline as pipeline
+
+    if batch.is_csv(name):
+        series = pipeline.read_csv_flow(name, args.start, args.end)
+        return [pipeline.csv_scenario_name(name)], [series]
+
+    sqlite = pipeline.scenario_output(args.scenarios, name)
+    labels, series_list = [], []
+    for unit, series in pipeline.extract_all_swatplus_flows(
+        sqlite, args.start, args.end, units
+    ):
+        labels.append(f"{name}/{unit}")
+        series_list.append(series)
+    return labels, series_list
+
+
+def main(argv=None):
+    """Entry point of 'python main.py curves ...'"""
+
+    import batch
+
+    parser = argparse.ArgumentParser(
+        prog="main.py curves",
+        description="Flow duration curves of many channels and scenarios at once.",
+    )
+    parser.add_argument("--scenarios", help="SWAT+ 'Scenarios' folder")
+    parser.add_argument(
+        "--names",
+        required=True,
+        help="Comma separated scenario names and/or flow CSV files",
+    )
+    parser.add_argument("--units", default="all", help="'all' or a list (e.g. 1,5,12)")
+    parser.add_argument("--start", type=int, help="First year")
+    parser.add_argument("--end", type=int, help="Last year")
+    parser.add_argument("--output", required=True, help="Output .csv or .parquet file")
+    args = parser.parse_args(sys.argv[2:] if argv is None else argv)
+
+    names = [name.strip() for name in args.names.split(",") if name.strip()]
+    if not names:
+        raise SystemExit("--names lists no scenario or CSV file")
+    metadata = [batch.source_metadata(args, name) for name in names]
+    args.start = args.start or min(m[1] for m in metadata)
+    args.end = args.end or max(m[2] for m in metadata)
+
+    channels = [m[0] for m in metadata if m[0] is not None]
+    units = None
+    if channels:
+        units = batch.select_units(args.units, channels[0], channels[-1])
+
+    labels, series_list = [], []
+    for name in names:
+        name_labels, name_series = scenario_flows(args, name, units)
+        labels += name_labels
+        series_list += name_series
+
+    start, flows = stack_series(series_list)
+    if flows.size == 0:
+        raise SystemExit(
+            f"No flows of the selected units between {args.start} and {args.end}"
+        )
+    table = curves_table(labels, duration_curves(flows, start))
+    write_table(table, args.output)
+    print(f"{len(labels)} series, {len(table)} curves written to {args.output}")
+    return 0
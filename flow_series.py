@@ -0,0 +1,128 @@
+"""
+/***************************************************************************
+ **SWATPlus-IAHRIS
+ **A software that links SWATPlus to IAHRIS to automatically generate reports on Indicators of Hydrologic Alteration in RIverS.
+ **Compact daily flow series (first day + contiguous NumPy array of flows).
+----------------------------------------------------
+        begin                : **May-2025
+        copyright            : **COPYRIGHT
+        email                : **alopbal@upv.es
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 3 of the License, or     *
+ *   any later version.                                                    *
+ *                                                                         *
+ ***************************************************************************/
+
+A daily series is fully described by the epoch day (days since 1970-01-01) of its
+first value and the flows themselves, so no date is stored per value. Dates are only
+formatted (DD/MM/YYYY) when the IAHRIS input files are written.
+"""
+
+import numpy as np
+
+
+def ymd_to_dates(years, months, days):
+    """datetime64[D] array from year, month and day arrays"""
+    years = np.asarray(years, dtype=np.int64)
+    months = np.asarray(months, dtype=np.int64)
+    days = np.asarray(days, dtype=np.int64)
+    return (
+        (years - 1970).astype("datetime64[Y]").astype("datetime64[M]") + (months - 1)
+    ).astype("datetime64[D]") + (days - 1)
+
+
+def format_dates(dates):
+    """datetime64[D] array as DD/MM/YYYY strings (format required by IAHRIS)"""
+
+    # 'YYYY-MM-DD' characters rearranged to 'DD/MM/YYYY' without a Python loop
+    iso = np.datetime_as_string(np.asarray(dates, "datetime64[D]"), unit="D")
+    chars = iso.astype("U10").view("U1").reshape(-1, 10)
+    chars = chars[:, [8, 9, 4, 5, 6, 4, 0, 1, 2, 3]]
+    chars[:, 2] = "/"
+    chars[:, 5] = "/"
+    return np.ascontiguousarray(chars).view("U10").ravel()
+
+
+class FlowSeries:
+    """Continuous daily flow series: epoch day of the first value + flows"""
+
+    __slots__ = ("start", "values")
+
+    def __init__(self, start, values):
+        self.start = int(start)  # Days since 1970-01-01 of the first value
+        self.values = np.ascontiguousarray(values)
+
+    @classmethod
+    def from_dates(cls, dates, values, dtype=None):
+        """Series from a daily date array (datetime64) and its flows"""
+
+        days = np.asarray(dates, dtype="datetime64[D]").astype(np.int64)
+        values = np.asarray(values) if dtype is None else np.asarray(values, dtype)
+        if len(days) == 0:
+            return cls(0, values[:0])
+
+        # Daily continuity (no gaps, repeated or unordered days)
+        if len(days) > 1 and not (np.diff(days) == 1).all():
+            raise ValueError("The flow series is not a continuous daily series")
+        return cls(days[0], values)
+
+    @classmethod
+    def from_ymd(cls, years, months, days, values, dtype=None):
+        """Series from year, month and day arrays (e.g. SWAT+ 'yr', 'mon', 'day')"""
+        return cls.from_dates(ymd_to_dates(years, months, days), values, dtype)
+
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def end(self):
+        """Epoch day of the last value"""
+        return self.start + len(self.values) - 1
+
+    def dates(self):
+        """datetime64[D] array of the days of the series"""
+        return np.arange(self.start, self.start + len(self.values)).astype(
+            "datetime64[D]"
+        )
+
+    def first_date(self):
+        """datetime64[D] of the first value"""
+        return np.datetime64(self.start, "D")
+
+    def last_date(self):
+        """datetime64[D] of the last value"""
+        return np.datetime64(self.end, "D")
+
+    def slice_years(self, start_year, end_year):
+        """Sub-series between 1 January of start_year and 31 December of end_year"""
+
+        first = np.datetime64(f"{start_year:04d}-01-01", "D").astype(np.int64)
+        last = np.datetime64(f"{end_year + 1:04d}-01-01", "D").astype(np.int64) - 1
+        i = min(max(first - self.start, 0), len(self.values))
+        j = min(max(last - self.start + 1, i), len(self.values))
+        return FlowSeries(self.start + i, self.values[i:j])
+
+    def year_range(self):
+        """Calendar years of the first and last values"""
+        first, last = np.array([self.start, self.end]).astype("datetime64[D]")
+        return (
+            int(first.astype("datetime64[Y]").astype(np.int64)) + 1970,
+            int(last.astype("datetime64[Y]").astype(np.int64)) + 1970,
+        )
+
+    def years(self):
+        """Calendar year of every value"""
+        return self.dates().astype("datetime64[Y]").astype(np.int64) + 1970
+
+    def format_dates(self):
+        """Dates as DD/MM/YYYY strings (format required by IAHRIS)"""
+        return format_dates(self.dates())
+
+    def nbytes(self):
+        """Memory used by the flows"""
+        return self.values.nbytes
@@ -0,0 +1,480 @@
+"""
+/***************************************************************************
+ **SWATPlus-IAHRIS
+ **A software that links SWATPlus to IAHRIS to automatically generate reports on Indicators of Hydrologic Alteration in RIverS.
+ **Main window of the GUI.
+----------------------------------------------------
+        begin                : **May-2025
+        copyright            : **COPYRIGHT
+        email                : **alopbal@upv.es
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 3 of the License, or     *
+ *   any later version.                                                    *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+from PyQt6 import QtWidgets
+from PyQt6.QtCore import QDate
+import os
+import sys
+
+import iahris_pipeline as pipeline
+import csv_flow
+import instrumentation
+import report_worker
+import scenario_store
+import ui_forms
+
+
+# Define a MainWindow class that inherits from QMainWindow
+class MainWindow(QtWidgets.QMainWindow, ui_forms.form_class("GUI")):
+    def __init__(self):
+        """Constructor of the SWATPlus-IAHRIS software - Main Window"""
+
+        super().__init__()
+
+        # Build the widgets (pre-generated from GUI.ui, see ui_forms)
+        self.setupUi(self)
+
+        # Connect click events to a function
+        self.pushButton_nat.clicked.connect(self.reset_select_file_nat)
+        self.comboBox_scenario_nat.activated.connect(self.select_Scenario_nat)
+
+        self.pushButton_alt.clicked.connect(self.select_file_alt)
+        self.comboBox_scenario_alt.activated.connect(self.select_Scenario_alt)
+
+        self.pushButton_reports.clicked.connect(self.generate_reports)
+        self.pushButton_cancel.clicked.connect(self.cancel_reports)
+
+        self.radioButton_swat_nat.toggled.connect(self.reset_var_nat)
+        self.radioButton_swat_alt.toggled.connect(self.reset_var_alt)
+
+        # Deactivate SWAT+ parts of the GUI
+        self.swatplus_nat.setEnabled(False)
+        self.swatplus_alt.setEnabled(False)
+        # Deactivate altered flow inputs
+        self.altered.setEnabled(False)
+        # Deactivate the reports button
+        self.pushButton_reports.setEnabled(False)
+
+        # Reports are generated in the background, one after another
+        self.report_queue = report_worker.ReportQueue(self)
+        self.reports_windows = []
+        self.progress_stage = ""
+        self.pushButton_cancel.setEnabled(False)
+
+    def reset_var_nat(self):
+        """Reset variables when the nat radio button is toggled"""
+
+        # Reset the folder and comboBox
+        folder = None
+        self.lineEdit_nat.setText(folder)
+        self.comboBox_scenario_nat.clear()
+        self.swatplus_nat.setEnabled(False)
+        self.comboBox_channel_nat.clear()
+        self.DateEdit_start_year_nat.setDate(QDate(2000, 1, 1))
+        self.DateEdit_finish_year_nat.setDate(QDate(2000, 1, 1))
+
+        # Reset SWAT+ parts of the GUI
+        self.swatplus_nat.setEnabled(False)
+        self.pushButton_nat.setEnabled(True)
+
+    def reset_var_alt(self):
+        """Reset variables when the alt radio button is toggled"""
+        # Reset the folder and comboBox
+        folder = None
+        self.lineEdit_alt.setText(folder)
+        self.comboBox_scenario_alt.clear()
+        self.swatplus_alt.setEnabled(False)
+        self.comboBox_channel_alt.clear()
+        self.DateEdit_start_year_alt.setDate(QDate(2000, 1, 1))
+        self.DateEdit_finish_year_alt.setDate(QDate(2000, 1, 1))
+
+        # Reset the SWAT+ parts of the GUI and reports button
+        self.pushButton_reports.setEnabled(False)
+        self.swatplus_alt.setEnabled(False)
+
+    def select_file_nat(self):
+        """Open folder or file for nat input"""
+
+        if self.radioButton_swat_nat.isChecked():
+
+            if self.lineEdit_nat.text() == None or self.lineEdit_nat.text() == "":
+                path = self.lineEdit_nat.text()
+                # Open SWAT Scenario folder from GUI
+                folder = QtWidgets.QFileDialog.getExistingDirectory(
+                    self, "Select SWAT+ 'Scenarios' folder", path
+                )
+
+            else:
+                # Open SWAT Scenario folder from CLI
+                folder = self.lineEdit_nat.text()
+                self.pushButton_nat.setEnabled(False)
+
+            # Check if the folder is SWAT+ Scenarios folder
+            if folder and folder.endswith("Scenarios"):
+                self.lineEdit_nat.setText(folder)
+                self.swatplus_nat.setEnabled(True)
+
+                # Clear the comboBox and add folder names
+                self.comboBox_scenario_nat.clear()
+                subfolders = [f.name for f in os.scandir(folder) if f.is_dir()]
+                self.comboBox_scenario_nat.addItems(subfolders)
+
+                # Activate the altered flow inputs
+                self.altered.setEnabled(True)
+
+            else:
+                # Reset folder, clear comboBox, disable Qframe and show Warning
+                folder = None
+                self.lineEdit_nat.setText(folder)
+                self.comboBox_scenario_nat.clear()
+                self.swatplus_nat.setEnabled(False)
+                QtWidgets.QMessageBox.warning(
+                    self,
+                    "Invalid Folder",
+                    "Please select the SWAT+ 'Scenarios' folder.",
+                )
+
+        if self.radioButton_csv_nat.isChecked():
+            self.swatplus_nat.setEnabled(False)
+            # Open a CSV file
+            fname = QtWidgets.QFileDialog.getOpenFileName(
+                self, "Open natural flow CSV file", "", "CSV files (*.csv)"
+            )
+            self.lineEdit_nat.setText(fname[0])
+
+            # Read the CSV file, check format (columns, daily, gaps) and extract the max and min date
+            if fname[0]:
+                # Single-pass validation shared by the natural and altered flows
+                try:
+                    series = csv_flow.load_flow_csv(fname[0])
+                except csv_flow.CsvFlowError as error:
+                    QtWidgets.QMessageBox.warning(self, error.title, str(error))
+                    reset = None
+                    self.lineEdit_nat.setText(reset)
+                    return
+
+                # Extract the max and min date
+                min_year, max_year = series.year_range()
+                self.DateEdit_finish_year_nat.setDate(QDate(max_year, 1, 1))
+                self.DateEdit_start_year_nat.setDate(QDate(min_year, 1, 1))
+
+                # Activate the altered flow inputs
+                self.altered.setEnabled(True)
+
+    def reset_select_file_nat(self):
+        """Pass multiple methods as argument - Reset the natural flow inputs and select the SWAT+ scenario"""
+        self.reset_var_nat()
+        self.select_file_nat()
+
+    def select_Scenario_nat(self):
+        """Select the SWAT+ scenario from the comboBox"""
+
+        # Get the folder and scenario name from GUI
+        folder = self.lineEdit_nat.text()
+        scenario = self.comboBox_scenario_nat.currentText()
+
+        # Channels and min/max years of the SQLite database of SWAT+ editor
+        with instrumentation.stage("select_scenario", side="nat", scenario=scenario):
+            sqlite = pipeline.scenario_output(folder, scenario)
+            channels, min_year, max_year = pipeline.scenario_metadata(sqlite)
+
+        # Add channel 'unit' to comboBox
+        self.comboBox_channel_nat.clear()
+        self.comboBox_channel_nat.addItems(channels)
+
+        # Add max and min years to QDateEdit
+        if min_year:
+            self.DateEdit_start_year_nat.setDate(QDate(min_year, 1, 1))
+        if max_year:
+            self.DateEdit_finish_year_nat.setDate(QDate(max_year, 1, 1))
+
+        # Show a warning if there is no 'channel_sd_day' in scenario
+        if channels == []:
+            QtWidgets.QMessageBox.warning(
+                self,
+                "Invalid SWAT+ Scenario",
+                f"'channel_sd_day' table not found in {scenario}. Please choose in SWAT+ Editor outputs to print: Daily > Model Components > Channel",
+            )
+
+    def select_file_alt(self):
+        """Open folder or file for alt input"""
+
+        if self.radioButton_swat_alt.isChecked():
+            path = self.lineEdit_nat.text()
+            # Open SWAT Scenario folder
+            folder = QtWidgets.QFileDialog.getExistingDirectory(
+                self, "Select SWAT+ 'Scenarios' folder", path
+            )
+            # Check if the folder is SWAT+ Scenarios folder
+            if folder and folder.endswith("Scenarios"):
+                self.lineEdit_alt.setText(folder)
+                self.swatplus_alt.setEnabled(True)
+
+                # Clear the comboBox and add folder names
+                self.comboBox_scenario_alt.clear()
+                subfolders = [f.name for f in os.scandir(folder) if f.is_dir()]
+                self.comboBox_scenario_alt.addItems(subfolders)
+
+            else:
+                # Reset folder, clear comboBox, disable Qframe and show Warning
+                folder = None
+                self.lineEdit_alt.setText(folder)
+                self.comboBox_scenario_alt.clear()
+                self.swatplus_alt.setEnabled(False)
+                QtWidgets.QMessageBox.warning(
+                    self,
+                    "Invalid Folder",
+                    "Please select the SWAT+ 'Scenarios' folder.",
+                )
+
+        if self.radioButton_csv_alt.isChecked():
+            # Deactivate the SWAT+ inputs and reports button
+            self.pushButton_reports.setEnabled(False)
+            self.swatplus_alt.setEnabled(False)
+
+            # Open a file
+            fname = QtWidgets.QFileDialog.getOpenFileName(
+                self, "Open altered flow CSV file", "", "CSV files (*.csv)"
+            )
+            self.lineEdit_alt.setText(fname[0])
+
+            # Read the CSV file, check format (columns, daily, gaps) and extract the max and min date
+            if fname[0]:
+                # Single-pass validation shared by the natural and altered flows
+                try:
+                    series = csv_flow.load_flow_csv(fname[0])
+                except csv_flow.CsvFlowError as error:
+                    QtWidgets.QMessageBox.warning(self, error.title, str(error))
+                    reset = None
+                    self.lineEdit_alt.setText(reset)
+                    return
+
+                # Extract the max and min date
+                min_year, max_year = series.year_range()
+                self.DateEdit_finish_year_alt.setDate(QDate(max_year, 1, 1))
+                self.DateEdit_start_year_alt.setDate(QDate(min_year, 1, 1))
+
+                # Activate the reports button
+                self.pushButton_reports.setEnabled(True)
+
+    def select_Scenario_alt(self):
+        """Select the SWAT+ scenario from the comboBox"""
+
+        # Get the folder and scenario name from GUI
+        folder = self.lineEdit_alt.text()
+        scenario = self.comboBox_scenario_alt.currentText()
+
+        # Channels and min/max years of the SQLite database of SWAT+ editor
+        with instrumentation.stage("select_scenario", side="alt", scenario=scenario):
+            sqlite = pipeline.scenario_output(folder, scenario)
+            channels, min_year, max_year = pipeline.scenario_metadata(sqlite)
+
+        # Add channel 'unit' to comboBox
+        self.comboBox_channel_alt.clear()
+        self.comboBox_channel_alt.addItems(channels)
+
+        # Add max and min years to comboBox
+        if min_year:
+            self.DateEdit_start_year_alt.setDate(QDate(min_year, 1, 1))
+        if max_year:
+            self.DateEdit_finish_year_alt.setDate(QDate(max_year, 1, 1))
+
+        # Show a warning if there is no 'channel_sd_day' in scenario
+        if channels == []:
+            QtWidgets.QMessageBox.warning(
+                self,
+                "Invalid SWAT+ Scenario",
+                f"'channel_sd_day' table not found in {scenario}. Please choose in SWAT+ Editor outputs to print: Daily > Model Components > Channel",
+            )
+            self.pushButton_reports.setEnabled(False)
+            return
+
+        # Activate the reports button
+        self.pushButton_reports.setEnabled(True)
+
+    def generate_reports(self):
+        """Generate IAHRIS reports"""
+
+        # Check the start and finish years of both nat and alt period
+        start_year_nat = self.DateEdit_start_year_nat.date().year()
+        end_year_nat = self.DateEdit_finish_year_nat.date().year()
+        start_year_alt = self.DateEdit_start_year_alt.date().year()
+        end_year_alt = self.DateEdit_finish_year_alt.date().year()
+
+        if end_year_nat - start_year_nat < 14 or end_year_alt - start_year_alt < 14:
+            QtWidgets.QMessageBox.warning(
+                self,
+                "Invalid selected periods",
+                "The selected periods for analysis must cover at least 15 consecutive years. Please adjust the start and end years to ensure that both periods are 15 years or longer.",
+            )
+            return
+
+        # Check if the 'SWATPlus-IAHRIS' folder exists (each report has its own temp folder)
+        if not os.path.exists(pipeline.IAHRIS_ROOT):
+            QtWidgets.QMessageBox.warning(
+                self,
+                "Installation error",
+                f"{pipeline.IAHRIS_ROOT} not found. Relaunch the installer.",
+            )
+            return
+
+        # Get the directory to save the reports
+        report_folder = QtWidgets.QFileDialog.getExistingDirectory(
+            self, "Select a folder to save the IAHRIS reports", ""
+        ).replace("/", "\\")
+
+        if not report_folder:
+            QtWidgets.QMessageBox.warning(
+                self,
+                "No Folder Selected",
+                "Please choose a location to save the IAHRIS reports.",
+            )
+            return
+
+        # Natural and altered flow sources selected in the GUI
+        source_nat = self.selected_source("nat")
+        source_alt = self.selected_source("alt")
+        if source_nat is None or source_alt is None:
+            QtWidgets.QMessageBox.warning(
+                self,
+                "No Channel Selected",
+                "Please select a channel of the SWAT+ scenario.",
+            )
+            return
+
+        job = {
+            "nat": source_nat,
+            "alt": source_alt,
+            "start_nat": start_year_nat,
+            "end_nat": end_year_nat,
+            "start_alt": start_year_alt,
+            "end_alt": end_year_alt,
+            "report_folder": report_folder,
+            # Unique IAHRIS project name and working folder of the report
+            "project_name": pipeline.new_job_id(),
+        }
+        worker = self.report_queue.submit(job)
+
+        # Run the pipeline on the background worker (queued after running reports)
+        worker.signals.progress.connect(self.on_report_progress)
+        worker.signals.finished.connect(self.on_report_finished)
+        worker.signals.failed.connect(self.on_report_failed)
+        worker.signals.cancelled.connect(self.on_report_cancelled)
+        self.report_queue.start(worker)
+        self.update_queue_status()
+
+    def selected_source(self, side):
+        """Natural ('nat') or altered ('alt') flow source of the GUI (see pipeline.write_source_input)"""
+
+        radio_button_csv = getattr(self, f"radioButton_csv_{side}")
+        line_edit = getattr(self, f"lineEdit_{side}")
+
+        # Flow from a CSV file (the scenario name is the name of the file)
+        if radio_button_csv.isChecked():
+            input_csv = line_edit.text()
+            return {"scenario": pipeline.csv_scenario_name(input_csv), "csv": input_csv}
+
+        # Flow of a channel of the SQLite database of SWAT+ editor
+        scenario = getattr(self, f"comboBox_scenario_{side}").currentText()
+        unit = getattr(self, f"comboBox_channel_{side}").currentText()
+        if unit == "":
+            return None
+        return {
+            "scenario": scenario,
+            "sqlite": pipeline.scenario_output(line_edit.text(), scenario),
+            "unit": unit,
+        }
+
+    def update_queue_status(self, stage=None):
+        """Show the stage of the running report and the number of queued reports"""
+
+        pending = self.report_queue.pending()
+        self.pushButton_cancel.setEnabled(pending > 0)
+        if pending == 0:
+            self.progressBar.setFormat("%p%")
+            return
+        if stage:
+            self.progress_stage = stage
+        text = f"%p% - {self.progress_stage}"
+        if pending > 1:
+            text += f" ({pending - 1} queued)"
+        self.progressBar.setFormat(text)
+
+    def on_report_progress(self, job_id, percent, stage):
+        """Progress of the running report"""
+        self.progressBar.setValue(percent)
+        self.update_queue_status(stage)
+
+    def on_report_finished(self, job_id, last_generated_xlsx):
+        """Open the reports window of a generated master report"""
+
+        self.progressBar.setValue(0)
+        self.update_queue_status("Waiting")
+
+        # The reports window is only imported with the first report
+        from reports_window import ReportsWindow
+
+        reports_window = ReportsWindow(
+            last_generated_xlsx, os.path.dirname(last_generated_xlsx)
+        )
+        self.reports_windows.append(reports_window)
+        reports_window.show()
+
+    def on_report_failed(self, job_id, title, message):
+        """Show the error of a failed report"""
+        self.progressBar.setValue(0)
+        self.update_queue_status("Waiting")
+        QtWidgets.QMessageBox.warning(self, title, message)
+
+    def on_report_cancelled(self, job_id):
+        """Reset the progress of a cancelled report"""
+        self.progressBar.setValue(0)
+        self.update_queue_status("Waiting")
+
+    def cancel_reports(self):
+        """Cancel the running report (stopping IAHRIS) and the queued ones"""
+        self.report_queue.cancel_all()
+        self.update_queue_status("Cancelling")
+
+    def closeEvent(self, event):
+        """Do not leave IAHRIS running when the window is closed"""
+        self.report_queue.cancel_all()
+        self.report_queue.wait()
+        # Connections opened to list the channels of the scenarios
+        scenario_store.close_all()
+        super().closeEvent(event)
+
+
+def main(argv=None):
+    """Entry point of the GUI: python main.py [Scenarios folder]"""
+
+    argv = sys.argv if argv is None else argv
+
+    # Create the application
+    app = QtWidgets.QApplication(argv)
+
+    # Create an instance of the MainWindow class
+    window = MainWindow()
+
+    # Check if a folder path is passed as a command-line argument
+    if len(argv) > 1:
+        folder = argv[1]  # Get the folder path from the command-line argument
+        if os.path.exists(folder) and os.path.isdir(folder):
+            window.lineEdit_nat.setText(folder)  # Set the folder path in the GUI
+            window.select_file_nat()
+        else:
+            pass
+
+    # Show the main window
+    window.show()
+
+    # Run the application's event loop
+    return app.exec()
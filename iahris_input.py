@@ -0,0 +1,187 @@
+"""
+/***************************************************************************
+ **SWATPlus-IAHRIS
+ **A software that links SWATPlus to IAHRIS to automatically generate reports on Indicators of Hydrologic Alteration in RIverS.
+ **Streaming writer of the IAHRIS input files (DIARIO;NATURAL;... / DIARIO;ALTERADO;...).
+----------------------------------------------------
+        begin                : **May-2025
+        copyright            : **COPYRIGHT
+        email                : **alopbal@upv.es
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 3 of the License, or     *
+ *   any later version.                                                    *
+ *                                                                         *
+ ***************************************************************************/
+
+The file is written in one pass: header row, daily rows (DD/MM/YYYY;flow;) and,
+when the last year is complete, the closing day 01/01/<end_year + 1>;0.00. Rows are
+formatted in chunks with NumPy, straight from a SQLite cursor or a FlowSeries. The
+output is byte-identical to the former pandas 'to_csv' files: flows are written
+with the shortest repr (as Python floats, or as integers when the flows of a CSV
+file are integers), ';' separated, os.linesep.
+
+Monthly files (MENSUAL;NATURAL;... / MENSUAL;ALTERADO;...) have one row per
+month (MM/YYYY;contribution in hm3;) from the first to the last complete month,
+without closing row. The monthly contributions come grouped from SQLite (see
+scenario_store) or from a FlowSeries summed with np.bincount; months with missing
+days in between are written without value, as missing daily flows, and incomplete
+months at the ends of the period are left out.
+"""
+
+import csv
+import os
+
+import numpy as np
+
+from flow_series import format_dates, ymd_to_dates
+
+
+# Rows formatted at once
+CHUNK_ROWS = 65536
+
+# Rows of 'channel_sd_day' read into NumPy (dates stay numeric)
+SWATPLUS_ROW = np.dtype(
+    [("yr", np.int32), ("mon", np.int32), ("day", np.int32), ("flo_out", np.float64)]
+)
+
+# hm3 of one day at 1 m3/s
+HM3_PER_DAY = 86400 / 1e6
+
+# Monthly contributions (hm3) and number of days of data of every month
+MONTHLY_ROW = np.dtype(
+    [("yr", np.int32), ("mon", np.int32), ("hm3", np.float64), ("days", np.int32)]
+)
+
+# Decimals of the monthly contributions (the same text from SQLite and from NumPy)
+MONTHLY_DECIMALS = 6
+
+
+def format_values(values):
+    """Flows as text (shortest repr, empty for missing values)"""
+    values = np.asarray(values)
+    text = values.astype(str)
+    if values.dtype.kind == "f":
+        text[np.isnan(values)] = ""
+    return text
+
+
+def series_chunks(series, chunk_rows=CHUNK_ROWS):
+    """(DD/MM/YYYY dates, flows) chunks of a FlowSeries"""
+    for i in range(0, len(series), chunk_rows):
+        values = series.values[i : i + chunk_rows]
+        days = np.arange(series.start + i, series.start + i + len(values))
+        yield format_dates(days.astype("datetime64[D]")), values
+
+
+def cursor_chunks(cursor, chunk_rows=CHUNK_ROWS):
+    """(DD/MM/YYYY dates, flows) chunks of a cursor over (yr, mon, day, flo_out) rows"""
+    while True:
+        rows = cursor.fetchmany(chunk_rows)
+        if not rows:
+            return
+        data = np.array(rows, dtype=SWATPLUS_ROW)
+        dates = ymd_to_dates(data["yr"], data["mon"], data["day"])
+        yield format_dates(dates), data["flo_out"]
+
+
+def series_months(series):
+    """Monthly contributions (MONTHLY_ROW array) of a FlowSeries"""
+    if len(series) == 0:
+        return np.empty(0, dtype=MONTHLY_ROW)
+
+    months = series.dates().astype("datetime64[M]").astype(np.int64)
+    positions = months - months[0]
+    sums = np.bincount(positions, weights=series.values)
+    counts = np.bincount(positions)
+
+    rows = np.empty(len(sums), dtype=MONTHLY_ROW)
+    month_numbers = months[0] + np.arange(len(sums))
+    rows["yr"] = month_numbers // 12 + 1970
+    rows["mon"] = month_numbers % 12 + 1
+    rows["hm3"] = sums * HM3_PER_DAY
+    rows["days"] = counts
+    return rows
+
+
+def format_months(years, months):
+    """MM/YYYY strings of year and month arrays (dates of the monthly files)"""
+    # 'DD/MM/YYYY' of the first day of every month without 'DD/'
+    dates = format_dates(ymd_to_dates(years, months, 1))
+    chars = dates.astype("U10").view("U1").reshape(-1, 10)[:, 3:]
+    return np.ascontiguousarray(chars).view("U7").ravel()
+
+
+def cursor_months(cursor):
+    """MONTHLY_ROW array of a cursor over (yr, mon, hm3, days) rows"""
+    return np.fromiter(cursor, dtype=MONTHLY_ROW)
+
+
+def month_series(rows):
+    """(MM/YYYY months, hm3, left out) of MONTHLY_ROW rows ordered by date
+
+    Every month from the first to the last complete one is kept (NaN for the
+    months with missing days); 'left out' are the MM/YYYY of the incomplete months
+    before and after them.
+    """
+
+    first_days = ymd_to_dates(rows["yr"], rows["mon"], 1)
+    next_months = (first_days.astype("datetime64[M]") + 1).astype("datetime64[D]")
+    complete = rows["days"] == (next_months - first_days).astype(np.int64)
+    if not complete.any():
+        left_out = format_months(rows["yr"], rows["mon"])
+        return np.empty(0, dtype="U7"), np.empty(0), left_out
+
+    # Months since 1970 of the rows and of every month of the complete period
+    numbers = first_days.astype("datetime64[M]").astype(np.int64)
+    first, last = numbers[complete][[0, -1]]
+    months = np.arange(first, last + 1)
+    hm3 = np.full(len(months), np.nan)
+    hm3[numbers[complete] - first] = np.round(rows["hm3"][complete], MONTHLY_DECIMALS)
+    outside = (numbers < first) | (numbers > last)
+    return (
+        format_months(months // 12 + 1970, months % 12 + 1),
+        hm3,
+        format_months(rows["yr"][outside], rows["mon"][outside]),
+    )
+
+
+def write_chunks(chunks, output_csv_path, header, end_year):
+    """Write the header, the (dates, flows) chunks and the closing day of an IAHRIS file
+
+    Returns the number of daily (or monthly) rows written. Monthly files never end
+    on 31/12, so they get no closing day.
+    """
+
+    # Empty fields that complete every row up to the length of the header
+    trailing = ";" * (len(header) - 2)
+    last_date = None
+    rows = 0
+
+    # ';' as the delimiter (required by IAHRIS)
+    with open(output_csv_path, "w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.writer(csv_file, delimiter=";", lineterminator=os.linesep)
+        writer.writerow(header)
+
+        for dates, values in chunks:
+            if len(dates) == 0:
+                continue
+            lines = np.char.add(np.char.add(dates, ";"), format_values(values))
+            if trailing:
+                lines = np.char.add(lines, trailing)
+            csv_file.write(os.linesep.join(lines.tolist()))
+            csv_file.write(os.linesep)
+            last_date = dates[-1]
+            rows += len(dates)
+
+        if last_date == "31/12/{}".format(end_year):
+            # Add one more day to the complete year (to take into account the last year of data)
+            writer.writerow(
+                ["01/01/{}".format(end_year + 1), "0.00"] + [""] * (len(header) - 2)
+            )
+
+    return rows
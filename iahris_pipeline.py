@@ -0,0 +1,752 @@
+"""
+/***************************************************************************
+ **SWATPlus-IAHRIS
+ **A software that links SWATPlus to IAHRIS to automatically generate reports on Indicators of Hydrologic Alteration in RIverS.
+ **Report pipeline shared by the GUI and the headless batch mode (no Qt imports).
+----------------------------------------------------
+        begin                : **May-2025
+        copyright            : **COPYRIGHT
+        email                : **alopbal@upv.es
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 3 of the License, or     *
+ *   any later version.                                                    *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import os
+import subprocess
+import glob
+import itertools
+import shutil
+import signal
+import uuid
+from datetime import datetime
+import numpy as np
+
+import channel_columns
+import csv_flow
+import instrumentation
+import metadata_cache
+from config import (
+    IAHRIS_ROOT,
+    IAHRIS_FOLDER,
+    WORK_FOLDER,
+    IAHRIS_COMMAND,
+)
+import iahris_input
+import report_cache
+import scenario_store
+import swatplus_text
+import workbook_xml
+
+
+# IAHRIS limit the scenario name to 12 characters
+IAHRIS_NAME_LENGTH = 12
+
+# Seconds between two checks of the cancel flag while IAHRIS is running
+CANCEL_POLL_SECONDS = 0.2
+
+# Progress (%) at the start of each stage of a report
+STAGES = {
+    "nat": (0, "Writing the natural flow input"),
+    "alt": (20, "Writing the altered flow input"),
+    "iahris": (40, "Running IAHRIS"),
+    "label": (90, "Labelling the master report"),
+    "cached": (90, "Copying the report generated from the same inputs"),
+    "done": (100, "Report generated"),
+}
+
+# Sheets of the master report extracted for each theme of the reports window
+THEMES = {
+    "nat": (
+        ["Informe nº1", "Informe nº 2", "Informe nº2a", "Informe nº4"],
+        "SWATPlus-IAHRIS_Natural_Flow_Characterization.xlsx",
+    ),
+    "alt": (
+        ["Informe nº1a", "Informe nº3", "Informe nº3a", "Informe nº5"],
+        "SWATPlus-IAHRIS_Altered_Flow_Characterization.xlsx",
+    ),
+    "nat_alt": (
+        [
+            "Informe nº 1b",
+            "Informe nº 3b",
+            "Informe nº3c",
+            "Informe nº 8",
+            "Informe nº8a",
+        ],
+        "SWATPlus-IAHRIS_Natural-Altered_Flow_Comparison.xlsx",
+    ),
+    "curves": (
+        [
+            "Informe nº 6",
+            "Informe nº 6a",
+            "Informe nº6b",
+            "Informe nº6c",
+            "Informe nº6d",
+            "Informe nº6e",
+        ],
+        "SWATPlus-IAHRIS_Flow_Rates_Duration_Curves.xlsx",
+    ),
+    "habitual": (
+        ["Informe nº 7a", "Informe nº 7c"],
+        "SWATPlus-IAHRIS_IHA_Habitual_Values.xlsx",
+    ),
+    "floods": (
+        ["Informe nº 7d"],
+        "SWATPlus-IAHRIS_IHA_Floods_Droughts.xlsx",
+    ),
+    "sign": (
+        ["Informe nº10a", "Informe nº 10c"],
+        "SWATPlus-IAHRIS_IHA_Environmental_Significance.xlsx",
+    ),
+}
+
+# English names of the sheets in the thematic reports
+RENAME_SHEETS = {
+    "REPORTS": "Reports",
+    "Informe nº1": "Report_n1",
+    "Informe nº1a": "Report_n1a",
+    "Informe nº 1b": "Report_n1b",
+    "Informe nº 2": "Report_n2",
+    "Informe nº2a": "Report_n2a",
+    "Informe nº3": "Report_n3",
+    "Informe nº3a": "Report_n3a",
+    "Informe nº 3b": "Report_n3b",
+    "Informe nº3c": "Report_n3c",
+    "Informe nº4": "Report_n4",
+    "Informe nº5": "Report_n5",
+    "Informe nº 6": "Report_n6",
+    "Informe nº 6a": "Report_n6a",
+    "Informe nº6b": "Report_n6b",
+    "Informe nº6c": "Report_n6c",
+    "Informe nº6d": "Report_n6d",
+    "Informe nº6e": "Report_n6e",
+    "Informe nº 7a": "Report_n7a",
+    "Informe nº 7c": "Report_n7c",
+    "Informe nº 7d": "Report_n7d",
+    "Informe nº 8": "Report_n8",
+    "Informe nº8b": "Report_n8b",
+    "Informe nº10a": "Report_n10a",
+    "Informe nº 10c": "Report_n10c",
+}
+
+
+class ReportError(Exception):
+    """Report generation error (title and message are shown in the GUI warning)"""
+
+    def __init__(self, title, message):
+        super().__init__(message)
+        self.title = title
+
+
+class ReportCancelled(Exception):
+    """Report generation stopped by the user"""
+
+
+def scenario_sqlite(folder, scenario):
+    """Path of the SQLite database of SWAT+ editor for a scenario"""
+    return os.path.join(folder, scenario, "Results", "swatplus_output.sqlite")
+
+
+def scenario_output(folder, scenario):
+    """SWAT+ outputs of a scenario: the SQLite database of SWAT+ editor or, when
+    SWAT+ only printed the text outputs, its TxtInOut/channel_sd_day.txt
+
+    The functions below that take a 'sqlite' path accept both.
+    """
+    sqlite = scenario_sqlite(folder, scenario)
+    text = swatplus_text.scenario_text(folder, scenario)
+    if not os.path.exists(sqlite) and os.path.exists(text):
+        return text
+    return sqlite
+
+
+def channel_summary(sqlite, columns=True):
+    """(unit, min year, max year, rows) of every channel in one 'channel_sd_day' query
+
+    With columns=False a columnar copy (see channel_columns) is not read.
+    """
+
+    # Instant for databases unchanged since the last time they were read
+    summary = metadata_cache.get(sqlite)
+    if summary is not None:
+        return summary
+
+    if columns and channel_columns.has_fresh_columns(sqlite):
+        with instrumentation.stage("channel_summary", source="columns") as record:
+            summary = channel_columns.channel_summary(sqlite)
+            record["rows"] = sum(row[3] for row in summary)
+        metadata_cache.put(sqlite, summary)
+        return summary
+
+    if swatplus_text.is_text_output(sqlite):
+        with instrumentation.stage("channel_summary", source="text") as record:
+            summary = swatplus_text.channel_summary(sqlite)
+            record["rows"] = sum(row[3] for row in summary)
+        metadata_cache.put(sqlite, summary)
+        return summary
+
+    with instrumentation.stage("channel_summary") as record:
+        # Read-only query of the SQLite database of SWAT+ editor (or its sidecar index)
+        summary = scenario_store.channel_summary(sqlite)
+        record["rows"] = sum(row[3] for row in summary)
+
+    metadata_cache.put(sqlite, summary)
+
+    return summary
+
+
+def scenario_metadata(sqlite):
+    """Channels (as strings) and min/max years of the 'channel_sd_day' table"""
+
+    summary = channel_summary(sqlite)
+
+    # Unique values 'unit' column in 'channel_sd_day' table
+    channels = [str(row[0]) for row in summary]  # Convert to string
+
+    # Minimum and maximum values 'yr' column in 'channel_sd_day' table
+    min_year = min((row[1] for row in summary), default=None)
+    max_year = max((row[2] for row in summary), default=None)
+
+    return channels, min_year, max_year
+
+
+def extract_swatplus_flow(sqlite, unit, start_year, end_year, dtype="float64"):
+    """Daily 'flo_out' of a channel as a FlowSeries"""
+
+    if channel_columns.has_fresh_columns(sqlite):
+        with instrumentation.stage("read_channel", unit=str(unit), source="columns") as record:
+            series = channel_columns.extract_flow(sqlite, unit, start_year, end_year, dtype)
+            record["rows"] = len(series)
+        return series
+
+    if swatplus_text.is_text_output(sqlite):
+        with instrumentation.stage("read_channel", unit=str(unit), source="text") as record:
+            # The summary (cached) tells where the rows of the channel are
+            series = swatplus_text.extract_flow(
+                sqlite, unit, start_year, end_year, dtype, channel_summary(sqlite)
+            )
+            record["rows"] = len(series)
+        return series
+
+    # Read-only query of the SQLite database of SWAT+ editor (or its sidecar index)
+    with instrumentation.stage("read_channel", unit=str(unit)) as record:
+        series = scenario_store.fetch_series(sqlite, unit, start_year, end_year, dtype)
+        record["rows"] = len(series)
+
+    return series
+
+
+def write_swatplus_input(
+    sqlite, unit, start_year, end_year, output_csv_path, header, monthly=False
+):
+    """Stream the 'flo_out' of a channel from SQLite to an IAHRIS input file
+
+    With 'monthly' the monthly contributions are summed by SQLite (GROUP BY yr,
+    mon), so only one row per month leaves the database. Returns the number of
+    daily rows written, or what write_monthly_input returns with 'monthly'.
+    """
+
+    # Columnar copy or text output: the series is read at once
+    if channel_columns.has_fresh_columns(sqlite) or swatplus_text.is_text_output(sqlite):
+        series = extract_swatplus_flow(sqlite, unit, start_year, end_year)
+        return write_iahris_input(series, output_csv_path, header, end_year, monthly)
+
+    # Read-only query of the SQLite database of SWAT+ editor (or its sidecar index)
+    if monthly:
+        cursor = scenario_store.monthly_rows(sqlite, unit, start_year, end_year)
+        return write_monthly_input(
+            iahris_input.cursor_months(cursor), output_csv_path, header
+        )
+    with instrumentation.stage("write_input", unit=str(unit)) as record:
+        cursor = scenario_store.channel_rows(sqlite, unit, start_year, end_year)
+        record["rows"] = iahris_input.write_chunks(
+            iahris_input.cursor_chunks(cursor), output_csv_path, header, end_year
+        )
+    return record["rows"]
+
+
+def extract_all_swatplus_flows(
+    sqlite, start_year, end_year, units=None, dtype="float64", columns=True
+):
+    """Yield (unit, FlowSeries) for every channel reading 'channel_sd_day' only once
+
+    Rows are streamed from the cursor ordered by unit and date (SQLite sorts on disk
+    if needed), so only the rows of one channel are held in memory at a time.
+    'units' optionally restricts the channels (as strings) that are yielded.
+    Text outputs are read in one pass too (see swatplus_text.extract_all_flows),
+    and a fresh columnar copy (see channel_columns) is used instead of both,
+    unless columns=False.
+    """
+
+    if columns and channel_columns.has_fresh_columns(sqlite):
+        yield from channel_columns.extract_all_flows(
+            sqlite, start_year, end_year, units, dtype
+        )
+        return
+
+    if swatplus_text.is_text_output(sqlite):
+        yield from swatplus_text.extract_all_flows(
+            sqlite, start_year, end_year, units, dtype
+        )
+        return
+
+    # Read-only query of the SQLite database of SWAT+ editor (or its sidecar index)
+    cursor = scenario_store.all_channel_rows(sqlite, start_year, end_year)
+    units = set(units) if units is not None else None
+
+    # Group the ordered rows by channel
+    for unit, rows in itertools.groupby(cursor, key=lambda row: row[0]):
+        unit = str(unit)  # Channels are handled as strings (as in the GUI)
+        if units is not None and unit not in units:
+            continue
+        yield unit, scenario_store.series_from_rows((row[1:] for row in rows), dtype)
+
+
+def extract_all_swatplus_months(sqlite, start_year, end_year, units=None):
+    """Yield (unit, monthly rows) for every channel reading 'channel_sd_day' only once
+
+    The rows are MONTHLY_ROW arrays (see iahris_input). SQLite groups the days by
+    channel and month; text outputs and columnar copies are summed with NumPy.
+    """
+
+    if channel_columns.has_fresh_columns(sqlite) or swatplus_text.is_text_output(sqlite):
+        for unit, series in extract_all_swatplus_flows(sqlite, start_year, end_year, units):
+            yield unit, iahris_input.series_months(series)
+        return
+
+    # Read-only query of the SQLite database of SWAT+ editor (or its sidecar index)
+    cursor = scenario_store.all_monthly_rows(sqlite, start_year, end_year)
+    units = set(units) if units is not None else None
+
+    # Group the ordered rows by channel
+    for unit, rows in itertools.groupby(cursor, key=lambda row: row[0]):
+        unit = str(unit)  # Channels are handled as strings (as in the GUI)
+        if units is not None and unit not in units:
+            continue
+        yield unit, np.fromiter(
+            (row[1:] for row in rows), dtype=iahris_input.MONTHLY_ROW
+        )
+
+
+def read_csv_flow(input_csv, start_year=None, end_year=None):
+    """Daily 'Flow' of a validated CSV file as a FlowSeries (optionally between two years)"""
+
+    # Parsed only the first time (then reused from memory or its binary sidecar)
+    series = csv_flow.load_flow_csv(input_csv)
+
+    # Filter the series by selected start and finish year
+    if start_year is not None and end_year is not None:
+        series = series.slice_years(start_year, end_year)
+
+    return series
+
+
+def csv_scenario_name(input_csv):
+    """Get the scenario name from the CSV file"""
+    return os.path.splitext(os.path.basename(input_csv))[0]
+
+
+def write_csv_input(
+    input_csv, start_year, end_year, output_csv_path, header, monthly=False
+):
+    """Write the 'Flow' of a CSV file (between two years) to an IAHRIS input file"""
+    return write_iahris_input(
+        read_csv_flow(input_csv, start_year, end_year),
+        output_csv_path,
+        header,
+        end_year,
+        monthly,
+    )
+
+
+def write_iahris_input(series, output_csv_path, header, end_year, monthly=False):
+    """Write a FlowSeries as an IAHRIS input file (header row, data and closing day)
+
+    With 'monthly' the monthly contributions of the series are written instead.
+    Returns the number of daily rows written, or what write_monthly_input returns
+    with 'monthly'.
+    """
+    if monthly:
+        return write_monthly_input(
+            iahris_input.series_months(series), output_csv_path, header
+        )
+    with instrumentation.stage("write_input") as record:
+        record["rows"] = iahris_input.write_chunks(
+            iahris_input.series_chunks(series), output_csv_path, header, end_year
+        )
+    return record["rows"]
+
+
+def write_monthly_input(months, output_csv_path, header):
+    """Write monthly rows (see extract_all_swatplus_months) as an IAHRIS input file
+
+    The months with missing days between the first and the last complete month are
+    written without value (as missing daily flows) and the incomplete months at the
+    ends of the period are left out. Returns the number of monthly rows written and
+    the labels (MM/YYYY) of both kinds of months, (missing, left out), for the
+    caller to report.
+    """
+
+    with instrumentation.stage("write_input", monthly=True) as record:
+        labels, hm3, left_out = iahris_input.month_series(months)
+        missing = labels[np.isnan(hm3)].tolist()
+        record["rows"] = iahris_input.write_chunks(
+            [(labels, hm3)], output_csv_path, header, None
+        )
+        record["missing_months"] = len(missing)
+        record["left_out_months"] = len(left_out)
+    return record["rows"], (missing, left_out.tolist())
+
+
+def write_source_input(
+    source, start_year, end_year, output_csv_path, header, monthly=False
+):
+    """Write a nat/alt source to an IAHRIS input file
+
+    'source' is a dict with the 'scenario' name and either the 'csv' file or the
+    'sqlite' database and channel 'unit' of a SWAT+ scenario.
+    """
+    if "csv" in source:
+        write_csv_input(
+            source["csv"], start_year, end_year, output_csv_path, header, monthly
+        )
+    else:
+        write_swatplus_input(
+            source["sqlite"],
+            source["unit"],
+            start_year,
+            end_year,
+            output_csv_path,
+            header,
+            monthly,
+        )
+
+
+def series_type(monthly):
+    """First field of the header of the IAHRIS input files (daily or monthly data)"""
+    return "MENSUAL" if monthly else "DIARIO"
+
+
+def nat_header(scenario_nat, monthly=False):
+    """Header row of the natural IAHRIS input file"""
+    return [series_type(monthly), "NATURAL", scenario_nat[:IAHRIS_NAME_LENGTH]]
+
+
+def alt_header(scenario_nat, scenario_alt, monthly=False):
+    """Header row of the altered IAHRIS input file"""
+    return [
+        series_type(monthly),
+        "ALTERADO",
+        scenario_nat[:IAHRIS_NAME_LENGTH],
+        scenario_alt[:IAHRIS_NAME_LENGTH],
+    ]
+
+
+def write_report_bat(
+    temp_folder,
+    project_name,
+    scenario_nat,
+    scenario_alt,
+    output_csv_path_nat,
+    output_csv_path_alt,
+    report_folder,
+):
+    """Generate the .bat file of IAHRIS and return its path"""
+    return write_alternatives_bat(
+        temp_folder,
+        project_name,
+        scenario_nat,
+        output_csv_path_nat,
+        [(scenario_alt, output_csv_path_alt, report_folder)],
+    )
+
+
+def write_alternatives_bat(
+    temp_folder, project_name, scenario_nat, output_csv_path_nat, alternatives
+):
+    """Generate the .bat file of IAHRIS for several alternatives and return its path
+
+    'alternatives' is a list of (scenario_alt, output_csv_path_alt, report_folder).
+    The natural point is loaded once, every altered series is added to the same
+    project and one report is generated per alternative in its report folder.
+    Out of Windows the commands are written to a shell script instead.
+    """
+
+    # IAHRIS.exe, or the command that stands in for it (quoted if needed)
+    iahris = f'"{IAHRIS_COMMAND}"' if " " in IAHRIS_COMMAND else IAHRIS_COMMAND
+
+    scenario_nat_short = scenario_nat[:IAHRIS_NAME_LENGTH]
+    load_lines = [
+        f'{iahris} CD /t:P /np:"{scenario_nat_short}" /d:"Punto Carga Masiva" /p:"{project_name}" /dp:"SWATPlus-IAHRIS" /rn:"Natural" /ra:"nat" /fe:"{output_csv_path_nat}" /mi:01'
+    ]
+    report_lines = []
+    for scenario_alt, output_csv_path_alt, report_folder in alternatives:
+        scenario_alt_short = scenario_alt[:IAHRIS_NAME_LENGTH]
+        load_lines.append(
+            f'{iahris} CD /t:A /np:"{scenario_nat_short}" /na:"{scenario_alt_short}" /d:"Alt Carga Masiva" /p:"{project_name}" /dp:"SWATPlus-IAHRIS" /rn:"Alterado" /ra:"alt" /fe:"{output_csv_path_alt}"'
+        )
+        report_lines.append(
+            f'{iahris} GIS /t:A /np:"{scenario_nat_short}" /na:"{scenario_alt_short}" /p:"{project_name}" /fs:"{report_folder}" -cvh -cas'
+        )
+
+    load_lines = "\n".join(load_lines)
+    report_lines = "\n".join(report_lines)
+    if os.name == "nt":
+        bat_content = f"""cd {IAHRIS_FOLDER}
+chcp 65001
+:: Lineas de Carga de Datos.
+{load_lines}
+
+:: Lineas para Generar informe de Salida.
+{report_lines}
+"""
+        bat_file_path = os.path.join(temp_folder, "generate_report.bat")
+    else:
+        # Shell script with the same commands (IAHRIS stand-ins on Linux)
+        bat_content = f"""#!/bin/sh
+cd "{IAHRIS_FOLDER}"
+# Lineas de Carga de Datos.
+{load_lines}
+
+# Lineas para Generar informe de Salida.
+{report_lines}
+"""
+        bat_file_path = os.path.join(temp_folder, "generate_report.sh")
+    with open(bat_file_path, "w", encoding="utf-8") as bat_file:
+        bat_file.write(bat_content)
+
+    return bat_file_path
+
+
+def run_bat(bat_file_path, cancel=None):
+    """Launch the .bat file of IAHRIS and wait until it finishes
+
+    'cancel' (e.g. a threading.Event) is checked while IAHRIS runs: once set, the
+    .bat and its IAHRIS.exe child are stopped and ReportCancelled is raised.
+    """
+    with instrumentation.stage("iahris"):
+        if os.name == "nt":
+            process = subprocess.Popen(
+                [bat_file_path], shell=True, creationflags=subprocess.CREATE_NO_WINDOW
+            )
+        else:
+            # In its own process group, so that it can be stopped with its children
+            process = subprocess.Popen(
+                ["/bin/sh", bat_file_path], start_new_session=True
+            )
+        while True:
+            try:
+                process.wait(timeout=CANCEL_POLL_SECONDS)
+                return
+            except subprocess.TimeoutExpired:
+                if cancel is not None and cancel.is_set():
+                    stop_process(process)
+                    raise ReportCancelled()
+
+
+def stop_process(process):
+    """Stop a process and its children (IAHRIS.exe is a child of the .bat shell)"""
+    if os.name == "nt":
+        subprocess.run(
+            ["taskkill", "/F", "/T", "/PID", str(process.pid)],
+            capture_output=True,
+            creationflags=subprocess.CREATE_NO_WINDOW,
+        )
+    else:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    process.wait()
+
+
+def new_job_id():
+    """Unique id of a job (start time to the second and a random suffix)
+
+    Also used as IAHRIS project name, so that jobs started at the same time do not
+    share a project.
+    """
+    return f"{datetime.now():%Y-%m-%d_%H-%M-%S}_{uuid.uuid4().hex[:6]}"
+
+
+def work_folder_path(job_id):
+    """Path of the working folder of a job (not created)"""
+    return os.path.join(WORK_FOLDER, f"job_{job_id}")
+
+
+def work_folder(job_id):
+    """Create and return the working folder of a job (inputs, script and report)
+
+    The folders are created under WORK_FOLDER (SWATPLUS_IAHRIS_WORK), one per job,
+    so that jobs running at the same time never share or delete each other's files.
+    """
+    folder = work_folder_path(job_id)
+    os.makedirs(folder)
+    return folder
+
+
+def last_generated_report(report_folder):
+    """Get the last generated .xlsx file in the report_folder (None if there is none)"""
+    xlsx_files = glob.glob(os.path.join(report_folder, "*.xlsx"))
+    if not xlsx_files:
+        return None
+    return max(xlsx_files, key=os.path.getctime)
+
+
+# Cells of the first sheet of the master report ("" clears a cell)
+MASTER_LABELS = {
+    "AA1": "Nat_F",
+    "AA2": "Alt_F",
+    "AB1": "Natural Flow",
+    "AB2": "Altered Flow",
+    "E3": "",
+    "E4": "",
+}
+
+
+def label_master_report(last_generated_xlsx):
+    """Set the English labels of the flows in the first sheet of the master report
+
+    The cells are written directly in the .xlsx (see workbook_xml.set_cells).
+    """
+    with instrumentation.stage("label_master"):
+        workbook_xml.set_cells(last_generated_xlsx, MASTER_LABELS)
+
+
+def export_themes(last_generated_xlsx, report_folder, themes, done=None):
+    """Write the thematic reports (keys of THEMES) reading the master report once
+
+    The sheets are copied and renamed (RENAME_SHEETS) without Excel; done(theme,
+    path) is called after each report is written. Returns the paths.
+    """
+
+    exports = []
+    for theme in themes:
+        selected_sheet_names, file_name = THEMES[theme]
+        exports.append((selected_sheet_names, os.path.join(report_folder, file_name)))
+
+    def written(i, output_excel_path):
+        if done is not None:
+            done(themes[i], output_excel_path)
+
+    with instrumentation.stage("export_themes", themes=len(themes)):
+        workbook_xml.export_sheets(
+            last_generated_xlsx, exports, RENAME_SHEETS, written
+        )
+    return [output_excel_path for _, output_excel_path in exports]
+
+
+def export_theme(last_generated_xlsx, report_folder, theme):
+    """Write the thematic report of a theme (key of THEMES) and return its path"""
+    return export_themes(last_generated_xlsx, report_folder, [theme])[0]
+
+
+def generate_report(job, progress=None, cancel=None):
+    """Generate the master report of a GUI job and return its path
+
+    'job' holds the 'nat' and 'alt' sources (see write_source_input), their years
+    ('start_nat', 'end_nat', 'start_alt', 'end_alt'), 'report_folder',
+    'project_name' (a unique id, see new_job_id, that also names its working
+    folder) and optionally 'monthly' (experimental monthly IAHRIS inputs). IAHRIS
+    writes the report in the working folder and it is then moved to the report
+    folder, so that several jobs can run at the same time. A report of the same
+    inputs generated before is copied from report_cache instead.
+
+    progress(percent, stage) is called at the start of every stage and 'cancel' is
+    checked between stages and while IAHRIS runs (ReportCancelled is raised once it
+    is set).
+    """
+
+    def stage(name):
+        if cancel is not None and cancel.is_set():
+            raise ReportCancelled()
+        if progress is not None:
+            progress(*STAGES[name])
+
+    temp_folder = work_folder(job["project_name"])
+    job_report_folder = os.path.join(temp_folder, "report")
+    scenario_nat = job["nat"]["scenario"]
+    scenario_alt = job["alt"]["scenario"]
+    output_csv_path_nat = os.path.join(temp_folder, f"{scenario_nat}_nat.csv")
+    output_csv_path_alt = os.path.join(temp_folder, f"{scenario_alt}_alt.csv")
+    monthly = job.get("monthly", False)
+    os.makedirs(job_report_folder)
+
+    try:
+        # IAHRIS input data for the natural and altered scenarios
+        stage("nat")
+        write_source_input(
+            job["nat"],
+            job["start_nat"],
+            job["end_nat"],
+            output_csv_path_nat,
+            nat_header(scenario_nat, monthly),
+            monthly,
+        )
+        stage("alt")
+        write_source_input(
+            job["alt"],
+            job["start_alt"],
+            job["end_alt"],
+            output_csv_path_alt,
+            alt_header(scenario_nat, scenario_alt, monthly),
+            monthly,
+        )
+
+        # A report generated from the same inputs is copied instead of running IAHRIS
+        with instrumentation.stage("report_cache"):
+            key = report_cache.input_key([output_csv_path_nat, output_csv_path_alt])
+            report_path, _ = report_cache.restore(key, job["report_folder"])
+        if report_path is not None:
+            stage("cached")
+        else:
+            # Generate and launch the .bat file of IAHRIS
+            stage("iahris")
+            bat_file_path = write_report_bat(
+                temp_folder,
+                job["project_name"],
+                scenario_nat,
+                scenario_alt,
+                output_csv_path_nat,
+                output_csv_path_alt,
+                job_report_folder,
+            )
+            run_bat(bat_file_path, cancel)
+
+            # Get the .xlsx file generated by IAHRIS in the working folder
+            stage("label")
+            last_generated_xlsx = last_generated_report(job_report_folder)
+            if last_generated_xlsx is None:
+                raise ReportError(
+                    "IAHRIS Report Error",
+                    f"IAHRIS did not generate a report in {job_report_folder}",
+                )
+
+            # Change the labels of the flows in the first sheet and move it to the
+            # report folder
+            try:
+                label_master_report(last_generated_xlsx)
+                os.makedirs(job["report_folder"], exist_ok=True)
+                report_path = os.path.join(
+                    job["report_folder"], os.path.basename(last_generated_xlsx)
+                )
+                shutil.move(last_generated_xlsx, report_path)
+            except Exception:
+                raise ReportError(
+                    "Excel File Access Error",
+                    "Please ensure that all Excel files are closed before continuing. If the problem persists, check for any background Excel processes and try again.",
+                )
+            report_cache.put(key, report_path)
+    finally:
+        # Remove the working folder of the job
+        shutil.rmtree(temp_folder, ignore_errors=True)
+
+    stage("done")
+    return report_path
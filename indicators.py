@@ -0,0 +1,618 @@
+"""
+/***************************************************************************
+ **SWATPlus-IAHRIS
+ **A software that links SWATPlus to IAHRIS to automatically generate reports on Indicators of Hydrologic Alteration in RIverS.
+ **Vectorised IAHRIS indicators (habitual values, floods, droughts, IAH and IAG) without IAHRIS.exe.
+----------------------------------------------------
+        begin                : **May-2025
+        copyright            : **COPYRIGHT
+        email                : **alopbal@upv.es
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 3 of the License, or     *
+ *   any later version.                                                    *
+ *                                                                         *
+ ***************************************************************************/
+
+The daily flows (m3/s) of a regime are laid out as a (hydrologic years x 366)
+matrix, October to September as in the IAHRIS reports, so every parameter is a
+NumPy reduction along the days axis:
+
+- Habitual values (report nº 4, daily data) by type of year: annual and monthly
+  contributions (hm3), difference between the maximum and minimum monthly
+  contribution, Q10% - Q90% and months of maximum and minimum contribution. Wet
+  years are the years with a contribution >= the third quartile and dry years
+  <= the first quartile; the weighted year is 1/4 wet + 1/2 average + 1/4 dry.
+- Floods and droughts: mean and CV of the annual maximum/minimum daily flows and of
+  the annual Q5%/Q95% (exceedance), effective and connectivity discharges (annual
+  maxima of EFFECTIVE_RETURN_PERIOD and CONNECTIVITY_RETURN_PERIOD years),
+  days per month and maximum consecutive days with q >= Q5%nat / q <= Q95%nat, and
+  days per month with null flow.
+- Indicators of hydrologic alteration IAH1-IAH21 (0 = fully altered, 1 = natural):
+  the ratio altered/natural of each parameter (inverted when greater than 1), 1 -
+  months of shift / 6 for the seasonality of the maximum and minimum contributions
+  and the mean of the monthly indices for IAH2, IAH14, IAH20 and IAH21.
+- Indicators of global alteration IAGH (IAH1-IAH6 of each type of year), IAGA
+  (IAH7-IAH14) and IAGS (IAH15-IAH21): the area of the polygon of the indices in
+  a radar chart relative to the unaltered one, i.e. the mean of r(i) * r(i + 1).
+
+Percentiles use the Weibull plotting position, as the IAHRIS reports. The indices
+are an approximation of the IAHRIS formulas (the effective and connectivity
+discharges, for instance, come from fixed return periods); the reports of the
+pipeline are always computed by IAHRIS.exe, never by this module. Regression mode
+checks the indices of one unit against a master report that IAHRIS produced:
+    python main.py indicators --scenarios C:\\Model\\Scenarios --nat Default
+        --alt Reservoir --units 12 --compare C:\\Reports\\<master report>.xlsx
+The cells of the indices are taken from the CODE/VALUE columns of the report
+template of IAHRIS (FicheroModelo_Castellano.xlsx), and the report must have the
+same layout.
+"""
+
+import argparse
+import csv
+import os
+import re
+import sys
+
+import numpy as np
+
+from config import IAHRIS_FOLDER
+import workbook_xml
+
+
+# hm3 of one day at 1 m3/s
+HM3_PER_DAY = 86400 / 1e6
+
+# First month of the hydrologic year (October)
+FIRST_MONTH = 10
+
+# Types of year and their weights in the weighted year
+YEAR_TYPES = ("wet", "ave", "dry")
+YEAR_WEIGHTS = {"wet": 0.25, "ave": 0.5, "dry": 0.25}
+
+# Return periods (years) of the effective and connectivity discharges
+EFFECTIVE_RETURN_PERIOD = 1.5
+CONNECTIVITY_RETURN_PERIOD = 10
+
+# Exceedance percentiles of the flood (flushing) and drought thresholds
+FLOOD_EXCEEDANCE = 0.05
+DROUGHT_EXCEEDANCE = 0.95
+
+# Monthly indices below this value count as an altered month
+ALTERED_MONTH_INDEX = 0.5
+
+# Report template of IAHRIS and its sheets with the IAH and IAG (regression mode)
+REPORT_TEMPLATE = os.path.join(IAHRIS_FOLDER, "Report", "FicheroModelo_Castellano.xlsx")
+INDEX_SHEETS = ("Informe nº 7a", "Informe nº 7d")
+
+# Types of year in the labels of the IAGH rows ('IAGH WET YEAR' ...)
+REPORT_YEAR_TYPES = {"WET": "wet", "AVERAGE": "ave", "DRY": "dry", "WEIGHTED": "wei"}
+
+
+def hydrologic_years(series):
+    """Complete hydrologic years of a FlowSeries as (years, flows, months) matrices
+
+    years: first calendar year of every hydrologic year; flows: (years x 366)
+    flows with NaN after the last day of non-leap years; months: (years x 366)
+    month of each day, 0 = October ... 11 = September (-1 for the padding).
+    """
+
+    dates = series.dates()
+    calendar_years = dates.astype("datetime64[Y]").astype(np.int64) + 1970
+    calendar_months = dates.astype("datetime64[M]").astype(np.int64) % 12 + 1
+    hydro_years = np.where(
+        calendar_months >= FIRST_MONTH, calendar_years, calendar_years - 1
+    )
+
+    # First day of every hydrologic year in the series
+    first_years = np.unique(hydro_years)
+    starts = (
+        (first_years - 1970).astype("datetime64[Y]").astype("datetime64[M]")
+        + (FIRST_MONTH - 1)
+    ).astype("datetime64[D]")
+    ends = (
+        (first_years + 1 - 1970).astype("datetime64[Y]").astype("datetime64[M]")
+        + (FIRST_MONTH - 1)
+    ).astype("datetime64[D]")
+
+    # Only complete hydrologic years
+    complete = (starts.astype(np.int64) >= series.start) & (
+        ends.astype(np.int64) - 1 <= series.end
+    )
+    first_years, starts, ends = first_years[complete], starts[complete], ends[complete]
+
+    days = starts[:, None] + np.arange(366)
+    valid = days < ends[:, None]
+    positions = np.clip(days.astype(np.int64) - series.start, 0, len(series) - 1)
+    flows = np.where(valid, series.values[positions], np.nan)
+    months = np.where(
+        valid, (days.astype("datetime64[M]").astype(np.int64) % 12 + 1 - FIRST_MONTH) % 12, -1
+    )
+    return first_years, flows.astype(np.float64), months
+
+
+def monthly_sums(values, months):
+    """(years x 12) sums of a (years x 366) matrix by month of the hydrologic year"""
+    rows = np.broadcast_to(np.arange(values.shape[0])[:, None], values.shape)
+    valid = months >= 0
+    sums = np.bincount(
+        (rows * 12 + months)[valid],
+        weights=np.nan_to_num(values[valid].astype(np.float64)),
+        minlength=values.shape[0] * 12,
+    )
+    return sums.reshape(values.shape[0], 12)
+
+
+def longest_runs(condition):
+    """Maximum number of consecutive True values in every row"""
+    counts = np.cumsum(condition, axis=1)
+    resets = np.maximum.accumulate(np.where(condition, 0, counts), axis=1)
+    return (counts - resets).max(axis=1, initial=0)
+
+
+def exceedance(values, probability, axis=None):
+    """Flow exceeded with the given probability (Weibull plotting position)"""
+    return np.nanquantile(values, 1 - probability, axis=axis, method="weibull")
+
+
+def return_period_flow(maxima, years):
+    """Annual maximum of a return period (Weibull plotting position)"""
+    return np.quantile(maxima, 1 - 1 / years, method="weibull")
+
+
+def return_period(maxima, flow):
+    """Empirical return period (years) of a flow in a series of annual maxima"""
+    exceeded = np.count_nonzero(maxima >= flow)
+    return (len(maxima) + 1) / exceeded if exceeded else np.inf
+
+
+def cv(values):
+    """Coefficient of variation"""
+    mean = np.mean(values)
+    return np.std(values, ddof=1) / mean if mean else np.nan
+
+
+def classify_years(annual):
+    """Type of every year by its contribution: 'wet' (>= Q3), 'dry' (<= Q1) or 'ave'"""
+    first, third = np.quantile(annual, [0.25, 0.75], method="weibull")
+    return np.where(annual >= third, "wet", np.where(annual <= first, "dry", "ave"))
+
+
+def characterize(series, thresholds=None):
+    """Parameters of a flow regime (dict of NumPy values)
+
+    'thresholds' are the (Q5%, Q95%) flows of the natural regime used for the
+    duration and seasonality of floods and droughts (computed from this series
+    when None, i.e. for the natural regime itself).
+    """
+
+    years, flows, months = hydrologic_years(series)
+    if len(years) < 2:
+        raise ValueError("At least two complete hydrologic years are needed")
+    if thresholds is None:
+        thresholds = (
+            exceedance(flows, FLOOD_EXCEEDANCE),
+            exceedance(flows, DROUGHT_EXCEEDANCE),
+        )
+    valid = months >= 0
+
+    # Contributions (hm3)
+    monthly = monthly_sums(flows, months) * HM3_PER_DAY
+    annual = monthly.sum(axis=1)
+    year_types = classify_years(annual)
+
+    # Annual statistics of the daily flows
+    q10, q90, q5, q95 = exceedance(flows, np.array([0.10, 0.90, 0.05, 0.95]), axis=1)
+    maxima = np.nanmax(flows, axis=1)
+    minima = np.nanmin(flows, axis=1)
+
+    # Days with floods, droughts and null flow
+    flood = valid & (flows >= thresholds[0])
+    drought = valid & (flows <= thresholds[1])
+    null = valid & (flows == 0)
+
+    regime = {
+        "years": years,
+        "year_types": year_types,
+        "thresholds": thresholds,
+        "annual": annual,
+        "monthly": monthly,
+        "q10_q90": q10 - q90,
+        # Floods
+        "Qc": maxima.mean(),
+        "QGL": return_period_flow(maxima, EFFECTIVE_RETURN_PERIOD),
+        "QCONEC": return_period_flow(maxima, CONNECTIVITY_RETURN_PERIOD),
+        "Q5": q5.mean(),
+        "CV(Qc)": cv(maxima),
+        "CV(Q5)": cv(q5),
+        "flood_days": monthly_sums(flood, months).mean(axis=0),
+        "flood_duration": longest_runs(flood).mean(),
+        "maxima": maxima,
+        # Droughts
+        "Qs": minima.mean(),
+        "Q95": q95.mean(),
+        "CV(Qs)": cv(minima),
+        "CV(Q95)": cv(q95),
+        "drought_days": monthly_sums(drought, months).mean(axis=0),
+        "drought_duration": longest_runs(drought).mean(),
+        "null_days": monthly_sums(null, months).mean(axis=0),
+    }
+    regime["habitual"] = habitual_values(regime)
+    return regime
+
+
+def habitual_values(regime):
+    """Habitual values by type of year ('wet', 'ave', 'dry' and weighted 'wei')"""
+
+    values = {}
+    for year_type in YEAR_TYPES:
+        selected = regime["year_types"] == year_type
+        if not selected.any():
+            # Too few years: the type takes the values of all the years
+            selected = np.ones(len(regime["years"]), dtype=bool)
+        monthly = regime["monthly"][selected]
+        mean_monthly = monthly.mean(axis=0)
+        values[year_type] = {
+            "M1": regime["annual"][selected].mean(),
+            "M2": mean_monthly,
+            "V1": (monthly.max(axis=1) - monthly.min(axis=1)).mean(),
+            "V2": regime["q10_q90"][selected].mean(),
+            "E1": int(np.argmax(mean_monthly)),
+            "E2": int(np.argmin(mean_monthly)),
+        }
+
+    values["wei"] = {
+        name: sum(YEAR_WEIGHTS[t] * values[t][name] for t in YEAR_TYPES)
+        for name in ("M1", "M2", "V1", "V2")
+    }
+    return values
+
+
+def ratio_index(natural, altered):
+    """Altered/natural ratio (inverted when > 1); 1 when both are zero"""
+    natural = np.asarray(natural, dtype=np.float64)
+    altered = np.asarray(altered, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        low = np.minimum(np.abs(natural), np.abs(altered))
+        high = np.maximum(np.abs(natural), np.abs(altered))
+        index = np.where(high == 0, 1.0, low / high)
+    return index
+
+
+def seasonality_index(month_natural, month_altered):
+    """1 - shift (months, circular) between natural and altered / 6"""
+    shift = abs(month_natural - month_altered) % 12
+    return 1 - min(shift, 12 - shift) / 6
+
+
+def global_index(indices):
+    """Area of the radar polygon of the indices relative to the unaltered one"""
+    values = np.asarray([value for value in indices if not np.isnan(value)])
+    if len(values) == 0:
+        return np.nan
+    return float(np.mean(values * np.roll(values, -1)))
+
+
+def alteration_indices(natural, altered):
+    """IAH and IAG of an altered regime (see characterize)
+
+    Returns (indices, monthly): indices maps the codes of the IAHRIS reports
+    ('IAH1 wet' ... 'IAH6 wei', 'IAH7' ... 'IAH21', 'IAGH wet' ..., 'IAGA',
+    'IAGS', 'IAH14 months' ...) to floats and monthly maps 'IAH2 <type>',
+    'IAH14', 'IAH20' and 'IAH21' to their 12 monthly indices (October first).
+    """
+
+    indices, monthly = {}, {}
+
+    # Habitual values by type of year
+    for year_type in YEAR_TYPES + ("wei",):
+        nat = natural["habitual"][year_type]
+        alt = altered["habitual"][year_type]
+        monthly[f"IAH2 {year_type}"] = ratio_index(nat["M2"], alt["M2"])
+        indices[f"IAH1 {year_type}"] = float(ratio_index(nat["M1"], alt["M1"]))
+        indices[f"IAH2 {year_type}"] = float(monthly[f"IAH2 {year_type}"].mean())
+        indices[f"IAH3 {year_type}"] = float(ratio_index(nat["V1"], alt["V1"]))
+        indices[f"IAH4 {year_type}"] = float(ratio_index(nat["V2"], alt["V2"]))
+        if year_type == "wei":
+            for code in ("IAH5", "IAH6"):
+                indices[f"{code} wei"] = sum(
+                    YEAR_WEIGHTS[t] * indices[f"{code} {t}"] for t in YEAR_TYPES
+                )
+        else:
+            indices[f"IAH5 {year_type}"] = seasonality_index(nat["E1"], alt["E1"])
+            indices[f"IAH6 {year_type}"] = seasonality_index(nat["E2"], alt["E2"])
+
+    # Monthly indices of the duration and seasonality of floods and droughts
+    monthly["IAH14"] = ratio_index(natural["flood_days"], altered["flood_days"])
+    monthly["IAH20"] = ratio_index(natural["null_days"], altered["null_days"])
+    monthly["IAH21"] = ratio_index(natural["drought_days"], altered["drought_days"])
+
+    # Floods
+    indices["IAH7"] = ratio_index(natural["Qc"], altered["Qc"])
+    indices["IAH8"] = ratio_index(natural["QGL"], altered["QGL"])
+    indices["IAH9"] = ratio_index(
+        1 / return_period(natural["maxima"], natural["QCONEC"]),
+        1 / return_period(altered["maxima"], natural["QCONEC"]),
+    )
+    indices["IAH10"] = ratio_index(natural["Q5"], altered["Q5"])
+    indices["IAH11"] = ratio_index(natural["CV(Qc)"], altered["CV(Qc)"])
+    indices["IAH12"] = ratio_index(natural["CV(Q5)"], altered["CV(Q5)"])
+    indices["IAH13"] = ratio_index(
+        natural["flood_duration"], altered["flood_duration"]
+    )
+    indices["IAH14"] = monthly["IAH14"].mean()
+
+    # Droughts
+    indices["IAH15"] = ratio_index(natural["Qs"], altered["Qs"])
+    indices["IAH16"] = ratio_index(natural["Q95"], altered["Q95"])
+    indices["IAH17"] = ratio_index(natural["CV(Qs)"], altered["CV(Qs)"])
+    indices["IAH18"] = ratio_index(natural["CV(Q95)"], altered["CV(Q95)"])
+    indices["IAH19"] = ratio_index(
+        natural["drought_duration"], altered["drought_duration"]
+    )
+    indices["IAH20"] = monthly["IAH20"].mean()
+    indices["IAH21"] = monthly["IAH21"].mean()
+    indices = {code: float(value) for code, value in indices.items()}
+
+    # Months with alteration (the IAH is altered with 3 months or more)
+    for code in ("IAH14", "IAH20", "IAH21"):
+        indices[f"{code} months"] = int(
+            np.count_nonzero(monthly[code] <= ALTERED_MONTH_INDEX)
+        )
+
+    # Global alteration
+    for year_type in YEAR_TYPES + ("wei",):
+        indices[f"IAGH {year_type}"] = global_index(
+            [indices[f"IAH{i} {year_type}"] for i in range(1, 7)]
+        )
+    indices["IAGA"] = global_index([indices[f"IAH{i}"] for i in range(7, 15)])
+    indices["IAGS"] = global_index([indices[f"IAH{i}"] for i in range(15, 22)])
+
+    return indices, monthly
+
+
+def compute_indicators(series_nat, series_alt):
+    """IAH/IAG indices (and monthly indices) of a natural and an altered FlowSeries"""
+    natural = characterize(series_nat)
+    altered = characterize(series_alt, natural["thresholds"])
+    return alteration_indices(natural, altered)
+
+
+def write_table(rows, output_csv_path):
+    """Write the indices of several units (dicts with a 'unit' key) to a CSV file"""
+    fieldnames = list(rows[0]) if rows else ["unit"]
+    with open(output_csv_path, "w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=fieldnames, delimiter=";")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def report_code(label):
+    """Code of an index (as in alteration_indices) from a label of the CODE column
+
+    'IAH1  wet' -> 'IAH1 wet', 'IAGH WET YEAR' -> 'IAGH wet', 'IAGA' -> 'IAGA';
+    None for any other cell.
+    """
+
+    words = label.split() if isinstance(label, str) else []
+    if len(words) == 1 and re.fullmatch(r"IAH(?:[7-9]|1\d|2[01])|IAG[AS]", words[0]):
+        return words[0]
+    if (
+        len(words) == 2
+        and re.fullmatch(r"IAH[1-6]", words[0])
+        and words[1] in YEAR_TYPES + ("wei",)
+    ):
+        return " ".join(words)
+    if len(words) == 3 and words[0] == "IAGH" and words[2] == "YEAR":
+        if words[1] in REPORT_YEAR_TYPES:
+            return f"IAGH {REPORT_YEAR_TYPES[words[1]]}"
+    return None
+
+
+def split_ref(ref):
+    """('D', 17) from 'D17'"""
+    column, row = re.fullmatch(r"([A-Z]+)(\d+)", ref).groups()
+    return column, int(row)
+
+
+def report_layout(xlsx):
+    """Cells of the indices in a report of IAHRIS: {sheet: {code: value ref}}
+
+    Every 'CODE' header has a 'VALUE' header on its left in the same row; the codes
+    are the labels right below the CODE header and their values are in the VALUE
+    column of the same rows.
+    """
+
+    layout = {}
+    for sheet_name in INDEX_SHEETS:
+        cells = workbook_xml.read_cells(xlsx, sheet_name)
+        headers = {}
+        for ref, value in cells.items():
+            if isinstance(value, str) and value.strip() in ("CODE", "VALUE"):
+                column, row = split_ref(ref)
+                headers.setdefault(row, {})[value.strip()] = column
+        layout[sheet_name] = {}
+        for row, columns in sorted(headers.items()):
+            if "CODE" not in columns or "VALUE" not in columns:
+                continue
+            # Codes down to the first row without one
+            code_row = row + 1
+            while True:
+                code = report_code(cells.get(f"{columns['CODE']}{code_row}"))
+                if code is None:
+                    break
+                layout[sheet_name][code] = f"{columns['VALUE']}{code_row}"
+                code_row += 1
+    return layout
+
+
+def workbook_number(value):
+    """Number of a report cell (IAHRIS marks some values with '*', '**', '$' or '&')"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        text = value.strip().rstrip("*$&# ").replace(",", ".")
+        try:
+            return float(text)
+        except ValueError:
+            return None
+    return None
+
+
+def compare_with_workbook(indices, xlsx, tolerance=0.05, template=REPORT_TEMPLATE):
+    """Compare the indices with a master report of IAHRIS
+
+    Returns a list of (code, engine value, IAHRIS value, within tolerance); codes
+    without a numeric value in the report get None as IAHRIS value. Raises a
+    ValueError when the report does not have the layout of the template.
+    """
+
+    layout = report_layout(template)
+    if not any(layout.values()):
+        raise ValueError(f"No index codes found in the template {template}")
+    if report_layout(xlsx) != layout:
+        raise ValueError(
+            f"{xlsx} does not have the layout of the IAHRIS template {template}"
+        )
+
+    rows = []
+    for sheet_name, cells in layout.items():
+        values = workbook_xml.read_cells(xlsx, sheet_name, cells.values())
+        for code, ref in cells.items():
+            expected = workbook_number(values[ref])
+            value = indices.get(code, np.nan)
+            ok = expected is not None and bool(abs(value - expected) <= tolerance)
+            rows.append((code, value, expected, ok))
+    return rows
+
+
+def unit_series(args, channels_nat, channels_alt):
+    """Yield (unit, natural FlowSeries, altered FlowSeries) of the selected units
+
+    Each scenario is read in one scan of 'channel_sd_day' (or from its columnar
+    copy), ordered by channel, and both streams are matched as they are read, so
+    only the current channel of each scenario is held in memory (all the channels
+    for text outputs, see swatplus_text.extract_all_flows).
+    """
+
+    import batch
+    import iahris_pipeline as pipeline
+
+    def flows(source, start_year, end_year, units):
+        if batch.is_csv(source):
+            series = pipeline.read_csv_flow(source, start_year, end_year)
+            return ((unit, series) for unit in units)
+        sqlite = pipeline.scenario_output(args.scenarios, source)
+        return pipeline.extract_all_swatplus_flows(sqlite, start_year, end_year, units)
+
+    if channels_nat is None and channels_alt is None:
+        units = [None]
+    else:
+        units = sorted(
+            set(batch.select_units(args.units, channels_nat, channels_alt)), key=int
+        )
+
+    natural = flows(args.nat, args.start_nat, args.end_nat, units)
+    altered = flows(args.alt, args.start_alt, args.end_alt, units)
+    if units == [None]:
+        yield None, next(natural)[1], next(altered)[1]
+        return
+
+    # Both streams are in channel order: a channel missing in one is skipped
+    next_altered = next(altered, None)
+    for unit, series_nat in natural:
+        while next_altered is not None and int(next_altered[0]) < int(unit):
+            next_altered = next(altered, None)
+        if next_altered is None:
+            return
+        if next_altered[0] == unit:
+            yield unit, series_nat, next_altered[1]
+
+
+def main(argv=None):
+    """Entry point of 'python main.py indicators ...'"""
+
+    import batch
+
+    parser = argparse.ArgumentParser(
+        prog="main.py indicators",
+        description="Approximate the IAHRIS alteration indices (IAH, IAG) without "
+        "IAHRIS.",
+    )
+    parser.add_argument("--scenarios", help="SWAT+ 'Scenarios' folder")
+    parser.add_argument("--nat", required=True, help="Natural scenario or CSV file")
+    parser.add_argument("--alt", required=True, help="Altered scenario or CSV file")
+    parser.add_argument("--units", default="all", help="'all' or a list (e.g. 1,5,12)")
+    parser.add_argument("--start-nat", type=int)
+    parser.add_argument("--end-nat", type=int)
+    parser.add_argument("--start-alt", type=int)
+    parser.add_argument("--end-alt", type=int)
+    parser.add_argument("--output", help="CSV table of the indices (one row per unit)")
+    parser.add_argument(
+        "--compare",
+        help="Master report of IAHRIS to check the indices against (one unit)",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.05,
+        help="Maximum absolute difference accepted by --compare",
+    )
+    parser.add_argument(
+        "--template",
+        default=REPORT_TEMPLATE,
+        help="Report template of IAHRIS with the layout of the indices (--compare)",
+    )
+    args = parser.parse_args(sys.argv[2:] if argv is None else argv)
+
+    channels_nat, min_nat, max_nat = batch.source_metadata(args, args.nat)
+    channels_alt, min_alt, max_alt = batch.source_metadata(args, args.alt)
+    args.start_nat = args.start_nat or min_nat
+    args.end_nat = args.end_nat or max_nat
+    args.start_alt = args.start_alt or min_alt
+    args.end_alt = args.end_alt or max_alt
+
+    rows = []
+    for unit, series_nat, series_alt in unit_series(args, channels_nat, channels_alt):
+        try:
+            indices, _ = compute_indicators(series_nat, series_alt)
+        except ValueError as error:
+            print(f"[FAILED] unit {unit}: {error}")
+            continue
+        rows.append({"unit": unit, **indices})
+
+    if args.compare:
+        if len(rows) != 1:
+            raise SystemExit("--compare needs exactly one unit (e.g. --units 12)")
+        try:
+            comparison = compare_with_workbook(
+                rows[0], args.compare, args.tolerance, args.template
+            )
+        except KeyError as error:
+            raise SystemExit(f"Cannot compare with {args.compare}: no sheet {error}")
+        except (OSError, ValueError) as error:
+            raise SystemExit(f"Cannot compare with {args.compare}: {error}")
+        mismatches = 0
+        for code, value, expected, ok in comparison:
+            mismatches += not ok
+            expected = "-" if expected is None else f"{expected:.3f}"
+            print(f"{'OK  ' if ok else 'DIFF'} {code:<10} {value:8.3f} {expected:>8}")
+        print(
+            f"{len(comparison) - mismatches}/{len(comparison)} indices within "
+            f"{args.tolerance}"
+        )
+        return 1 if mismatches else 0
+
+    if args.output:
+        write_table(rows, args.output)
+        print(f"{len(rows)} unit(s) written to {args.output}")
+    else:
+        for row in rows:
+            print(f"unit {row['unit']}: " + ", ".join(
+                f"{code}={row[code]:.2f}" for code in row if code.startswith("IAG")
+            ))
+    return 0
@@ -0,0 +1,329 @@
+"""
+/***************************************************************************
+ **SWATPlus-IAHRIS
+ **A software that links SWATPlus to IAHRIS to automatically generate reports on Indicators of Hydrologic Alteration in RIverS.
+ **Per-stage timing instrumentation written to a JSON lines trace.
+----------------------------------------------------
+        begin                : **May-2025
+        copyright            : **COPYRIGHT
+        email                : **alopbal@upv.es
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 3 of the License, or     *
+ *   any later version.                                                    *
+ *                                                                         *
+ ***************************************************************************/
+
+Profiling is switched on with 'python main.py --profile[=trace.jsonl] ...' (GUI or
+any headless mode) or with SWATPLUS_IAHRIS_PROFILE=<trace file>. Every stage
+(SQLite scans, IAHRIS input files, IAHRIS runs, labels, thematic exports, ...)
+then appends one JSON line to the trace:
+
+    {"stage": "write_input", "parent": "prepare_job", "run": "...", "pid": 1234,
+     "start": 1717000000.0, "wall_s": 0.41, "cpu_s": 0.39, "rows": 10958,
+     "peak_rss_mb": 88.2, "unit": "3"}
+
+'cpu_s' is the CPU time of the thread that ran the stage (IAHRIS itself, an
+external process, is only counted as wall time) and 'peak_rss_mb' the peak
+memory of the process at the end of the stage. The run id is inherited by the
+worker processes, so the summary table printed at exit covers the whole run;
+'python main.py trace <file>' prints the table of an existing trace. When
+profiling is off, stage() only checks a global and returns a shared object.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+
+from config import PROFILE_FILE
+
+
+# Trace file ("" when profiling is off) and id of the profiled run
+TRACE_FILE = PROFILE_FILE
+RUN_ID = os.environ.get("SWATPLUS_IAHRIS_PROFILE_RUN", "")
+
+# Trace written by 'python main.py --profile' without a file name
+DEFAULT_TRACE_FILE = "swatplus_iahris_trace.jsonl"
+
+# Names of the stages running in every thread (to record the parent stage)
+_local = threading.local()
+
+
+def enabled():
+    """True if the stages are being recorded"""
+    return bool(TRACE_FILE)
+
+
+def enable(trace_file, summary=True):
+    """Record the stages of this process and of its workers to 'trace_file'
+
+    A new run id is set in the environment (with the trace file), so that worker
+    processes started later write to the same run. The summary table of the run
+    is printed at exit if 'summary' is True.
+    """
+    global TRACE_FILE, RUN_ID
+
+    TRACE_FILE = os.path.abspath(trace_file)
+    RUN_ID = uuid.uuid4().hex[:12]
+    os.environ["SWATPLUS_IAHRIS_PROFILE"] = TRACE_FILE
+    os.environ["SWATPLUS_IAHRIS_PROFILE_RUN"] = RUN_ID
+    if summary:
+        import atexit
+
+        atexit.register(print_summary, TRACE_FILE, RUN_ID)
+
+
+def from_argv(argv):
+    """Remove '--profile[=file]' from the command line arguments (and enable
+    profiling if it was there)"""
+
+    remaining, trace_file = [], None
+    for arg in argv:
+        if arg == "--profile":
+            trace_file = DEFAULT_TRACE_FILE
+        elif arg.startswith("--profile="):
+            trace_file = arg.split("=", 1)[1] or DEFAULT_TRACE_FILE
+        else:
+            remaining.append(arg)
+
+    if trace_file is not None:
+        enable(trace_file)
+    elif TRACE_FILE and not RUN_ID:
+        # Profiling from the environment only: this process starts the run
+        enable(TRACE_FILE)
+    return remaining
+
+
+def peak_rss_mb():
+    """Peak resident memory of the process (MB), None if it is not available"""
+    try:
+        if os.name == "nt":
+            return _windows_peak_rss() / (1024 * 1024)
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Bytes on macOS, kilobytes elsewhere
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except Exception:
+        return None
+
+
+def _windows_peak_rss():
+    """PeakWorkingSetSize of the process (bytes) from GetProcessMemoryInfo"""
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    counters = PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(counters)
+    process = ctypes.windll.kernel32.GetCurrentProcess()
+    if not ctypes.windll.psapi.GetProcessMemoryInfo(
+        process, ctypes.byref(counters), counters.cb
+    ):
+        raise OSError("GetProcessMemoryInfo failed")
+    return counters.PeakWorkingSetSize
+
+
+def write_record(record):
+    """Append a record to the trace (one write, so that processes do not interleave)"""
+    line = (json.dumps(record, default=str) + "\n").encode("utf-8")
+    try:
+        fd = os.open(TRACE_FILE, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    except OSError:
+        return
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+class _Stage:
+    """Context manager of a recorded stage; 'as' gives the record, so that the
+    stage can set its 'rows' (or other fields)"""
+
+    def __init__(self, name, fields):
+        self.record = {"stage": name, "rows": None, **fields}
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        self.record["parent"] = stack[-1] if stack else None
+        stack.append(self.record["stage"])
+        self.start = time.time()
+        self.wall = time.perf_counter()
+        self.cpu = time.thread_time()
+        return self.record
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self.wall
+        cpu = time.thread_time() - self.cpu
+        _local.stack.pop()
+
+        # Stage and parent first, then the measures and the fields of the stage
+        record = {
+            "stage": self.record["stage"],
+            "parent": self.record["parent"],
+            "run": RUN_ID,
+            "pid": os.getpid(),
+            "start": round(self.start, 6),
+            "wall_s": round(wall, 6),
+            "cpu_s": round(cpu, 6),
+            "rows": self.record["rows"],
+            "peak_rss_mb": peak_rss_mb(),
+        }
+        if record["peak_rss_mb"] is not None:
+            record["peak_rss_mb"] = round(record["peak_rss_mb"], 1)
+        if exc_type is not None:
+            record["error"] = exc_type.__name__
+        for key, value in self.record.items():
+            record.setdefault(key, value)
+        write_record(record)
+        return False
+
+
+class _NoStage:
+    """Stage used when profiling is off (the record it gives is discarded)"""
+
+    def __enter__(self):
+        return {}
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NO_STAGE = _NoStage()
+
+
+def stage(name, **fields):
+    """Context manager that records a stage of the pipeline (if profiling is on)
+
+        with instrumentation.stage("write_input", unit=unit) as record:
+            record["rows"] = write(...)
+
+    'fields' are added to the record (e.g. the channel unit or the scenario).
+    """
+    if not TRACE_FILE:
+        return _NO_STAGE
+    return _Stage(name, fields)
+
+
+def read_trace(trace_file, run=None):
+    """Records of a trace (of one run if 'run' is given); bad lines are skipped"""
+    records = []
+    with open(trace_file, encoding="utf-8") as trace:
+        for line in trace:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if run is None or record.get("run") == run:
+                records.append(record)
+    return records
+
+
+def summary(records):
+    """Per-stage rows (stage, calls, total wall, max wall, total CPU, rows, peak
+    RSS, errors) in order of total wall time"""
+
+    stages = {}
+    for record in records:
+        entry = stages.setdefault(
+            record["stage"],
+            {"calls": 0, "wall": 0.0, "max_wall": 0.0, "cpu": 0.0, "rows": None,
+             "rss": None, "errors": 0},
+        )
+        entry["calls"] += 1
+        entry["wall"] += record.get("wall_s") or 0.0
+        entry["max_wall"] = max(entry["max_wall"], record.get("wall_s") or 0.0)
+        entry["cpu"] += record.get("cpu_s") or 0.0
+        if record.get("rows") is not None:
+            entry["rows"] = (entry["rows"] or 0) + record["rows"]
+        if record.get("peak_rss_mb") is not None:
+            entry["rss"] = max(entry["rss"] or 0.0, record["peak_rss_mb"])
+        if "error" in record:
+            entry["errors"] += 1
+
+    return sorted(
+        (
+            (name, e["calls"], e["wall"], e["max_wall"], e["cpu"], e["rows"],
+             e["rss"], e["errors"])
+            for name, e in stages.items()
+        ),
+        key=lambda row: row[2],
+        reverse=True,
+    )
+
+
+def format_summary(rows):
+    """Summary rows as a text table"""
+
+    header = ("stage", "calls", "wall s", "max s", "cpu s", "rows", "peak MB", "errors")
+    lines = [
+        (
+            name,
+            str(calls),
+            f"{wall:.3f}",
+            f"{max_wall:.3f}",
+            f"{cpu:.3f}",
+            "" if rows_processed is None else str(rows_processed),
+            "" if rss is None else f"{rss:.1f}",
+            str(errors) if errors else "",
+        )
+        for name, calls, wall, max_wall, cpu, rows_processed, rss, errors in rows
+    ]
+    widths = [max(len(row[i]) for row in [header, *lines]) for i in range(len(header))]
+    text = []
+    for row in [header, *lines]:
+        cells = [row[0].ljust(widths[0])]
+        cells += [cell.rjust(width) for cell, width in zip(row[1:], widths[1:])]
+        text.append("  ".join(cells))
+    return "\n".join(text)
+
+
+def print_summary(trace_file, run=None):
+    """Print the summary table of a trace (of one run if 'run' is given)"""
+    try:
+        records = read_trace(trace_file, run)
+    except OSError:
+        return
+    if records:
+        print(f"\nProfile ({len(records)} stages, trace in {trace_file}):")
+        print(format_summary(summary(records)))
+
+
+def main(argv=None):
+    """Entry point of 'python main.py trace ...'"""
+
+    parser = argparse.ArgumentParser(
+        prog="main.py trace", description="Summary table of a profiling trace."
+    )
+    parser.add_argument("trace", help="JSON lines trace written with --profile")
+    parser.add_argument("--run", help="Only the stages of this run id")
+    args = parser.parse_args(sys.argv[2:] if argv is None else argv)
+
+    if not os.path.exists(args.trace):
+        raise SystemExit(f"{args.trace} not found")
+    print_summary(args.trace, args.run)
+    return 0
@@ -0,0 +1,143 @@
+"""
+/***************************************************************************
+ **SWATPlus-IAHRIS
+ **A software that links SWATPlus to IAHRIS to automatically generate reports on Indicators of Hydrologic Alteration in RIverS.
+ **Persistent cache of the scenario metadata (channels, years and rows per channel).
+----------------------------------------------------
+        begin                : **May-2025
+        copyright            : **COPYRIGHT
+        email                : **alopbal@upv.es
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 3 of the License, or     *
+ *   any later version.                                                    *
+ *                                                                         *
+ ***************************************************************************/
+
+Entries are keyed by the path of 'swatplus_output.sqlite' and are only valid while
+its size and mtime are unchanged, so a new SWAT+ run invalidates them. The cache is
+bounded in size: least recently used entries are evicted first.
+"""
+
+import json
+import os
+import sqlite3
+import time
+
+from config import CACHE_FOLDER
+
+
+CACHE_FILE = os.path.join(CACHE_FOLDER, "scenario_metadata.sqlite")
+
+# Maximum size of the cached summaries (bytes)
+MAX_CACHE_BYTES = 32 * 1024 * 1024
+
+
+def cache_key(sqlite):
+    """Normalised path of a SWAT+ database"""
+    return os.path.normcase(os.path.abspath(sqlite))
+
+
+def connect():
+    """Connection to the cache database (created on first use)"""
+    os.makedirs(CACHE_FOLDER, exist_ok=True)
+    conn = sqlite3.connect(CACHE_FILE, timeout=10)
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS metadata (
+            path TEXT PRIMARY KEY,
+            size INTEGER,
+            mtime_ns INTEGER,
+            summary TEXT,
+            last_used REAL
+        )
+        """
+    )
+    return conn
+
+
+def get(sqlite):
+    """Cached channel summary of a SWAT+ database (None if missing or outdated)"""
+
+    try:
+        stat = os.stat(sqlite)
+        conn = connect()
+    except (OSError, sqlite3.Error):
+        return None
+
+    try:
+        key = cache_key(sqlite)
+        row = conn.execute(
+            "SELECT size, mtime_ns, summary FROM metadata WHERE path = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        # Invalidate the entry if the database has been rewritten
+        if (row[0], row[1]) != (stat.st_size, stat.st_mtime_ns):
+            conn.execute("DELETE FROM metadata WHERE path = ?", (key,))
+            conn.commit()
+            return None
+
+        conn.execute(
+            "UPDATE metadata SET last_used = ? WHERE path = ?", (time.time(), key)
+        )
+        conn.commit()
+        return [tuple(item) for item in json.loads(row[2])]
+    except sqlite3.Error:
+        return None
+    finally:
+        conn.close()
+
+
+def put(sqlite, summary):
+    """Store the channel summary of a SWAT+ database and evict old entries"""
+
+    try:
+        stat = os.stat(sqlite)
+        conn = connect()
+    except (OSError, sqlite3.Error):
+        return
+
+    try:
+        conn.execute(
+            "INSERT OR REPLACE INTO metadata VALUES (?, ?, ?, ?, ?)",
+            (
+                cache_key(sqlite),
+                stat.st_size,
+                stat.st_mtime_ns,
+                json.dumps([list(item) for item in summary]),
+                time.time(),
+            ),
+        )
+        evict(conn)
+        conn.commit()
+    except sqlite3.Error:
+        pass
+    finally:
+        conn.close()
+
+
+def evict(conn, max_bytes=None):
+    """Delete the least recently used entries above the size limit"""
+
+    max_bytes = MAX_CACHE_BYTES if max_bytes is None else max_bytes
+    rows = conn.execute(
+        "SELECT path, LENGTH(summary) FROM metadata ORDER BY last_used DESC"
+    ).fetchall()
+
+    total = 0
+    for path, size in rows:
+        total += size
+        if total > max_bytes:
+            conn.execute("DELETE FROM metadata WHERE path = ?", (path,))
+
+
+def clear():
+    """Remove every cached entry"""
+    if os.path.exists(CACHE_FILE):
+        os.remove(CACHE_FILE)
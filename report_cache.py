@@ -0,0 +1,176 @@
+"""
+/***************************************************************************
+ **SWATPlus-IAHRIS
+ **A software that links SWATPlus to IAHRIS to automatically generate reports on Indicators of Hydrologic Alteration in RIverS.
+ **Persistent cache of the generated reports, keyed by the content of the IAHRIS inputs.
+----------------------------------------------------
+        begin                : **May-2025
+        copyright            : **COPYRIGHT
+        email                : **alopbal@upv.es
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 3 of the License, or     *
+ *   any later version.                                                    *
+ *                                                                         *
+ ***************************************************************************/
+
+The IAHRIS input files hold everything a report depends on (the natural and altered
+series, their years and the truncated scenario names in the headers), so the hash
+of their bytes identifies a report. Every entry is a folder with the labelled
+master report and the thematic reports exported from it; the index (an SQLite
+database next to them) keeps the name of the master report and the last use of
+every entry. The cache is bounded in size (REPORT_CACHE_MB, 0 disables it): least
+recently used entries are evicted first. Cached files are copied, never linked,
+so that editing a report does not change the cache.
+"""
+
+import hashlib
+import os
+import shutil
+import sqlite3
+import time
+import uuid
+
+from config import CACHE_FOLDER, REPORT_CACHE_MB
+
+
+CACHE_DIR = os.path.join(CACHE_FOLDER, "reports")
+INDEX_FILE = os.path.join(CACHE_DIR, "reports.sqlite")
+
+# Part of every key: a new version invalidates the reports of the previous ones
+CACHE_VERSION = b"SWATPlus-IAHRIS reports 1"
+
+# Maximum size of the cached reports (bytes)
+MAX_CACHE_BYTES = REPORT_CACHE_MB * 1024 * 1024
+
+
+def enabled():
+    """False if the cache is disabled (SWATPLUS_IAHRIS_REPORT_CACHE_MB=0)"""
+    return MAX_CACHE_BYTES > 0
+
+
+def input_key(paths):
+    """Key of a report: hash of its IAHRIS input files (natural first)"""
+    digest = hashlib.sha256(CACHE_VERSION)
+    for path in paths:
+        digest.update(b"\0%d\0" % os.path.getsize(path))
+        with open(path, "rb") as input_file:
+            for block in iter(lambda: input_file.read(1024 * 1024), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def connect():
+    """Connection to the index of the cache (created on first use)"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    conn = sqlite3.connect(INDEX_FILE, timeout=10)
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS reports (
+            key TEXT PRIMARY KEY,
+            master TEXT,
+            size INTEGER,
+            last_used REAL
+        )
+        """
+    )
+    return conn
+
+
+def restore(key, report_folder):
+    """Copy the cached reports of a key to a folder
+
+    Returns the path of the copied master report and the names of all the copied
+    files, or (None, []) if the key is not cached.
+    """
+
+    if not enabled():
+        return None, []
+    try:
+        conn = connect()
+    except (OSError, sqlite3.Error):
+        return None, []
+
+    try:
+        row = conn.execute("SELECT master FROM reports WHERE key = ?", (key,)).fetchone()
+        entry = os.path.join(CACHE_DIR, key)
+        if row is None or not os.path.isfile(os.path.join(entry, row[0])):
+            return None, []
+
+        os.makedirs(report_folder, exist_ok=True)
+        names = sorted(os.listdir(entry))
+        for name in names:
+            shutil.copy2(os.path.join(entry, name), os.path.join(report_folder, name))
+
+        conn.execute(
+            "UPDATE reports SET last_used = ? WHERE key = ?", (time.time(), key)
+        )
+        conn.commit()
+        return os.path.join(report_folder, row[0]), names
+    except (OSError, sqlite3.Error):
+        return None, []
+    finally:
+        conn.close()
+
+
+def put(key, master, others=()):
+    """Store the master report of a key (and other files, e.g. thematic reports)
+
+    Files of an existing entry are kept, so thematic reports can be added later.
+    """
+
+    if not enabled():
+        return
+    try:
+        conn = connect()
+    except (OSError, sqlite3.Error):
+        return
+
+    entry = os.path.join(CACHE_DIR, key)
+    try:
+        # Files are copied next to the entry and renamed, so that a reader never
+        # gets a partial file
+        os.makedirs(entry, exist_ok=True)
+        for path in [master, *others]:
+            temporary = os.path.join(entry, f".{uuid.uuid4().hex}.tmp")
+            shutil.copy2(path, temporary)
+            os.replace(temporary, os.path.join(entry, os.path.basename(path)))
+
+        size = sum(
+            os.path.getsize(os.path.join(entry, name)) for name in os.listdir(entry)
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO reports VALUES (?, ?, ?, ?)",
+            (key, os.path.basename(master), size, time.time()),
+        )
+        evict(conn)
+        conn.commit()
+    except (OSError, sqlite3.Error):
+        pass
+    finally:
+        conn.close()
+
+
+def evict(conn, max_bytes=None):
+    """Delete the least recently used entries above the size limit"""
+
+    max_bytes = MAX_CACHE_BYTES if max_bytes is None else max_bytes
+    rows = conn.execute(
+        "SELECT key, size FROM reports ORDER BY last_used DESC"
+    ).fetchall()
+
+    total = 0
+    for key, size in rows:
+        total += size
+        if total > max_bytes:
+            conn.execute("DELETE FROM reports WHERE key = ?", (key,))
+            shutil.rmtree(os.path.join(CACHE_DIR, key), ignore_errors=True)
+
+
+def clear():
+    """Remove every cached report"""
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
@@ -0,0 +1,128 @@
+"""
+/***************************************************************************
+ **SWATPlus-IAHRIS
+ **A software that links SWATPlus to IAHRIS to automatically generate reports on Indicators of Hydrologic Alteration in RIverS.
+ **Background report generation for the GUI (QThreadPool worker with progress and cancellation).
+----------------------------------------------------
+        begin                : **May-2025
+        copyright            : **COPYRIGHT
+        email                : **alopbal@upv.es
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 3 of the License, or     *
+ *   any later version.                                                    *
+ *                                                                         *
+ ***************************************************************************/
+
+The pipeline runs out of the GUI thread and only talks to the window through Qt
+signals (queued to the GUI thread). Reports are queued in a pool of
+IAHRIS_PARALLEL threads (one by default): every report has its own working folder
+and IAHRIS project, but IAHRIS keeps its projects in one database.
+"""
+
+import threading
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+import iahris_pipeline as pipeline
+import instrumentation
+import scenario_store
+from config import IAHRIS_PARALLEL
+
+
+class ReportSignals(QObject):
+    """Signals of a report worker (the first argument is the job id)"""
+
+    progress = pyqtSignal(int, int, str)  # percent, stage
+    finished = pyqtSignal(int, str)  # master report
+    failed = pyqtSignal(int, str, str)  # title, message
+    cancelled = pyqtSignal(int)
+
+
+class ReportWorker(QRunnable):
+    """Generate the master report of a GUI job (see pipeline.generate_report)"""
+
+    def __init__(self, job):
+        super().__init__()
+        self.job = job
+        self.signals = ReportSignals()
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """Stop the report before its next stage (or stop IAHRIS if it is running)"""
+        self.cancel_event.set()
+
+    def run(self):
+        job_id = self.job["id"]
+
+        try:
+            with instrumentation.stage("generate_report", job=job_id):
+                last_generated_xlsx = pipeline.generate_report(
+                    self.job,
+                    lambda percent, stage: self.signals.progress.emit(
+                        job_id, percent, stage
+                    ),
+                    self.cancel_event,
+                )
+        except pipeline.ReportCancelled:
+            self.signals.cancelled.emit(job_id)
+        except pipeline.ReportError as error:
+            self.signals.failed.emit(job_id, error.title, str(error))
+        except Exception as error:
+            self.signals.failed.emit(job_id, "Report Generation Error", str(error))
+        else:
+            self.signals.finished.emit(job_id, last_generated_xlsx)
+        finally:
+            # The threads of the pool are reused: no connection outlives the job
+            scenario_store.close_all()
+
+
+class ReportQueue(QObject):
+    """Reports waiting or running (IAHRIS_PARALLEL at a time) in order of submission"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max(1, IAHRIS_PARALLEL))
+        self.workers = {}  # job id -> worker (waiting or running)
+        self.next_id = 1
+
+    def submit(self, job):
+        """Queue a job and return its worker (connect its signals before it starts)"""
+        job["id"] = self.next_id
+        self.next_id += 1
+
+        worker = ReportWorker(job)
+        self.workers[job["id"]] = worker
+        for signal in (
+            worker.signals.finished,
+            worker.signals.failed,
+            worker.signals.cancelled,
+        ):
+            signal.connect(self.remove)
+        return worker
+
+    def start(self, worker):
+        """Run a submitted worker as soon as the previous reports are done"""
+        self.pool.start(worker)
+
+    def remove(self, job_id, *args):
+        """Forget a job once it is finished, failed or cancelled"""
+        self.workers.pop(job_id, None)
+
+    def pending(self):
+        """Number of reports waiting or running"""
+        return len(self.workers)
+
+    def cancel_all(self):
+        """Cancel the running report and every waiting one"""
+        for worker in list(self.workers.values()):
+            worker.cancel()
+
+    def wait(self):
+        """Block until the pool is idle (used when the window closes)"""
+        self.pool.waitForDone()
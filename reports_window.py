@@ -0,0 +1,71 @@
+"""
+/***************************************************************************
+ **SWATPlus-IAHRIS
+ **A software that links SWATPlus to IAHRIS to automatically generate reports on Indicators of Hydrologic Alteration in RIverS.
+ **Reports window of the GUI (thematic reports of a master report).
+----------------------------------------------------
+        begin                : **May-2025
+        copyright            : **COPYRIGHT
+        email                : **alopbal@upv.es
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 3 of the License, or     *
+ *   any later version.                                                    *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+from PyQt6 import QtWidgets
+import os
+
+import iahris_pipeline as pipeline
+import ui_forms
+
+
+class ReportsWindow(QtWidgets.QMainWindow, ui_forms.form_class("reports")):
+    def __init__(self, last_generated_xlsx, report_folder):
+        """Constructor of the SWATPlus-IAHRIS software - Report Window"""
+        super().__init__()
+        self.setupUi(self)
+
+        # Variables from the main window
+        self.last_generated_xlsx = last_generated_xlsx  # Master report file
+        self.report_folder = report_folder  # Selected folder to save the reports
+
+        self.pushButton_print.clicked.connect(self.on_print_button_clicked)
+
+    def on_print_button_clicked(self):
+        """Extract reports based on the selected checkboxes (themes)."""
+
+        # Theme checkboxes, their ✓ labels and the progress after each theme
+        themes = {
+            "nat": (self.checkBox_nat, self.label_nat, 10),
+            "alt": (self.checkBox_alt, self.label_alt, 30),
+            "nat_alt": (self.checkBox_nat_alt, self.label_nat_alt, 40),
+            "curves": (self.checkBox_curves, self.label_curves, 60),
+            "habitual": (self.checkBox_habitual, self.label_habitual, 70),
+            "floods": (self.checkBox_floods, self.label_floods, 90),
+            "sign": (self.checkBox_sign, self.label_sign, 100),
+        }
+        selected = [
+            theme for theme, (checkbox, _, _) in themes.items() if checkbox.isChecked()
+        ]
+
+        def done(theme, output_excel_path):
+            _, label, progress = themes[theme]
+            label.setText("✓")
+            self.progressBar.setValue(progress)
+
+        # All the thematic reports from one read of the master report (no Excel)
+        pipeline.export_themes(
+            self.last_generated_xlsx, self.report_folder, selected, done
+        )
+
+        # Open the report folder
+        os.startfile(self.report_folder)
+
+        self.progressBar.setValue(0)
@@ -0,0 +1,200 @@
+"""
+/***************************************************************************
+ **SWATPlus-IAHRIS
+ **A software that links SWATPlus to IAHRIS to automatically generate reports on Indicators of Hydrologic Alteration in RIverS.
+ **Read-only access to the SQLite databases of the SWAT+ scenarios (pooled connections).
+----------------------------------------------------
+        begin                : **May-2025
+        copyright            : **COPYRIGHT
+        email                : **alopbal@upv.es
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 3 of the License, or     *
+ *   any later version.                                                    *
+ *                                                                         *
+ ***************************************************************************/
+
+Every query of 'channel_sd_day' goes through this module. The databases are
+opened through read-only URIs, so SWATPlus-IAHRIS never takes a write lock on (or
+creates) a swatplus_output.sqlite that SWAT+ may still be writing:
+  - the SWAT+ database with mode=ro (SQLite still sees a database rewritten by a
+    new SWAT+ run);
+  - its sidecar index (see channel_index) with immutable=1 (no locks at all): it
+    is only written by SWATPlus-IAHRIS and replaced in one rename.
+The connections are query_only, memory-map the database (MMAP_SIZE) and have a
+larger page cache (CACHE_KB). They are pooled by thread (a connection is never
+shared by two threads), reopened when the database or its sidecar index changes
+on disk and closed with close_all at the end of every batch or GUI job.
+"""
+
+import collections
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+import channel_index
+from flow_series import FlowSeries
+from iahris_input import HM3_PER_DAY, SWATPLUS_ROW
+
+
+# Bytes of the database memory-mapped by every connection
+MMAP_SIZE = 256 * 1024 * 1024
+
+# Page cache of every connection (KB)
+CACHE_KB = 32 * 1024
+
+# Open connections kept by every thread (least recently used ones are dropped)
+POOL_SIZE = 8
+
+# Daily 'flo_out' of a channel with numeric dates (formatted only when written)
+CHANNEL_QUERY = """
+SELECT yr, mon, day, flo_out
+FROM channel_sd_day
+WHERE unit = ? AND yr BETWEEN ? AND ?
+ORDER BY yr, mon, day
+"""
+
+# Daily 'flo_out' of every channel, grouped by channel
+ALL_CHANNELS_QUERY = """
+SELECT unit, yr, mon, day, flo_out
+FROM channel_sd_day
+WHERE yr BETWEEN ? AND ?
+ORDER BY unit, yr, mon, day
+"""
+
+# Monthly contributions (hm3) and days of data of a channel, summed by SQLite
+MONTHLY_QUERY = """
+SELECT yr, mon, SUM(flo_out) * ?, COUNT(*)
+FROM channel_sd_day
+WHERE unit = ? AND yr BETWEEN ? AND ?
+GROUP BY yr, mon
+ORDER BY yr, mon
+"""
+
+# Monthly contributions of every channel, grouped by channel
+ALL_MONTHLY_QUERY = """
+SELECT unit, yr, mon, SUM(flo_out) * ?, COUNT(*)
+FROM channel_sd_day
+WHERE yr BETWEEN ? AND ?
+GROUP BY unit, yr, mon
+ORDER BY unit, yr, mon
+"""
+
+# Channels with their years and number of days (an index-only scan when indexed)
+SUMMARY_QUERY = (
+    "SELECT unit, MIN(yr), MAX(yr), COUNT(*) FROM channel_sd_day GROUP BY unit"
+)
+
+# Connections of every thread: normalised path -> (signature, connection)
+_local = threading.local()
+
+
+def open_read_only(path, immutable=False):
+    """New read-only connection to a database, with the pragmas of the store
+
+    sqlite3.OperationalError if the database does not exist (it is not created).
+    """
+    conn = sqlite3.connect(channel_index.read_only_uri(path, immutable), uri=True)
+    conn.execute("PRAGMA query_only = ON")
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+    conn.execute(f"PRAGMA cache_size = -{CACHE_KB}")
+    return conn
+
+
+def file_signature(path):
+    """Size and mtime (ns) of a file, None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def connection(sqlite):
+    """Pooled read-only connection to query the 'channel_sd_day' of a SWAT+ database
+    (its fresh sidecar index if any)"""
+
+    pool = getattr(_local, "pool", None)
+    if pool is None:
+        pool = _local.pool = collections.OrderedDict()
+
+    key = os.path.normcase(os.path.abspath(sqlite))
+    signature = (
+        file_signature(sqlite),
+        file_signature(channel_index.sidecar_path(sqlite)),
+    )
+    entry = pool.get(key)
+    if entry is not None and entry[0] == signature:
+        pool.move_to_end(key)
+        return entry[1]
+
+    # Outdated (or first) connection; a dropped connection is closed by SQLite once
+    # no cursor uses it any more
+    pool.pop(key, None)
+    if channel_index.has_fresh_sidecar(sqlite):
+        conn = open_read_only(channel_index.sidecar_path(sqlite), immutable=True)
+    else:
+        conn = open_read_only(sqlite)
+    pool[key] = (signature, conn)
+    while len(pool) > POOL_SIZE:
+        pool.popitem(last=False)
+    return conn
+
+
+def close_all():
+    """Close the connections of the calling thread"""
+    pool = getattr(_local, "pool", None)
+    while pool:
+        _, (_, conn) = pool.popitem()
+        conn.close()
+
+
+def channel_summary(sqlite):
+    """(unit, min year, max year, rows) of every channel"""
+    return connection(sqlite).execute(SUMMARY_QUERY).fetchall()
+
+
+def channel_rows(sqlite, unit, start_year, end_year):
+    """Cursor of the (yr, mon, day, flo_out) rows of a channel, ordered by date"""
+    return connection(sqlite).execute(CHANNEL_QUERY, (unit, start_year, end_year))
+
+
+def all_channel_rows(sqlite, start_year, end_year):
+    """Cursor of the (unit, yr, mon, day, flo_out) rows of every channel, ordered by
+    channel and date"""
+    return connection(sqlite).execute(ALL_CHANNELS_QUERY, (start_year, end_year))
+
+
+def monthly_rows(sqlite, unit, start_year, end_year):
+    """Cursor of the (yr, mon, hm3, days) monthly rows of a channel, ordered by date
+    (about 30 times fewer rows than the daily ones)"""
+    return connection(sqlite).execute(
+        MONTHLY_QUERY, (HM3_PER_DAY, unit, start_year, end_year)
+    )
+
+
+def all_monthly_rows(sqlite, start_year, end_year):
+    """Cursor of the (unit, yr, mon, hm3, days) monthly rows of every channel,
+    ordered by channel and date"""
+    return connection(sqlite).execute(
+        ALL_MONTHLY_QUERY, (HM3_PER_DAY, start_year, end_year)
+    )
+
+
+def series_from_rows(rows, dtype="float64"):
+    """FlowSeries from (yr, mon, day, flo_out) rows ordered by date"""
+    data = np.fromiter(rows, dtype=SWATPLUS_ROW)
+    return FlowSeries.from_ymd(
+        data["yr"], data["mon"], data["day"], data["flo_out"], dtype
+    )
+
+
+def fetch_series(sqlite, unit, start_year, end_year, dtype="float64"):
+    """Daily 'flo_out' of a channel as a FlowSeries"""
+    return series_from_rows(channel_rows(sqlite, unit, start_year, end_year), dtype)
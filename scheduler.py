@@ -0,0 +1,68 @@
+"""
+/***************************************************************************
+ **SWATPlus-IAHRIS
+ **A software that links SWATPlus to IAHRIS to automatically generate reports on Indicators of Hydrologic Alteration in RIverS.
+ **Scheduler of the batch jobs: every stage of a job runs on its own executor.
+----------------------------------------------------
+        begin                : **May-2025
+        copyright            : **COPYRIGHT
+        email                : **alopbal@upv.es
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 3 of the License, or     *
+ *   any later version.                                                    *
+ *                                                                         *
+ ***************************************************************************/
+
+The batch mode prepares the IAHRIS inputs and post-processes the reports in worker
+processes, while the IAHRIS runs (external processes that only need a thread to
+wait for them) go to a thread pool whose size is the number of IAHRIS runs
+allowed at the same time. A job moves to its next stage as soon as the previous
+one finishes, so the stages of different jobs overlap.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, wait
+
+import instrumentation
+
+
+def run_stage(function, job, previous):
+    """Run a stage of a job in its executor (recorded when profiling is on)"""
+    with instrumentation.stage(function.__name__, unit=job.get("unit")):
+        return function(job, previous)
+
+
+def run_stages(jobs, stages):
+    """Run every job through the stages and yield (job, result, error) as they end
+
+    'stages' is a list of (function, executor); function(job, result of the
+    previous stage) is submitted to the executor of its stage (the first stage
+    gets None). A job ends at its first failed stage (result None, the exception
+    as error) or with the result of its last stage (error None).
+    """
+
+    def submit(job, index, previous):
+        function, executor = stages[index]
+        running[executor.submit(run_stage, function, job, previous)] = (job, index)
+
+    running = {}
+    for job in jobs:
+        submit(job, 0, None)
+
+    while running:
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            job, index = running.pop(future)
+            try:
+                result = future.result()
+            except Exception as error:
+                yield job, None, error
+                continue
+            if index + 1 < len(stages):
+                submit(job, index + 1, result)
+            else:
+                yield job, result, None
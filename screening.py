@@ -0,0 +1,264 @@
+"""
+/***************************************************************************
+ **SWATPlus-IAHRIS
+ **A software that links SWATPlus to IAHRIS to automatically generate reports on Indicators of Hydrologic Alteration in RIverS.
+ **Screening of the hydrologic alteration of every channel of a watershed in one pass.
+----------------------------------------------------
+        begin                : **May-2025
+        copyright            : **COPYRIGHT
+        email                : **alopbal@upv.es
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 3 of the License, or     *
+ *   any later version.                                                    *
+ *                                                                         *
+ ***************************************************************************/
+
+A first look at the whole model before choosing the reaches that get a full IAHRIS
+report (see indicators for the complete set of indices of one channel):
+    python main.py screening --scenarios C:\\Model\\Scenarios --nat Default
+        --alt Reservoir --output screening.csv
+
+'channel_sd_day' of every channel is read once per scenario and the daily flows
+of BLOCK_UNITS channels at a time are laid out as a (channels x hydrologic years
+x days) array (October to September, years with less than MIN_COVERAGE of their
+days are left out). Every metric is a NumPy reduction over that array, for all
+the channels of the block at once:
+
+- magnitude: mean annual contribution (hm3);
+- variability: mean over the years of Q10% - Q90% of the daily flows;
+- seasonality: months of the maximum and of the minimum mean monthly contribution;
+- extremes: mean of the annual maximum and of the annual minimum daily flows.
+
+For every metric the table has the natural and the altered value and an index
+(0 = fully altered, 1 = natural) computed as the indices of IAHRIS: the ratio
+altered/natural (inverted when greater than 1), or 1 - months of shift / 6 for
+the seasonality. 'mean_index' is the mean of the indices. The table has one row
+per channel 'unit' (';' separated), to be joined to the channels of the SWAT+
+shapefile.
+"""
+
+import argparse
+import itertools
+import sys
+
+import numpy as np
+
+from duration_curves import (
+    MIN_COVERAGE,
+    MONTHS,
+    average_curve,
+    hydrologic_calendar,
+    period_layout,
+    stack_series,
+)
+from indicators import HM3_PER_DAY, ratio_index, write_table
+
+
+# Channels read and processed at once (bounds the memory of the days array)
+BLOCK_UNITS = 512
+
+# Exceedance percentiles of the variability (Q10% - Q90%)
+VARIABILITY_PERCENTILES = np.array([0.10, 0.90])
+
+# Metrics of a regime; the seasonality ones are months (0 = October)
+METRICS = (
+    "annual_hm3",
+    "q10_q90",
+    "month_max",
+    "month_min",
+    "annual_max",
+    "annual_min",
+)
+MONTH_METRICS = ("month_max", "month_min")
+
+
+def regime_metrics(flows, start):
+    """Metrics of every row of a (channels x days) flow matrix starting on epoch
+    day 'start' (dict metric -> array, NaN for channels without complete years)"""
+
+    flows = np.asarray(flows, dtype=np.float64)
+    years, months = hydrologic_calendar(start, flows.shape[1])
+    positions, width = period_layout(years, months, tuple(range(12)))
+    day_months = np.where(positions >= 0, months[np.maximum(positions, 0)], -1)
+
+    metrics = {name: np.full(len(flows), np.nan) for name in METRICS}
+    for first in range(0, len(flows), BLOCK_UNITS):
+        block = flows[first : first + BLOCK_UNITS]
+        rows = slice(first, first + len(block))
+
+        # (channels x years x days), NaN for padding and missing data
+        gathered = np.where(positions >= 0, block[:, np.maximum(positions, 0)], np.nan)
+        missing = np.isnan(gathered)
+        complete = np.count_nonzero(~missing, axis=-1) >= MIN_COVERAGE * width
+        n_complete = complete.sum(axis=1)
+
+        def mean_of_years(values):
+            """Mean over the complete years of a (channels x years) array"""
+            total = np.where(complete, values, 0.0).sum(axis=1)
+            return np.where(n_complete > 0, total / np.maximum(n_complete, 1), np.nan)
+
+        # Magnitude: mean annual contribution
+        daily = np.where(missing, 0.0, gathered)
+        metrics["annual_hm3"][rows] = mean_of_years(daily.sum(axis=-1) * HM3_PER_DAY)
+
+        # Variability: mean yearly Q10% - Q90% (Weibull, as the duration curves)
+        q10, q90 = average_curve(block, positions, width, VARIABILITY_PERCENTILES).T
+        metrics["q10_q90"][rows] = q10 - q90
+
+        # Seasonality: months of the extreme mean monthly contributions
+        months_of_days = np.broadcast_to(day_months, gathered.shape)
+        selected = (months_of_days >= 0) & complete[..., None]
+        channels = np.broadcast_to(np.arange(len(block))[:, None, None], gathered.shape)
+        monthly = np.bincount(
+            (channels * 12 + months_of_days)[selected],
+            weights=daily[selected],
+            minlength=len(block) * 12,
+        ).reshape(len(block), 12)
+        has_years = n_complete > 0
+        metrics["month_max"][rows] = np.where(has_years, monthly.argmax(axis=1), np.nan)
+        metrics["month_min"][rows] = np.where(has_years, monthly.argmin(axis=1), np.nan)
+
+        # Extremes: mean annual maximum and minimum daily flows
+        metrics["annual_max"][rows] = mean_of_years(
+            np.where(missing, -np.inf, gathered).max(axis=-1)
+        )
+        metrics["annual_min"][rows] = mean_of_years(
+            np.where(missing, np.inf, gathered).min(axis=-1)
+        )
+
+    return metrics
+
+
+def month_shift_index(month_natural, month_altered):
+    """1 - shift (months, circular) / 6 of arrays of months (NaN stays NaN)"""
+    shift = np.abs(month_natural - month_altered) % 12
+    return 1 - np.minimum(shift, 12 - shift) / 6
+
+
+def alteration_table(natural, altered):
+    """Columns (dict name -> array) of the natural and altered metrics, their
+    indices and the mean index"""
+
+    columns, indices = {}, []
+    for name in METRICS:
+        if name in MONTH_METRICS:
+            index = month_shift_index(natural[name], altered[name])
+        else:
+            index = np.where(
+                np.isnan(natural[name]) | np.isnan(altered[name]),
+                np.nan,
+                ratio_index(natural[name], altered[name]),
+            )
+        columns[f"{name}_nat"] = natural[name]
+        columns[f"{name}_alt"] = altered[name]
+        columns[f"{name}_index"] = index
+        indices.append(index)
+
+    indices = np.array(indices)
+    with_values = np.count_nonzero(~np.isnan(indices), axis=0)
+    columns["mean_index"] = np.where(
+        with_values > 0,
+        np.nansum(indices, axis=0) / np.maximum(with_values, 1),
+        np.nan,
+    )
+    return columns
+
+
+def screen(units, series_nat, series_alt):
+    """Table rows (dicts with a 'unit' key) of the alteration of every channel
+
+    'series_nat' and 'series_alt' are the FlowSeries of the 'units', in order.
+    """
+
+    start_nat, flows_nat = stack_series(series_nat)
+    start_alt, flows_alt = stack_series(series_alt)
+    columns = alteration_table(
+        regime_metrics(flows_nat, start_nat), regime_metrics(flows_alt, start_alt)
+    )
+
+    # Months by name, the other values rounded
+    month_columns = {
+        f"{name}_{side}" for name in MONTH_METRICS for side in ("nat", "alt")
+    }
+    rows = []
+    for i, unit in enumerate(units):
+        row = {"unit": unit}
+        for name, values in columns.items():
+            value = float(values[i])
+            if np.isnan(value):
+                row[name] = ""
+            elif name in month_columns:
+                row[name] = MONTHS[int(value)]
+            else:
+                row[name] = round(value, 6)
+        rows.append(row)
+    return rows
+
+
+def main(argv=None):
+    """Entry point of 'python main.py screening ...'"""
+
+    import batch
+    from indicators import unit_series
+
+    parser = argparse.ArgumentParser(
+        prog="main.py screening",
+        description="Alteration metrics of every channel of the watershed in one pass.",
+    )
+    parser.add_argument("--scenarios", help="SWAT+ 'Scenarios' folder")
+    parser.add_argument("--nat", required=True, help="Natural scenario or CSV file")
+    parser.add_argument("--alt", required=True, help="Altered scenario or CSV file")
+    parser.add_argument("--units", default="all", help="'all' or a list (e.g. 1,5,12)")
+    parser.add_argument("--start-nat", type=int)
+    parser.add_argument("--end-nat", type=int)
+    parser.add_argument("--start-alt", type=int)
+    parser.add_argument("--end-alt", type=int)
+    parser.add_argument(
+        "--output", required=True, help="CSV table of the metrics (one row per unit)"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="Number of most altered units printed (lowest mean index)",
+    )
+    args = parser.parse_args(sys.argv[2:] if argv is None else argv)
+
+    channels_nat, min_nat, max_nat = batch.source_metadata(args, args.nat)
+    channels_alt, min_alt, max_alt = batch.source_metadata(args, args.alt)
+    args.start_nat = args.start_nat or min_nat
+    args.end_nat = args.end_nat or max_nat
+    args.start_alt = args.start_alt or min_alt
+    args.end_alt = args.end_alt or max_alt
+
+    # Every channel of each scenario in one scan of 'channel_sd_day', stacked
+    # BLOCK_UNITS channels at a time
+    pairs = unit_series(args, channels_nat, channels_alt)
+    rows = []
+    while True:
+        block = list(itertools.islice(pairs, BLOCK_UNITS))
+        if not block:
+            break
+        block = [pair for pair in block if len(pair[1]) and len(pair[2])]
+        if block:
+            units, series_nat, series_alt = zip(*block)
+            rows += screen(units, series_nat, series_alt)
+    if not rows:
+        raise SystemExit("No channel with flows in both the natural and altered inputs")
+
+    write_table(rows, args.output)
+    print(f"{len(rows)} unit(s) written to {args.output}")
+
+    # Candidates for a full IAHRIS report
+    ranked = sorted(
+        (row for row in rows if row["mean_index"] != ""),
+        key=lambda row: row["mean_index"],
+    )
+    for row in ranked[: args.top]:
+        print(f"unit {row['unit']}: mean index {row['mean_index']:.2f}")
+    return 0
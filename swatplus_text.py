@@ -0,0 +1,385 @@
+"""
+/***************************************************************************
+ **SWATPlus-IAHRIS
+ **A software that links SWATPlus to IAHRIS to automatically generate reports on Indicators of Hydrologic Alteration in RIverS.
+ **Reader of the SWAT+ text output 'channel_sd_day.txt' (alternative to the SQLite database).
+----------------------------------------------------
+        begin                : **May-2025
+        copyright            : **COPYRIGHT
+        email                : **alopbal@upv.es
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 3 of the License, or     *
+ *   any later version.                                                    *
+ *                                                                         *
+ ***************************************************************************/
+
+SWAT+ runs that only print the text outputs write Scenarios/<name>/TxtInOut/
+channel_sd_day.txt: a title line, the column names, a line of units and then one
+fixed-width row per channel and day (all the channels of a day, day after day).
+The file (often many GB) is memory-mapped and read in chunks of whole lines. The
+position of the unit, yr, mon, day and flo_out fields is taken from the first data
+row, every chunk is viewed as a (lines x line length) byte array and only those
+columns are parsed with NumPy: the unit column first, then the other fields of
+the rows of the selected channels and years only. Chunks whose lines do not all
+have the same length (e.g. an overflowed field) are split into tokens instead.
+"""
+
+import mmap
+import os
+import re
+
+import numpy as np
+
+from flow_series import FlowSeries
+
+
+TEXT_FILE = "channel_sd_day.txt"
+
+# Columns read from the file (the others are never parsed)
+COLUMNS = ("unit", "yr", "mon", "day", "flo_out")
+
+# Bytes of the file parsed at once (rounded to whole lines)
+CHUNK_BYTES = 64 * 1024 * 1024
+
+# Lines read to find the column names and the first data row
+HEADER_LINES = 10
+
+# Rows of the selected columns (dates stay numeric)
+TEXT_ROW = np.dtype(
+    [
+        ("unit", np.int32),
+        ("yr", np.int32),
+        ("mon", np.int32),
+        ("day", np.int32),
+        ("flo_out", np.float64),
+    ]
+)
+
+TOKEN = re.compile(rb"\S+")
+
+
+def is_text_output(path):
+    """True for a SWAT+ text output (.txt), False for a SQLite database"""
+    return path.lower().endswith(".txt")
+
+
+def scenario_text(folder, scenario):
+    """Path of the channel_sd_day.txt text output of a scenario"""
+    return os.path.join(folder, scenario, "TxtInOut", TEXT_FILE)
+
+
+class Layout:
+    """Where the data rows start and where the selected fields are in every row"""
+
+    def __init__(self, data_offset, line_length, spans, tokens):
+        self.data_offset = data_offset  # Byte offset of the first data row
+        self.line_length = line_length  # Bytes of a data row (with the line end)
+        self.spans = spans  # Column -> (first byte, last byte + 1) in a row
+        self.tokens = tokens  # Column -> index of its token in a row
+
+
+def read_layout(buffer):
+    """Layout of the data rows from the header and the first data row"""
+
+    names = None
+    offset = 0
+    for _ in range(HEADER_LINES):
+        end = buffer.find(b"\n", offset)
+        if end < 0:
+            end = len(buffer)
+        line = buffer[offset:end]
+        tokens = line.split()
+
+        if names is None:
+            # Column names (after the title line)
+            if b"flo_out" in tokens and b"unit" in tokens:
+                names = [token.decode() for token in tokens]
+        elif tokens and tokens[0].isdigit():
+            # First data row (the line of units is skipped)
+            missing = [c for c in COLUMNS if c not in names]
+            if missing:
+                raise ValueError(f"Columns {missing} not found in {TEXT_FILE}")
+            if len(tokens) != len(names):
+                raise ValueError(f"The rows of {TEXT_FILE} do not match its columns")
+
+            # Numeric fields are right-aligned: a field starts where the previous
+            # token ends
+            matches = list(TOKEN.finditer(line))
+            spans, indexes = {}, {}
+            for column in COLUMNS:
+                i = names.index(column)
+                start = matches[i - 1].end() if i > 0 else 0
+                spans[column] = (start, matches[i].end())
+                indexes[column] = i
+            return Layout(offset, end + 1 - offset, spans, indexes)
+
+        offset = end + 1
+        if offset >= len(buffer):
+            break
+    raise ValueError(f"No data rows found in {TEXT_FILE}")
+
+
+def parse_integers(fields):
+    """Right-aligned unsigned integers of a (rows x width) byte array"""
+    digits = np.ascontiguousarray(fields) - np.uint8(48)
+    digits[digits > 9] = 0  # Blanks
+    values = np.zeros(len(digits), dtype=np.int64)
+    for j in range(digits.shape[1]):
+        values *= 10
+        values += digits[:, j]
+    return values
+
+
+def parse_floats(fields):
+    """Floats of a (rows x width) byte array (blanks around the numbers are ignored)"""
+    fields = np.ascontiguousarray(fields)
+    return fields.view(f"S{fields.shape[1]}").ravel().astype(np.float64)
+
+
+def row_dtype(columns):
+    """dtype of the rows of some of the COLUMNS"""
+    return np.dtype([(column, TEXT_ROW[column]) for column in columns])
+
+
+def fixed_rows(lines, layout, units, start_year, end_year, columns=COLUMNS):
+    """Selected rows of a (lines x line length) byte array"""
+
+    def field(column):
+        start, end = layout.spans[column]
+        return lines[:, start:end]
+
+    # Only the unit column of every line, then the years of the selected channels
+    parsed = {"unit": parse_integers(field("unit"))}
+    if units is not None:
+        keep = np.isin(parsed["unit"], units)
+        lines, parsed["unit"] = lines[keep], parsed["unit"][keep]
+    if start_year is not None:
+        yr = parse_integers(field("yr"))
+        keep = (yr >= start_year) & (yr <= end_year)
+        lines, parsed["unit"], parsed["yr"] = lines[keep], parsed["unit"][keep], yr[keep]
+
+    # The other fields of the selected rows
+    rows = np.empty(len(lines), dtype=row_dtype(columns))
+    for column in columns:
+        if column in parsed:
+            rows[column] = parsed[column]
+        elif column == "flo_out":
+            rows[column] = parse_floats(field(column))
+        else:
+            rows[column] = parse_integers(field(column))
+    return rows
+
+
+def token_rows(chunk, layout, units, start_year, end_year, columns=COLUMNS):
+    """Selected rows of a chunk whose lines are not all the same length"""
+
+    indexes = [layout.tokens[column] for column in COLUMNS]
+    selected = []
+    for line in chunk.splitlines():
+        tokens = line.split()
+        if len(tokens) <= max(indexes):
+            continue
+        selected.append(tuple(tokens[i] for i in indexes))
+
+    rows = np.empty(len(selected), dtype=TEXT_ROW)
+    for column, values in zip(COLUMNS, zip(*selected)):
+        rows[column] = np.array(values).astype(TEXT_ROW[column])
+
+    keep = np.ones(len(rows), dtype=bool)
+    if units is not None:
+        keep &= np.isin(rows["unit"], units)
+    if start_year is not None:
+        keep &= (rows["yr"] >= start_year) & (rows["yr"] <= end_year)
+    return rows[keep][list(columns)].astype(row_dtype(columns))
+
+
+def read_chunks(
+    path,
+    units=None,
+    start_year=None,
+    end_year=None,
+    columns=COLUMNS,
+    chunk_bytes=CHUNK_BYTES,
+):
+    """Yield arrays of rows (some of the COLUMNS) of some channels and years
+
+    'units' (integers or strings) restricts the channels; the rows keep the order
+    of the file (by day, then by channel).
+    """
+
+    if units is not None:
+        units = np.array(sorted(int(unit) for unit in units), dtype=np.int64)
+
+    with open(path, "rb") as text_file:
+        size = os.fstat(text_file.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(text_file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            layout = read_layout(buffer)
+            length = layout.line_length
+            # Whole lines in every chunk
+            step = max(length, chunk_bytes // length * length)
+
+            offset = layout.data_offset
+            while offset < size:
+                end = min(offset + step, size)
+                if end < size:
+                    # Up to the end of the last complete line of the chunk
+                    end = buffer.rfind(b"\n", offset, end) + 1
+                    if end <= offset:
+                        end = buffer.find(b"\n", offset + step)
+                        end = size if end < 0 else end + 1
+
+                block = np.frombuffer(buffer, dtype=np.uint8, count=end - offset, offset=offset)
+                if len(block) % length == 0 and (block[length - 1 :: length] == 10).all():
+                    rows = fixed_rows(
+                        block.reshape(-1, length),
+                        layout,
+                        units,
+                        start_year,
+                        end_year,
+                        columns,
+                    )
+                else:
+                    rows = token_rows(
+                        buffer[offset:end], layout, units, start_year, end_year, columns
+                    )
+                del block
+
+                if len(rows):
+                    yield rows
+                offset = end
+
+
+def channel_summary(path):
+    """(unit, min year, max year, rows) of every channel, in one pass over the file
+
+    Only the unit and yr fields are parsed. Units are small integers, so they
+    index the counts directly (a chunk only holds a few years).
+    """
+
+    counts = np.zeros(0, dtype=np.int64)
+    min_year = np.zeros(0, dtype=np.int64)
+    max_year = np.zeros(0, dtype=np.int64)
+    for rows in read_chunks(path, columns=("unit", "yr")):
+        unit, yr = rows["unit"], rows["yr"]
+
+        # Room for the largest unit of the chunk
+        size = max(len(counts), int(unit.max()) + 1)
+        if size > len(counts):
+            grow = size - len(counts)
+            counts = np.concatenate([counts, np.zeros(grow, dtype=np.int64)])
+            min_year = np.concatenate([min_year, np.full(grow, np.iinfo(np.int64).max)])
+            max_year = np.concatenate([max_year, np.full(grow, np.iinfo(np.int64).min)])
+
+        counts += np.bincount(unit, minlength=size)
+        for year in range(int(yr.min()), int(yr.max()) + 1):
+            present = np.flatnonzero(np.bincount(unit[yr == year], minlength=size))
+            min_year[present] = np.minimum(min_year[present], year)
+            max_year[present] = np.maximum(max_year[present], year)
+
+    units = np.flatnonzero(counts)
+    return list(
+        zip(
+            units.tolist(),
+            min_year[units].tolist(),
+            max_year[units].tolist(),
+            counts[units].tolist(),
+        )
+    )
+
+
+def unit_lines(buffer, layout, unit, summary):
+    """(lines x line length) view of the rows of one channel, or None
+
+    When every channel has the same rows (all the channels of a day, day after
+    day, as SWAT+ prints them) the channel is at the same position in every day:
+    its rows are one line out of len(summary), found from the first day. None
+    when the file does not have that layout (the caller scans the file then).
+    """
+
+    n_units = len(summary)
+    counts = {row[3] for row in summary}
+    if n_units == 0 or len(counts) != 1:
+        return None
+    length = layout.line_length
+    n_lines = n_units * counts.pop()
+    if layout.data_offset + n_lines * length > len(buffer):
+        return None
+    lines = np.frombuffer(
+        buffer, dtype=np.uint8, count=n_lines * length, offset=layout.data_offset
+    ).reshape(-1, length)
+
+    # Position of the channel in the first day, then the same line of every day
+    start, end = layout.spans["unit"]
+    first_day = parse_integers(lines[:n_units, start:end])
+    position = np.flatnonzero(first_day == int(unit))
+    if len(position) != 1:
+        return None
+    selected = lines[position[0] :: n_units]
+    if not (selected[:, -1] == 10).all() or not (
+        parse_integers(selected[:, start:end]) == int(unit)
+    ).all():
+        return None
+    return selected
+
+
+def extract_flow(path, unit, start_year, end_year, dtype="float64", summary=None):
+    """Daily 'flo_out' of a channel as a FlowSeries
+
+    With the channel summary of the file (see channel_summary) only the lines of
+    the channel are read when the file has one row per channel and day (see
+    unit_lines); otherwise the unit column of every line is parsed.
+    """
+
+    rows = None
+    if summary is not None and os.path.getsize(path) > 0:
+        with open(path, "rb") as text_file:
+            with mmap.mmap(text_file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                layout = read_layout(buffer)
+                lines = unit_lines(buffer, layout, unit, summary)
+                if lines is not None:
+                    rows = fixed_rows(lines, layout, None, start_year, end_year)
+                del lines
+
+    if rows is None:
+        chunks = list(read_chunks(path, [unit], start_year, end_year))
+        rows = np.concatenate(chunks) if chunks else np.empty(0, dtype=TEXT_ROW)
+    return FlowSeries.from_ymd(rows["yr"], rows["mon"], rows["day"], rows["flo_out"], dtype)
+
+
+def join_pieces(pieces):
+    """FlowSeries of the consecutive pieces (FlowSeries) of a channel"""
+    for previous, piece in zip(pieces, pieces[1:]):
+        if piece.start != previous.end + 1:
+            raise ValueError("The flow series is not a continuous daily series")
+    return FlowSeries(pieces[0].start, np.concatenate([p.values for p in pieces]))
+
+
+def extract_all_flows(path, start_year, end_year, units=None, dtype="float64"):
+    """Yield (unit, FlowSeries) for the channels of the file in one pass
+
+    The rows of a channel are spread over the whole file, so every series is
+    complete only at the end of the file. Each chunk is grouped by channel as it
+    is read and only the flows of every channel (in 'dtype') are kept.
+    """
+
+    pieces = {}
+    for rows in read_chunks(path, units, start_year, end_year):
+        # Group the rows by channel (a stable sort keeps the days in order)
+        rows = rows[np.argsort(rows["unit"], kind="stable")]
+        bounds = np.flatnonzero(np.diff(rows["unit"])) + 1
+        for group in np.split(rows, bounds):
+            # Flows copied out of the chunk, which is released
+            flows = np.array(group["flo_out"], dtype=dtype)
+            pieces.setdefault(int(group["unit"][0]), []).append(
+                FlowSeries.from_ymd(group["yr"], group["mon"], group["day"], flows)
+            )
+
+    for unit in sorted(pieces):
+        yield str(unit), join_pieces(pieces.pop(unit))
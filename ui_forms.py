@@ -0,0 +1,132 @@
+"""
+/***************************************************************************
+ **SWATPlus-IAHRIS
+ **A software that links SWATPlus to IAHRIS to automatically generate reports on Indicators of Hydrologic Alteration in RIverS.
+ **Windows of the GUI from pre-generated Python classes (GUI.ui and reports.ui).
+----------------------------------------------------
+        begin                : **May-2025
+        copyright            : **COPYRIGHT
+        email                : **alopbal@upv.es
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 3 of the License, or     *
+ *   any later version.                                                    *
+ *                                                                         *
+ ***************************************************************************/
+
+Parsing the XML of a .ui file with uic.loadUi at every start is slow, so the
+windows are built from Python classes generated once with pyuic6 (ui_gui.py and
+ui_reports.py). They are generated again after editing a .ui file with:
+    python ui_forms.py
+
+Every generated module stores the SHA-1 of its .ui file. If the .ui file next to
+it has changed (or the module is missing), the .ui file is compiled at start-up
+instead, so an outdated module is never used.
+"""
+
+import hashlib
+import io
+import os
+import re
+
+from config import resource_path
+
+
+# .ui files of the GUI and the modules generated from them
+FORMS = {"GUI": "ui_gui", "reports": "ui_reports"}
+
+# Images of the .ui files (relative to the .ui file, not to the working folder)
+PIXMAP = re.compile(r'QtGui\.QPixmap\("([^"]*)"\)')
+
+
+def ui_file_path(name):
+    """Path of the .ui file of a form"""
+    return resource_path(f"{name}.ui")
+
+
+def ui_sha1(ui_file):
+    """SHA-1 of a .ui file (line endings ignored, e.g. after a Windows checkout)"""
+    with open(ui_file, "rb") as ui:
+        return hashlib.sha1(ui.read().replace(b"\r\n", b"\n")).hexdigest()
+
+
+def generated_module(name):
+    """Pre-generated module of a form (None if missing)
+
+    Imported by name, not with importlib, so that PyInstaller finds the modules
+    and bundles them in the frozen build.
+    """
+    try:
+        if name == "GUI":
+            import ui_gui as module
+        else:
+            import ui_reports as module
+    except ImportError:
+        return None
+    return module
+
+
+def form_class(name):
+    """Class with the setupUi of a form (to be mixed into its window class)
+
+    The pre-generated class if it matches the .ui file, otherwise the class
+    compiled from the .ui file.
+    """
+
+    ui_file = ui_file_path(name)
+    module = generated_module(name)
+
+    # Frozen builds may ship the generated module without the .ui file
+    if module is not None and (
+        not os.path.exists(ui_file) or module.UI_SHA1 == ui_sha1(ui_file)
+    ):
+        return module.UI_CLASS
+
+    from PyQt6 import uic
+
+    return uic.loadUiType(ui_file)[0]
+
+
+def generate(name):
+    """Python source of the class of a form (pyuic6 and the paths of the images)"""
+
+    from PyQt6.uic import compileUi
+
+    ui_file = ui_file_path(name)
+    code = io.StringIO()
+    with open(ui_file, encoding="utf-8") as ui:
+        compileUi(ui, code)
+    source = code.getvalue().replace(ui_file, f"{name}.ui", 1)
+
+    # Images found from the installation folder (as uic.loadUi does)
+    source = PIXMAP.sub(r'QtGui.QPixmap(resource_path("\1"))', source)
+    source = source.replace(
+        "from PyQt6 import QtCore, QtGui, QtWidgets\n",
+        "from PyQt6 import QtCore, QtGui, QtWidgets\n\nfrom config import resource_path\n",
+        1,
+    )
+
+    class_name = re.search(r"^class (\w+)\(", source, re.MULTILINE).group(1)
+    return source + (
+        "\n\n# Checked against the .ui file at start-up (see ui_forms)\n"
+        f'UI_SHA1 = "{ui_sha1(ui_file)}"\n'
+        f"UI_CLASS = {class_name}\n"
+    )
+
+
+def main():
+    """Generate the modules of all the forms"""
+    for name, module in FORMS.items():
+        output = resource_path(f"{module}.py")
+        with open(output, "w", encoding="utf-8", newline="\n") as py_file:
+            py_file.write(generate(name))
+        print(f"{name}.ui -> {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,747 @@
+# Form implementation generated from reading ui file 'GUI.ui'
+#
+# Created by: PyQt6 UI code generator 6.11.0
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic6 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt6 import QtCore, QtGui, QtWidgets
+
+from config import resource_path
+
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(796, 521)
+        icon = QtGui.QIcon()
+        icon.addPixmap(QtGui.QPixmap(resource_path("ico/logo_SWAT-IAHRIS_dot.png")), QtGui.QIcon.Mode.Normal, QtGui.QIcon.State.Off)
+        MainWindow.setWindowIcon(icon)
+        self.centralwidget = QtWidgets.QWidget(parent=MainWindow)
+        self.centralwidget.setObjectName("centralwidget")
+        self.verticalLayout_2 = QtWidgets.QVBoxLayout(self.centralwidget)
+        self.verticalLayout_2.setContentsMargins(10, -1, 10, 15)
+        self.verticalLayout_2.setObjectName("verticalLayout_2")
+        self.header = QtWidgets.QWidget(parent=self.centralwidget)
+        self.header.setMaximumSize(QtCore.QSize(16777215, 77))
+        self.header.setStyleSheet("")
+        self.header.setObjectName("header")
+        self.horizontalLayout = QtWidgets.QHBoxLayout(self.header)
+        self.horizontalLayout.setContentsMargins(0, 0, 0, 0)
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.verticalLayout_2.addWidget(self.header)
+        self.mainBody = QtWidgets.QWidget(parent=self.centralwidget)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Preferred, QtWidgets.QSizePolicy.Policy.Expanding)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.mainBody.sizePolicy().hasHeightForWidth())
+        self.mainBody.setSizePolicy(sizePolicy)
+        self.mainBody.setObjectName("mainBody")
+        self.verticalLayout_3 = QtWidgets.QVBoxLayout(self.mainBody)
+        self.verticalLayout_3.setContentsMargins(10, 10, 10, 10)
+        self.verticalLayout_3.setSpacing(6)
+        self.verticalLayout_3.setObjectName("verticalLayout_3")
+        self.inputs = QtWidgets.QFrame(parent=self.mainBody)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Expanding)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.inputs.sizePolicy().hasHeightForWidth())
+        self.inputs.setSizePolicy(sizePolicy)
+        self.inputs.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.inputs.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.inputs.setObjectName("inputs")
+        self.verticalLayout = QtWidgets.QVBoxLayout(self.inputs)
+        self.verticalLayout.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout.setSpacing(6)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.natural = QtWidgets.QGroupBox(parent=self.inputs)
+        self.natural.setObjectName("natural")
+        self.verticalLayout_16 = QtWidgets.QVBoxLayout(self.natural)
+        self.verticalLayout_16.setContentsMargins(10, 0, 0, 0)
+        self.verticalLayout_16.setSpacing(0)
+        self.verticalLayout_16.setObjectName("verticalLayout_16")
+        self.path_1 = QtWidgets.QFrame(parent=self.natural)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Preferred, QtWidgets.QSizePolicy.Policy.Preferred)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.path_1.sizePolicy().hasHeightForWidth())
+        self.path_1.setSizePolicy(sizePolicy)
+        self.path_1.setMaximumSize(QtCore.QSize(16777215, 60))
+        self.path_1.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.path_1.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.path_1.setObjectName("path_1")
+        self.horizontalLayout_22 = QtWidgets.QHBoxLayout(self.path_1)
+        self.horizontalLayout_22.setContentsMargins(0, 0, 0, 0)
+        self.horizontalLayout_22.setSpacing(10)
+        self.horizontalLayout_22.setObjectName("horizontalLayout_22")
+        self.label_20 = QtWidgets.QLabel(parent=self.path_1)
+        font = QtGui.QFont()
+        font.setFamily("Arial Black")
+        font.setPointSize(12)
+        font.setBold(True)
+        self.label_20.setFont(font)
+        self.label_20.setTextFormat(QtCore.Qt.TextFormat.RichText)
+        self.label_20.setScaledContents(True)
+        self.label_20.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self.label_20.setObjectName("label_20")
+        self.horizontalLayout_22.addWidget(self.label_20)
+        self.lineEdit_nat = QtWidgets.QLineEdit(parent=self.path_1)
+        self.lineEdit_nat.setReadOnly(True)
+        self.lineEdit_nat.setObjectName("lineEdit_nat")
+        self.horizontalLayout_22.addWidget(self.lineEdit_nat)
+        self.pushButton_nat = QtWidgets.QPushButton(parent=self.path_1)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(12)
+        font.setBold(True)
+        self.pushButton_nat.setFont(font)
+        self.pushButton_nat.setObjectName("pushButton_nat")
+        self.horizontalLayout_22.addWidget(self.pushButton_nat)
+        self.verticalLayout_16.addWidget(self.path_1)
+        self.options_1 = QtWidgets.QFrame(parent=self.natural)
+        self.options_1.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.options_1.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.options_1.setObjectName("options_1")
+        self.horizontalLayout_23 = QtWidgets.QHBoxLayout(self.options_1)
+        self.horizontalLayout_23.setContentsMargins(0, 0, 0, 0)
+        self.horizontalLayout_23.setSpacing(10)
+        self.horizontalLayout_23.setObjectName("horizontalLayout_23")
+        self.csv_1 = QtWidgets.QFrame(parent=self.options_1)
+        self.csv_1.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.csv_1.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.csv_1.setObjectName("csv_1")
+        self.verticalLayout_45 = QtWidgets.QVBoxLayout(self.csv_1)
+        self.verticalLayout_45.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_45.setSpacing(10)
+        self.verticalLayout_45.setObjectName("verticalLayout_45")
+        self.radioButton_swat_nat = QtWidgets.QRadioButton(parent=self.csv_1)
+        self.radioButton_swat_nat.setChecked(True)
+        self.radioButton_swat_nat.setObjectName("radioButton_swat_nat")
+        self.buttonGroup = QtWidgets.QButtonGroup(MainWindow)
+        self.buttonGroup.setObjectName("buttonGroup")
+        self.buttonGroup.addButton(self.radioButton_swat_nat)
+        self.verticalLayout_45.addWidget(self.radioButton_swat_nat)
+        self.radioButton_csv_nat = QtWidgets.QRadioButton(parent=self.csv_1)
+        self.radioButton_csv_nat.setStyleSheet("")
+        self.radioButton_csv_nat.setObjectName("radioButton_csv_nat")
+        self.buttonGroup.addButton(self.radioButton_csv_nat)
+        self.verticalLayout_45.addWidget(self.radioButton_csv_nat)
+        self.horizontalLayout_23.addWidget(self.csv_1, 0, QtCore.Qt.AlignmentFlag.AlignLeft|QtCore.Qt.AlignmentFlag.AlignVCenter)
+        self.choose_1 = QtWidgets.QGroupBox(parent=self.options_1)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Preferred)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.choose_1.sizePolicy().hasHeightForWidth())
+        self.choose_1.setSizePolicy(sizePolicy)
+        self.choose_1.setObjectName("choose_1")
+        self.verticalLayout_17 = QtWidgets.QVBoxLayout(self.choose_1)
+        self.verticalLayout_17.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_17.setSpacing(0)
+        self.verticalLayout_17.setObjectName("verticalLayout_17")
+        self.swatplus_nat = QtWidgets.QFrame(parent=self.choose_1)
+        self.swatplus_nat.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.swatplus_nat.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.swatplus_nat.setObjectName("swatplus_nat")
+        self.horizontalLayout_25 = QtWidgets.QHBoxLayout(self.swatplus_nat)
+        self.horizontalLayout_25.setContentsMargins(0, 0, 0, 0)
+        self.horizontalLayout_25.setSpacing(10)
+        self.horizontalLayout_25.setObjectName("horizontalLayout_25")
+        self.scenarios_1 = QtWidgets.QFrame(parent=self.swatplus_nat)
+        self.scenarios_1.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.scenarios_1.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.scenarios_1.setObjectName("scenarios_1")
+        self.verticalLayout_37 = QtWidgets.QVBoxLayout(self.scenarios_1)
+        self.verticalLayout_37.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_37.setSpacing(0)
+        self.verticalLayout_37.setObjectName("verticalLayout_37")
+        self.text_scenarios_1 = QtWidgets.QFrame(parent=self.scenarios_1)
+        self.text_scenarios_1.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.text_scenarios_1.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.text_scenarios_1.setObjectName("text_scenarios_1")
+        self.verticalLayout_38 = QtWidgets.QVBoxLayout(self.text_scenarios_1)
+        self.verticalLayout_38.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_38.setSpacing(0)
+        self.verticalLayout_38.setObjectName("verticalLayout_38")
+        self.label_21 = QtWidgets.QLabel(parent=self.text_scenarios_1)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(8)
+        font.setBold(True)
+        self.label_21.setFont(font)
+        self.label_21.setTextFormat(QtCore.Qt.TextFormat.RichText)
+        self.label_21.setScaledContents(True)
+        self.label_21.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeading|QtCore.Qt.AlignmentFlag.AlignLeft|QtCore.Qt.AlignmentFlag.AlignVCenter)
+        self.label_21.setObjectName("label_21")
+        self.verticalLayout_38.addWidget(self.label_21, 0, QtCore.Qt.AlignmentFlag.AlignBottom)
+        self.verticalLayout_37.addWidget(self.text_scenarios_1)
+        self.data_scenarios_1 = QtWidgets.QFrame(parent=self.scenarios_1)
+        self.data_scenarios_1.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.data_scenarios_1.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.data_scenarios_1.setObjectName("data_scenarios_1")
+        self.verticalLayout_39 = QtWidgets.QVBoxLayout(self.data_scenarios_1)
+        self.verticalLayout_39.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_39.setSpacing(0)
+        self.verticalLayout_39.setObjectName("verticalLayout_39")
+        self.comboBox_scenario_nat = QtWidgets.QComboBox(parent=self.data_scenarios_1)
+        self.comboBox_scenario_nat.setObjectName("comboBox_scenario_nat")
+        self.verticalLayout_39.addWidget(self.comboBox_scenario_nat)
+        self.verticalLayout_37.addWidget(self.data_scenarios_1, 0, QtCore.Qt.AlignmentFlag.AlignTop)
+        self.horizontalLayout_25.addWidget(self.scenarios_1)
+        self.channels_1 = QtWidgets.QFrame(parent=self.swatplus_nat)
+        self.channels_1.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.channels_1.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.channels_1.setObjectName("channels_1")
+        self.verticalLayout_40 = QtWidgets.QVBoxLayout(self.channels_1)
+        self.verticalLayout_40.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_40.setSpacing(0)
+        self.verticalLayout_40.setObjectName("verticalLayout_40")
+        self.text_channel_1 = QtWidgets.QFrame(parent=self.channels_1)
+        self.text_channel_1.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.text_channel_1.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.text_channel_1.setObjectName("text_channel_1")
+        self.verticalLayout_41 = QtWidgets.QVBoxLayout(self.text_channel_1)
+        self.verticalLayout_41.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_41.setSpacing(0)
+        self.verticalLayout_41.setObjectName("verticalLayout_41")
+        self.label_22 = QtWidgets.QLabel(parent=self.text_channel_1)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(8)
+        font.setBold(True)
+        self.label_22.setFont(font)
+        self.label_22.setTextFormat(QtCore.Qt.TextFormat.RichText)
+        self.label_22.setScaledContents(True)
+        self.label_22.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeading|QtCore.Qt.AlignmentFlag.AlignLeft|QtCore.Qt.AlignmentFlag.AlignVCenter)
+        self.label_22.setObjectName("label_22")
+        self.verticalLayout_41.addWidget(self.label_22, 0, QtCore.Qt.AlignmentFlag.AlignBottom)
+        self.verticalLayout_40.addWidget(self.text_channel_1)
+        self.data_channel_1 = QtWidgets.QFrame(parent=self.channels_1)
+        self.data_channel_1.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.data_channel_1.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.data_channel_1.setObjectName("data_channel_1")
+        self.verticalLayout_42 = QtWidgets.QVBoxLayout(self.data_channel_1)
+        self.verticalLayout_42.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_42.setSpacing(0)
+        self.verticalLayout_42.setObjectName("verticalLayout_42")
+        self.comboBox_channel_nat = QtWidgets.QComboBox(parent=self.data_channel_1)
+        self.comboBox_channel_nat.setObjectName("comboBox_channel_nat")
+        self.verticalLayout_42.addWidget(self.comboBox_channel_nat)
+        self.verticalLayout_40.addWidget(self.data_channel_1, 0, QtCore.Qt.AlignmentFlag.AlignTop)
+        self.horizontalLayout_25.addWidget(self.channels_1)
+        self.verticalLayout_17.addWidget(self.swatplus_nat)
+        self.period_1 = QtWidgets.QFrame(parent=self.choose_1)
+        self.period_1.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.period_1.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.period_1.setObjectName("period_1")
+        self.horizontalLayout_26 = QtWidgets.QHBoxLayout(self.period_1)
+        self.horizontalLayout_26.setContentsMargins(0, 0, 0, 0)
+        self.horizontalLayout_26.setSpacing(0)
+        self.horizontalLayout_26.setObjectName("horizontalLayout_26")
+        self.year_1 = QtWidgets.QFrame(parent=self.period_1)
+        self.year_1.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.year_1.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.year_1.setObjectName("year_1")
+        self.verticalLayout_18 = QtWidgets.QVBoxLayout(self.year_1)
+        self.verticalLayout_18.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_18.setSpacing(0)
+        self.verticalLayout_18.setObjectName("verticalLayout_18")
+        self.text_period_1 = QtWidgets.QFrame(parent=self.year_1)
+        self.text_period_1.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.text_period_1.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.text_period_1.setObjectName("text_period_1")
+        self.verticalLayout_43 = QtWidgets.QVBoxLayout(self.text_period_1)
+        self.verticalLayout_43.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_43.setSpacing(0)
+        self.verticalLayout_43.setObjectName("verticalLayout_43")
+        self.label_23 = QtWidgets.QLabel(parent=self.text_period_1)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(8)
+        font.setBold(True)
+        self.label_23.setFont(font)
+        self.label_23.setTextFormat(QtCore.Qt.TextFormat.RichText)
+        self.label_23.setScaledContents(True)
+        self.label_23.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeading|QtCore.Qt.AlignmentFlag.AlignLeft|QtCore.Qt.AlignmentFlag.AlignVCenter)
+        self.label_23.setObjectName("label_23")
+        self.verticalLayout_43.addWidget(self.label_23, 0, QtCore.Qt.AlignmentFlag.AlignBottom)
+        self.verticalLayout_18.addWidget(self.text_period_1)
+        self.data_period_1 = QtWidgets.QFrame(parent=self.year_1)
+        self.data_period_1.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.data_period_1.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.data_period_1.setObjectName("data_period_1")
+        self.horizontalLayout_27 = QtWidgets.QHBoxLayout(self.data_period_1)
+        self.horizontalLayout_27.setContentsMargins(0, 0, 0, 0)
+        self.horizontalLayout_27.setSpacing(10)
+        self.horizontalLayout_27.setObjectName("horizontalLayout_27")
+        self.label_24 = QtWidgets.QLabel(parent=self.data_period_1)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(8)
+        font.setBold(False)
+        self.label_24.setFont(font)
+        self.label_24.setTextFormat(QtCore.Qt.TextFormat.RichText)
+        self.label_24.setScaledContents(True)
+        self.label_24.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeading|QtCore.Qt.AlignmentFlag.AlignLeft|QtCore.Qt.AlignmentFlag.AlignVCenter)
+        self.label_24.setObjectName("label_24")
+        self.horizontalLayout_27.addWidget(self.label_24)
+        self.DateEdit_start_year_nat = QtWidgets.QDateEdit(parent=self.data_period_1)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.MinimumExpanding, QtWidgets.QSizePolicy.Policy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.DateEdit_start_year_nat.sizePolicy().hasHeightForWidth())
+        self.DateEdit_start_year_nat.setSizePolicy(sizePolicy)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(8)
+        font.setBold(True)
+        self.DateEdit_start_year_nat.setFont(font)
+        self.DateEdit_start_year_nat.setFrame(False)
+        self.DateEdit_start_year_nat.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self.DateEdit_start_year_nat.setCalendarPopup(False)
+        self.DateEdit_start_year_nat.setObjectName("DateEdit_start_year_nat")
+        self.horizontalLayout_27.addWidget(self.DateEdit_start_year_nat)
+        self.label_25 = QtWidgets.QLabel(parent=self.data_period_1)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(8)
+        font.setBold(False)
+        self.label_25.setFont(font)
+        self.label_25.setTextFormat(QtCore.Qt.TextFormat.RichText)
+        self.label_25.setScaledContents(True)
+        self.label_25.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeading|QtCore.Qt.AlignmentFlag.AlignLeft|QtCore.Qt.AlignmentFlag.AlignVCenter)
+        self.label_25.setObjectName("label_25")
+        self.horizontalLayout_27.addWidget(self.label_25)
+        self.DateEdit_finish_year_nat = QtWidgets.QDateEdit(parent=self.data_period_1)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.MinimumExpanding, QtWidgets.QSizePolicy.Policy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.DateEdit_finish_year_nat.sizePolicy().hasHeightForWidth())
+        self.DateEdit_finish_year_nat.setSizePolicy(sizePolicy)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(8)
+        font.setBold(True)
+        self.DateEdit_finish_year_nat.setFont(font)
+        self.DateEdit_finish_year_nat.setFrame(False)
+        self.DateEdit_finish_year_nat.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self.DateEdit_finish_year_nat.setReadOnly(False)
+        self.DateEdit_finish_year_nat.setDate(QtCore.QDate(2000, 1, 1))
+        self.DateEdit_finish_year_nat.setObjectName("DateEdit_finish_year_nat")
+        self.horizontalLayout_27.addWidget(self.DateEdit_finish_year_nat)
+        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_27.addItem(spacerItem)
+        self.verticalLayout_18.addWidget(self.data_period_1, 0, QtCore.Qt.AlignmentFlag.AlignTop)
+        self.horizontalLayout_26.addWidget(self.year_1)
+        self.empty_1 = QtWidgets.QFrame(parent=self.period_1)
+        self.empty_1.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.empty_1.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.empty_1.setObjectName("empty_1")
+        self.horizontalLayout_26.addWidget(self.empty_1)
+        self.verticalLayout_17.addWidget(self.period_1)
+        self.horizontalLayout_23.addWidget(self.choose_1)
+        self.verticalLayout_16.addWidget(self.options_1)
+        self.verticalLayout.addWidget(self.natural)
+        self.label_3 = QtWidgets.QLabel(parent=self.inputs)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.MinimumExpanding, QtWidgets.QSizePolicy.Policy.Preferred)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.label_3.sizePolicy().hasHeightForWidth())
+        self.label_3.setSizePolicy(sizePolicy)
+        self.label_3.setMaximumSize(QtCore.QSize(16777215, 90))
+        self.label_3.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.WhatsThisCursor))
+        self.label_3.setText("")
+        self.label_3.setPixmap(QtGui.QPixmap(resource_path("ico/SWAT-IAHRIS.png")))
+        self.label_3.setScaledContents(False)
+        self.label_3.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self.label_3.setObjectName("label_3")
+        self.verticalLayout.addWidget(self.label_3)
+        self.altered = QtWidgets.QGroupBox(parent=self.inputs)
+        self.altered.setObjectName("altered")
+        self.verticalLayout_4 = QtWidgets.QVBoxLayout(self.altered)
+        self.verticalLayout_4.setContentsMargins(10, 0, 0, 0)
+        self.verticalLayout_4.setSpacing(6)
+        self.verticalLayout_4.setObjectName("verticalLayout_4")
+        self.path = QtWidgets.QFrame(parent=self.altered)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Preferred, QtWidgets.QSizePolicy.Policy.Preferred)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.path.sizePolicy().hasHeightForWidth())
+        self.path.setSizePolicy(sizePolicy)
+        self.path.setMaximumSize(QtCore.QSize(16777215, 53))
+        self.path.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.path.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.path.setObjectName("path")
+        self.horizontalLayout_4 = QtWidgets.QHBoxLayout(self.path)
+        self.horizontalLayout_4.setContentsMargins(0, 0, 0, 0)
+        self.horizontalLayout_4.setSpacing(10)
+        self.horizontalLayout_4.setObjectName("horizontalLayout_4")
+        self.label_2 = QtWidgets.QLabel(parent=self.path)
+        font = QtGui.QFont()
+        font.setFamily("Arial Black")
+        font.setPointSize(12)
+        font.setBold(True)
+        self.label_2.setFont(font)
+        self.label_2.setTextFormat(QtCore.Qt.TextFormat.RichText)
+        self.label_2.setScaledContents(True)
+        self.label_2.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self.label_2.setObjectName("label_2")
+        self.horizontalLayout_4.addWidget(self.label_2)
+        self.lineEdit_alt = QtWidgets.QLineEdit(parent=self.path)
+        self.lineEdit_alt.setReadOnly(True)
+        self.lineEdit_alt.setObjectName("lineEdit_alt")
+        self.horizontalLayout_4.addWidget(self.lineEdit_alt)
+        self.pushButton_alt = QtWidgets.QPushButton(parent=self.path)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(12)
+        font.setBold(True)
+        self.pushButton_alt.setFont(font)
+        self.pushButton_alt.setObjectName("pushButton_alt")
+        self.horizontalLayout_4.addWidget(self.pushButton_alt)
+        self.verticalLayout_4.addWidget(self.path)
+        self.options = QtWidgets.QFrame(parent=self.altered)
+        self.options.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.options.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.options.setObjectName("options")
+        self.horizontalLayout_5 = QtWidgets.QHBoxLayout(self.options)
+        self.horizontalLayout_5.setContentsMargins(0, 0, 0, 0)
+        self.horizontalLayout_5.setSpacing(10)
+        self.horizontalLayout_5.setObjectName("horizontalLayout_5")
+        self.csv = QtWidgets.QFrame(parent=self.options)
+        self.csv.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.csv.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.csv.setObjectName("csv")
+        self.verticalLayout_44 = QtWidgets.QVBoxLayout(self.csv)
+        self.verticalLayout_44.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_44.setSpacing(10)
+        self.verticalLayout_44.setObjectName("verticalLayout_44")
+        self.radioButton_swat_alt = QtWidgets.QRadioButton(parent=self.csv)
+        self.radioButton_swat_alt.setChecked(True)
+        self.radioButton_swat_alt.setObjectName("radioButton_swat_alt")
+        self.buttonGroup_2 = QtWidgets.QButtonGroup(MainWindow)
+        self.buttonGroup_2.setObjectName("buttonGroup_2")
+        self.buttonGroup_2.addButton(self.radioButton_swat_alt)
+        self.verticalLayout_44.addWidget(self.radioButton_swat_alt)
+        self.radioButton_csv_alt = QtWidgets.QRadioButton(parent=self.csv)
+        self.radioButton_csv_alt.setObjectName("radioButton_csv_alt")
+        self.buttonGroup_2.addButton(self.radioButton_csv_alt)
+        self.verticalLayout_44.addWidget(self.radioButton_csv_alt)
+        self.horizontalLayout_5.addWidget(self.csv, 0, QtCore.Qt.AlignmentFlag.AlignLeft|QtCore.Qt.AlignmentFlag.AlignVCenter)
+        self.choose = QtWidgets.QGroupBox(parent=self.options)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Preferred)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.choose.sizePolicy().hasHeightForWidth())
+        self.choose.setSizePolicy(sizePolicy)
+        self.choose.setObjectName("choose")
+        self.verticalLayout_5 = QtWidgets.QVBoxLayout(self.choose)
+        self.verticalLayout_5.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_5.setSpacing(0)
+        self.verticalLayout_5.setObjectName("verticalLayout_5")
+        self.swatplus_alt = QtWidgets.QFrame(parent=self.choose)
+        self.swatplus_alt.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.swatplus_alt.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.swatplus_alt.setObjectName("swatplus_alt")
+        self.horizontalLayout_9 = QtWidgets.QHBoxLayout(self.swatplus_alt)
+        self.horizontalLayout_9.setContentsMargins(0, 0, 0, 0)
+        self.horizontalLayout_9.setSpacing(10)
+        self.horizontalLayout_9.setObjectName("horizontalLayout_9")
+        self.scenarios = QtWidgets.QFrame(parent=self.swatplus_alt)
+        self.scenarios.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.scenarios.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.scenarios.setObjectName("scenarios")
+        self.verticalLayout_19 = QtWidgets.QVBoxLayout(self.scenarios)
+        self.verticalLayout_19.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_19.setSpacing(0)
+        self.verticalLayout_19.setObjectName("verticalLayout_19")
+        self.text_scenarios = QtWidgets.QFrame(parent=self.scenarios)
+        self.text_scenarios.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.text_scenarios.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.text_scenarios.setObjectName("text_scenarios")
+        self.verticalLayout_20 = QtWidgets.QVBoxLayout(self.text_scenarios)
+        self.verticalLayout_20.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_20.setSpacing(0)
+        self.verticalLayout_20.setObjectName("verticalLayout_20")
+        self.label_8 = QtWidgets.QLabel(parent=self.text_scenarios)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(8)
+        font.setBold(True)
+        self.label_8.setFont(font)
+        self.label_8.setTextFormat(QtCore.Qt.TextFormat.RichText)
+        self.label_8.setScaledContents(True)
+        self.label_8.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeading|QtCore.Qt.AlignmentFlag.AlignLeft|QtCore.Qt.AlignmentFlag.AlignVCenter)
+        self.label_8.setObjectName("label_8")
+        self.verticalLayout_20.addWidget(self.label_8, 0, QtCore.Qt.AlignmentFlag.AlignBottom)
+        self.verticalLayout_19.addWidget(self.text_scenarios)
+        self.data_scenarios = QtWidgets.QFrame(parent=self.scenarios)
+        self.data_scenarios.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.data_scenarios.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.data_scenarios.setObjectName("data_scenarios")
+        self.verticalLayout_21 = QtWidgets.QVBoxLayout(self.data_scenarios)
+        self.verticalLayout_21.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_21.setSpacing(0)
+        self.verticalLayout_21.setObjectName("verticalLayout_21")
+        self.comboBox_scenario_alt = QtWidgets.QComboBox(parent=self.data_scenarios)
+        self.comboBox_scenario_alt.setObjectName("comboBox_scenario_alt")
+        self.verticalLayout_21.addWidget(self.comboBox_scenario_alt)
+        self.verticalLayout_19.addWidget(self.data_scenarios, 0, QtCore.Qt.AlignmentFlag.AlignTop)
+        self.horizontalLayout_9.addWidget(self.scenarios)
+        self.channels = QtWidgets.QFrame(parent=self.swatplus_alt)
+        self.channels.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.channels.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.channels.setObjectName("channels")
+        self.verticalLayout_22 = QtWidgets.QVBoxLayout(self.channels)
+        self.verticalLayout_22.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_22.setSpacing(0)
+        self.verticalLayout_22.setObjectName("verticalLayout_22")
+        self.text_channel = QtWidgets.QFrame(parent=self.channels)
+        self.text_channel.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.text_channel.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.text_channel.setObjectName("text_channel")
+        self.verticalLayout_23 = QtWidgets.QVBoxLayout(self.text_channel)
+        self.verticalLayout_23.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_23.setSpacing(0)
+        self.verticalLayout_23.setObjectName("verticalLayout_23")
+        self.label_9 = QtWidgets.QLabel(parent=self.text_channel)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(8)
+        font.setBold(True)
+        self.label_9.setFont(font)
+        self.label_9.setTextFormat(QtCore.Qt.TextFormat.RichText)
+        self.label_9.setScaledContents(True)
+        self.label_9.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeading|QtCore.Qt.AlignmentFlag.AlignLeft|QtCore.Qt.AlignmentFlag.AlignVCenter)
+        self.label_9.setObjectName("label_9")
+        self.verticalLayout_23.addWidget(self.label_9, 0, QtCore.Qt.AlignmentFlag.AlignBottom)
+        self.verticalLayout_22.addWidget(self.text_channel)
+        self.data_channel = QtWidgets.QFrame(parent=self.channels)
+        self.data_channel.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.data_channel.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.data_channel.setObjectName("data_channel")
+        self.verticalLayout_24 = QtWidgets.QVBoxLayout(self.data_channel)
+        self.verticalLayout_24.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_24.setSpacing(0)
+        self.verticalLayout_24.setObjectName("verticalLayout_24")
+        self.comboBox_channel_alt = QtWidgets.QComboBox(parent=self.data_channel)
+        self.comboBox_channel_alt.setObjectName("comboBox_channel_alt")
+        self.verticalLayout_24.addWidget(self.comboBox_channel_alt)
+        self.verticalLayout_22.addWidget(self.data_channel, 0, QtCore.Qt.AlignmentFlag.AlignTop)
+        self.horizontalLayout_9.addWidget(self.channels)
+        self.verticalLayout_5.addWidget(self.swatplus_alt)
+        self.period = QtWidgets.QFrame(parent=self.choose)
+        self.period.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.period.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.period.setObjectName("period")
+        self.horizontalLayout_7 = QtWidgets.QHBoxLayout(self.period)
+        self.horizontalLayout_7.setContentsMargins(0, 0, 0, 0)
+        self.horizontalLayout_7.setSpacing(0)
+        self.horizontalLayout_7.setObjectName("horizontalLayout_7")
+        self.year = QtWidgets.QFrame(parent=self.period)
+        self.year.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.year.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.year.setObjectName("year")
+        self.verticalLayout_6 = QtWidgets.QVBoxLayout(self.year)
+        self.verticalLayout_6.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_6.setSpacing(0)
+        self.verticalLayout_6.setObjectName("verticalLayout_6")
+        self.text_period = QtWidgets.QFrame(parent=self.year)
+        self.text_period.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.text_period.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.text_period.setObjectName("text_period")
+        self.verticalLayout_8 = QtWidgets.QVBoxLayout(self.text_period)
+        self.verticalLayout_8.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_8.setSpacing(0)
+        self.verticalLayout_8.setObjectName("verticalLayout_8")
+        self.label_4 = QtWidgets.QLabel(parent=self.text_period)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(8)
+        font.setBold(True)
+        self.label_4.setFont(font)
+        self.label_4.setTextFormat(QtCore.Qt.TextFormat.RichText)
+        self.label_4.setScaledContents(True)
+        self.label_4.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeading|QtCore.Qt.AlignmentFlag.AlignLeft|QtCore.Qt.AlignmentFlag.AlignVCenter)
+        self.label_4.setObjectName("label_4")
+        self.verticalLayout_8.addWidget(self.label_4, 0, QtCore.Qt.AlignmentFlag.AlignBottom)
+        self.verticalLayout_6.addWidget(self.text_period)
+        self.data_period = QtWidgets.QFrame(parent=self.year)
+        self.data_period.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.data_period.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.data_period.setObjectName("data_period")
+        self.horizontalLayout_8 = QtWidgets.QHBoxLayout(self.data_period)
+        self.horizontalLayout_8.setContentsMargins(0, 0, 0, 0)
+        self.horizontalLayout_8.setSpacing(10)
+        self.horizontalLayout_8.setObjectName("horizontalLayout_8")
+        self.label_11 = QtWidgets.QLabel(parent=self.data_period)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(8)
+        font.setBold(False)
+        self.label_11.setFont(font)
+        self.label_11.setTextFormat(QtCore.Qt.TextFormat.RichText)
+        self.label_11.setScaledContents(True)
+        self.label_11.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeading|QtCore.Qt.AlignmentFlag.AlignLeft|QtCore.Qt.AlignmentFlag.AlignVCenter)
+        self.label_11.setObjectName("label_11")
+        self.horizontalLayout_8.addWidget(self.label_11)
+        self.DateEdit_start_year_alt = QtWidgets.QDateEdit(parent=self.data_period)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.MinimumExpanding, QtWidgets.QSizePolicy.Policy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.DateEdit_start_year_alt.sizePolicy().hasHeightForWidth())
+        self.DateEdit_start_year_alt.setSizePolicy(sizePolicy)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(8)
+        font.setBold(True)
+        self.DateEdit_start_year_alt.setFont(font)
+        self.DateEdit_start_year_alt.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self.DateEdit_start_year_alt.setObjectName("DateEdit_start_year_alt")
+        self.horizontalLayout_8.addWidget(self.DateEdit_start_year_alt)
+        self.label_12 = QtWidgets.QLabel(parent=self.data_period)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(8)
+        font.setBold(False)
+        self.label_12.setFont(font)
+        self.label_12.setTextFormat(QtCore.Qt.TextFormat.RichText)
+        self.label_12.setScaledContents(True)
+        self.label_12.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeading|QtCore.Qt.AlignmentFlag.AlignLeft|QtCore.Qt.AlignmentFlag.AlignVCenter)
+        self.label_12.setObjectName("label_12")
+        self.horizontalLayout_8.addWidget(self.label_12)
+        self.DateEdit_finish_year_alt = QtWidgets.QDateEdit(parent=self.data_period)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.MinimumExpanding, QtWidgets.QSizePolicy.Policy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.DateEdit_finish_year_alt.sizePolicy().hasHeightForWidth())
+        self.DateEdit_finish_year_alt.setSizePolicy(sizePolicy)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(8)
+        font.setBold(True)
+        self.DateEdit_finish_year_alt.setFont(font)
+        self.DateEdit_finish_year_alt.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self.DateEdit_finish_year_alt.setCurrentSection(QtWidgets.QDateTimeEdit.Section.YearSection)
+        self.DateEdit_finish_year_alt.setObjectName("DateEdit_finish_year_alt")
+        self.horizontalLayout_8.addWidget(self.DateEdit_finish_year_alt)
+        spacerItem1 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_8.addItem(spacerItem1)
+        self.verticalLayout_6.addWidget(self.data_period, 0, QtCore.Qt.AlignmentFlag.AlignTop)
+        self.horizontalLayout_7.addWidget(self.year)
+        self.empty = QtWidgets.QFrame(parent=self.period)
+        self.empty.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.empty.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.empty.setObjectName("empty")
+        self.horizontalLayout_7.addWidget(self.empty)
+        self.verticalLayout_5.addWidget(self.period)
+        self.horizontalLayout_5.addWidget(self.choose)
+        self.verticalLayout_4.addWidget(self.options)
+        self.verticalLayout.addWidget(self.altered)
+        self.verticalLayout_3.addWidget(self.inputs)
+        self.reports = QtWidgets.QFrame(parent=self.mainBody)
+        self.reports.setFrameShape(QtWidgets.QFrame.Shape.StyledPanel)
+        self.reports.setFrameShadow(QtWidgets.QFrame.Shadow.Raised)
+        self.reports.setObjectName("reports")
+        self.horizontalLayout_3 = QtWidgets.QHBoxLayout(self.reports)
+        self.horizontalLayout_3.setContentsMargins(0, 0, 0, 0)
+        self.horizontalLayout_3.setSpacing(6)
+        self.horizontalLayout_3.setObjectName("horizontalLayout_3")
+        spacerItem2 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_3.addItem(spacerItem2)
+        self.pushButton_reports = QtWidgets.QPushButton(parent=self.reports)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Preferred)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.pushButton_reports.sizePolicy().hasHeightForWidth())
+        self.pushButton_reports.setSizePolicy(sizePolicy)
+        self.pushButton_reports.setMinimumSize(QtCore.QSize(0, 90))
+        self.pushButton_reports.setMaximumSize(QtCore.QSize(500, 90))
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(20)
+        font.setBold(True)
+        self.pushButton_reports.setFont(font)
+        self.pushButton_reports.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
+        icon1 = QtGui.QIcon()
+        icon1.addPixmap(QtGui.QPixmap(resource_path("ico/report4.png")), QtGui.QIcon.Mode.Normal, QtGui.QIcon.State.Off)
+        self.pushButton_reports.setIcon(icon1)
+        self.pushButton_reports.setIconSize(QtCore.QSize(300, 300))
+        self.pushButton_reports.setObjectName("pushButton_reports")
+        self.horizontalLayout_3.addWidget(self.pushButton_reports)
+        spacerItem3 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_3.addItem(spacerItem3)
+        self.verticalLayout_3.addWidget(self.reports)
+        self.verticalLayout_2.addWidget(self.mainBody)
+        self.progress = QtWidgets.QFrame(parent=self.centralwidget)
+        self.progress.setObjectName("progress")
+        self.horizontalLayout_progress = QtWidgets.QHBoxLayout(self.progress)
+        self.horizontalLayout_progress.setContentsMargins(0, 0, 0, 0)
+        self.horizontalLayout_progress.setObjectName("horizontalLayout_progress")
+        self.progressBar = QtWidgets.QProgressBar(parent=self.progress)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(10)
+        font.setBold(True)
+        self.progressBar.setFont(font)
+        self.progressBar.setStyleSheet("QProgressBar {\n"
+"    background-color: rgb(195, 195, 195);\n"
+"    color: rgb(0, 0, 0);\n"
+"    border-style: solid;\n"
+"}\n"
+"\n"
+"QProgressBar::chunk {\n"
+"    background-color: rgb(111, 156, 200);\n"
+"\n"
+"}")
+        self.progressBar.setProperty("value", 0)
+        self.progressBar.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self.progressBar.setInvertedAppearance(False)
+        self.progressBar.setObjectName("progressBar")
+        self.horizontalLayout_progress.addWidget(self.progressBar)
+        self.pushButton_cancel = QtWidgets.QPushButton(parent=self.progress)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(10)
+        font.setBold(True)
+        self.pushButton_cancel.setFont(font)
+        self.pushButton_cancel.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
+        self.pushButton_cancel.setObjectName("pushButton_cancel")
+        self.horizontalLayout_progress.addWidget(self.pushButton_cancel)
+        self.verticalLayout_2.addWidget(self.progress)
+        MainWindow.setCentralWidget(self.centralwidget)
+
+        self.retranslateUi(MainWindow)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def retranslateUi(self, MainWindow):
+        _translate = QtCore.QCoreApplication.translate
+        MainWindow.setWindowTitle(_translate("MainWindow", "SWATPlus-IAHRIS"))
+        self.label_20.setText(_translate("MainWindow", "NATURAL FLOW:"))
+        self.pushButton_nat.setText(_translate("MainWindow", "..."))
+        self.radioButton_swat_nat.setText(_translate("MainWindow", "Use SWAT+ output"))
+        self.radioButton_csv_nat.setText(_translate("MainWindow", "Use CSV file"))
+        self.label_21.setText(_translate("MainWindow", "Choose SWAT+ Scenario:"))
+        self.label_22.setText(_translate("MainWindow", "Choose Channel Unit:"))
+        self.label_23.setText(_translate("MainWindow", "Choose Period:"))
+        self.label_24.setText(_translate("MainWindow", "Start year"))
+        self.DateEdit_start_year_nat.setDisplayFormat(_translate("MainWindow", "yyyy"))
+        self.label_25.setText(_translate("MainWindow", "Finish year"))
+        self.DateEdit_finish_year_nat.setDisplayFormat(_translate("MainWindow", "yyyy"))
+        self.label_2.setText(_translate("MainWindow", "ALTERED FLOW:"))
+        self.pushButton_alt.setText(_translate("MainWindow", "..."))
+        self.radioButton_swat_alt.setText(_translate("MainWindow", "Use SWAT+ output"))
+        self.radioButton_csv_alt.setText(_translate("MainWindow", "Use CSV file"))
+        self.label_8.setText(_translate("MainWindow", "Choose SWAT+ Scenario:"))
+        self.label_9.setText(_translate("MainWindow", "Choose Channel Unit:"))
+        self.label_4.setText(_translate("MainWindow", "Choose Period:"))
+        self.label_11.setText(_translate("MainWindow", "Start year"))
+        self.DateEdit_start_year_alt.setDisplayFormat(_translate("MainWindow", "yyyy"))
+        self.label_12.setText(_translate("MainWindow", "Finish year"))
+        self.DateEdit_finish_year_alt.setDisplayFormat(_translate("MainWindow", "yyyy"))
+        self.pushButton_cancel.setText(_translate("MainWindow", "Cancel"))
+
+
+# Checked against the .ui file at start-up (see ui_forms)
+UI_SHA1 = "9f55f29f90a819cab589473d0f7134247c620d10"
+UI_CLASS = Ui_MainWindow
@@ -0,0 +1,298 @@
+# Form implementation generated from reading ui file 'reports.ui'
+#
+# Created by: PyQt6 UI code generator 6.11.0
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic6 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt6 import QtCore, QtGui, QtWidgets
+
+from config import resource_path
+
+
+class Ui_ReportsWindow(object):
+    def setupUi(self, ReportsWindow):
+        ReportsWindow.setObjectName("ReportsWindow")
+        ReportsWindow.resize(599, 438)
+        icon = QtGui.QIcon()
+        icon.addPixmap(QtGui.QPixmap(resource_path("ico/logo_SWAT-IAHRIS_dot.png")), QtGui.QIcon.Mode.Normal, QtGui.QIcon.State.Off)
+        ReportsWindow.setWindowIcon(icon)
+        self.centralwidget = QtWidgets.QWidget(parent=ReportsWindow)
+        font = QtGui.QFont()
+        font.setPointSize(20)
+        self.centralwidget.setFont(font)
+        self.centralwidget.setObjectName("centralwidget")
+        self.horizontalLayout = QtWidgets.QHBoxLayout(self.centralwidget)
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout.addItem(spacerItem)
+        self.verticalLayout = QtWidgets.QVBoxLayout()
+        self.verticalLayout.setContentsMargins(-1, 5, -1, 5)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.horizontalLayout_3 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_3.setContentsMargins(5, 5, 5, 5)
+        self.horizontalLayout_3.setSpacing(0)
+        self.horizontalLayout_3.setObjectName("horizontalLayout_3")
+        spacerItem1 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_3.addItem(spacerItem1)
+        self.label_3 = QtWidgets.QLabel(parent=self.centralwidget)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(14)
+        font.setUnderline(True)
+        self.label_3.setFont(font)
+        self.label_3.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight|QtCore.Qt.AlignmentFlag.AlignTrailing|QtCore.Qt.AlignmentFlag.AlignVCenter)
+        self.label_3.setObjectName("label_3")
+        self.horizontalLayout_3.addWidget(self.label_3)
+        self.label = QtWidgets.QLabel(parent=self.centralwidget)
+        self.label.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.WhatsThisCursor))
+        self.label.setPixmap(QtGui.QPixmap(resource_path("ico/SWAT-IAHRIS_report.png")))
+        self.label.setScaledContents(True)
+        self.label.setAlignment(QtCore.Qt.AlignmentFlag.AlignHCenter|QtCore.Qt.AlignmentFlag.AlignTop)
+        self.label.setWordWrap(False)
+        self.label.setTextInteractionFlags(QtCore.Qt.TextInteractionFlag.NoTextInteraction)
+        self.label.setObjectName("label")
+        self.horizontalLayout_3.addWidget(self.label)
+        self.label_2 = QtWidgets.QLabel(parent=self.centralwidget)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(14)
+        font.setUnderline(True)
+        self.label_2.setFont(font)
+        self.label_2.setObjectName("label_2")
+        self.horizontalLayout_3.addWidget(self.label_2)
+        spacerItem2 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_3.addItem(spacerItem2)
+        self.verticalLayout.addLayout(self.horizontalLayout_3)
+        self.horizontalGroupBox = QtWidgets.QGroupBox(parent=self.centralwidget)
+        self.horizontalGroupBox.setObjectName("horizontalGroupBox")
+        self.horizontalLayout_4 = QtWidgets.QHBoxLayout(self.horizontalGroupBox)
+        self.horizontalLayout_4.setObjectName("horizontalLayout_4")
+        spacerItem3 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_4.addItem(spacerItem3)
+        self.groupBox = QtWidgets.QGroupBox(parent=self.horizontalGroupBox)
+        font = QtGui.QFont()
+        font.setPointSize(20)
+        font.setBold(True)
+        self.groupBox.setFont(font)
+        self.groupBox.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self.groupBox.setObjectName("groupBox")
+        self.verticalLayout_2 = QtWidgets.QVBoxLayout(self.groupBox)
+        self.verticalLayout_2.setObjectName("verticalLayout_2")
+        spacerItem4 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Policy.Minimum, QtWidgets.QSizePolicy.Policy.Expanding)
+        self.verticalLayout_2.addItem(spacerItem4)
+        self.checkBox_nat = QtWidgets.QCheckBox(parent=self.groupBox)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(12)
+        font.setBold(True)
+        self.checkBox_nat.setFont(font)
+        self.checkBox_nat.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
+        self.checkBox_nat.setLayoutDirection(QtCore.Qt.LayoutDirection.LeftToRight)
+        self.checkBox_nat.setChecked(True)
+        self.checkBox_nat.setObjectName("checkBox_nat")
+        self.verticalLayout_2.addWidget(self.checkBox_nat)
+        self.checkBox_alt = QtWidgets.QCheckBox(parent=self.groupBox)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(12)
+        font.setBold(True)
+        self.checkBox_alt.setFont(font)
+        self.checkBox_alt.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
+        self.checkBox_alt.setLayoutDirection(QtCore.Qt.LayoutDirection.LeftToRight)
+        self.checkBox_alt.setChecked(True)
+        self.checkBox_alt.setObjectName("checkBox_alt")
+        self.verticalLayout_2.addWidget(self.checkBox_alt)
+        self.checkBox_nat_alt = QtWidgets.QCheckBox(parent=self.groupBox)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(12)
+        font.setBold(True)
+        self.checkBox_nat_alt.setFont(font)
+        self.checkBox_nat_alt.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
+        self.checkBox_nat_alt.setChecked(True)
+        self.checkBox_nat_alt.setObjectName("checkBox_nat_alt")
+        self.verticalLayout_2.addWidget(self.checkBox_nat_alt)
+        self.checkBox_curves = QtWidgets.QCheckBox(parent=self.groupBox)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(12)
+        font.setBold(True)
+        self.checkBox_curves.setFont(font)
+        self.checkBox_curves.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
+        self.checkBox_curves.setChecked(True)
+        self.checkBox_curves.setObjectName("checkBox_curves")
+        self.verticalLayout_2.addWidget(self.checkBox_curves)
+        self.checkBox_habitual = QtWidgets.QCheckBox(parent=self.groupBox)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(12)
+        font.setBold(True)
+        self.checkBox_habitual.setFont(font)
+        self.checkBox_habitual.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
+        self.checkBox_habitual.setChecked(True)
+        self.checkBox_habitual.setObjectName("checkBox_habitual")
+        self.verticalLayout_2.addWidget(self.checkBox_habitual)
+        self.checkBox_floods = QtWidgets.QCheckBox(parent=self.groupBox)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(12)
+        font.setBold(True)
+        self.checkBox_floods.setFont(font)
+        self.checkBox_floods.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
+        self.checkBox_floods.setChecked(True)
+        self.checkBox_floods.setObjectName("checkBox_floods")
+        self.verticalLayout_2.addWidget(self.checkBox_floods)
+        self.checkBox_sign = QtWidgets.QCheckBox(parent=self.groupBox)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(12)
+        font.setBold(True)
+        font.setStyleStrategy(QtGui.QFont.StyleStrategy.PreferDefault)
+        self.checkBox_sign.setFont(font)
+        self.checkBox_sign.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
+        self.checkBox_sign.setIconSize(QtCore.QSize(24, 24))
+        self.checkBox_sign.setChecked(True)
+        self.checkBox_sign.setTristate(False)
+        self.checkBox_sign.setObjectName("checkBox_sign")
+        self.verticalLayout_2.addWidget(self.checkBox_sign)
+        spacerItem5 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Policy.Minimum, QtWidgets.QSizePolicy.Policy.Expanding)
+        self.verticalLayout_2.addItem(spacerItem5)
+        self.horizontalLayout_4.addWidget(self.groupBox)
+        self.verticalLayout_3 = QtWidgets.QVBoxLayout()
+        self.verticalLayout_3.setContentsMargins(10, 10, 10, 10)
+        self.verticalLayout_3.setSpacing(10)
+        self.verticalLayout_3.setObjectName("verticalLayout_3")
+        self.label_nat = QtWidgets.QLabel(parent=self.horizontalGroupBox)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(12)
+        font.setBold(True)
+        self.label_nat.setFont(font)
+        self.label_nat.setObjectName("label_nat")
+        self.verticalLayout_3.addWidget(self.label_nat)
+        self.label_alt = QtWidgets.QLabel(parent=self.horizontalGroupBox)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(12)
+        font.setBold(True)
+        self.label_alt.setFont(font)
+        self.label_alt.setObjectName("label_alt")
+        self.verticalLayout_3.addWidget(self.label_alt)
+        self.label_nat_alt = QtWidgets.QLabel(parent=self.horizontalGroupBox)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(12)
+        font.setBold(True)
+        self.label_nat_alt.setFont(font)
+        self.label_nat_alt.setObjectName("label_nat_alt")
+        self.verticalLayout_3.addWidget(self.label_nat_alt)
+        self.label_curves = QtWidgets.QLabel(parent=self.horizontalGroupBox)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(12)
+        font.setBold(True)
+        self.label_curves.setFont(font)
+        self.label_curves.setObjectName("label_curves")
+        self.verticalLayout_3.addWidget(self.label_curves)
+        self.label_habitual = QtWidgets.QLabel(parent=self.horizontalGroupBox)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(12)
+        font.setBold(True)
+        self.label_habitual.setFont(font)
+        self.label_habitual.setObjectName("label_habitual")
+        self.verticalLayout_3.addWidget(self.label_habitual)
+        self.label_floods = QtWidgets.QLabel(parent=self.horizontalGroupBox)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(12)
+        font.setBold(True)
+        self.label_floods.setFont(font)
+        self.label_floods.setObjectName("label_floods")
+        self.verticalLayout_3.addWidget(self.label_floods)
+        self.label_sign = QtWidgets.QLabel(parent=self.horizontalGroupBox)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(12)
+        font.setBold(True)
+        self.label_sign.setFont(font)
+        self.label_sign.setObjectName("label_sign")
+        self.verticalLayout_3.addWidget(self.label_sign)
+        self.horizontalLayout_4.addLayout(self.verticalLayout_3)
+        spacerItem6 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_4.addItem(spacerItem6)
+        self.verticalLayout.addWidget(self.horizontalGroupBox)
+        self.horizontalLayout_2 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_2.setContentsMargins(-1, 5, -1, 5)
+        self.horizontalLayout_2.setObjectName("horizontalLayout_2")
+        spacerItem7 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_2.addItem(spacerItem7)
+        self.pushButton_print = QtWidgets.QPushButton(parent=self.centralwidget)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Preferred, QtWidgets.QSizePolicy.Policy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.pushButton_print.sizePolicy().hasHeightForWidth())
+        self.pushButton_print.setSizePolicy(sizePolicy)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(20)
+        font.setBold(True)
+        self.pushButton_print.setFont(font)
+        self.pushButton_print.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
+        self.pushButton_print.setLayoutDirection(QtCore.Qt.LayoutDirection.LeftToRight)
+        icon1 = QtGui.QIcon()
+        icon1.addPixmap(QtGui.QPixmap(resource_path("ico/print2.png")), QtGui.QIcon.Mode.Normal, QtGui.QIcon.State.Off)
+        self.pushButton_print.setIcon(icon1)
+        self.pushButton_print.setIconSize(QtCore.QSize(60, 60))
+        self.pushButton_print.setObjectName("pushButton_print")
+        self.horizontalLayout_2.addWidget(self.pushButton_print)
+        spacerItem8 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout_2.addItem(spacerItem8)
+        self.verticalLayout.addLayout(self.horizontalLayout_2)
+        self.progressBar = QtWidgets.QProgressBar(parent=self.centralwidget)
+        font = QtGui.QFont()
+        font.setPointSize(9)
+        font.setBold(True)
+        self.progressBar.setFont(font)
+        self.progressBar.setStyleSheet("QProgressBar {\n"
+"    background-color: rgb(195, 195, 195);\n"
+"    color: rgb(0, 0, 0);\n"
+"    border-style: solid;\n"
+"}\n"
+"\n"
+"QProgressBar::chunk {\n"
+"    background-color: rgb(111, 156, 200);\n"
+"\n"
+"}")
+        self.progressBar.setProperty("value", 0)
+        self.progressBar.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self.progressBar.setObjectName("progressBar")
+        self.verticalLayout.addWidget(self.progressBar)
+        self.horizontalLayout.addLayout(self.verticalLayout)
+        spacerItem9 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.horizontalLayout.addItem(spacerItem9)
+        ReportsWindow.setCentralWidget(self.centralwidget)
+
+        self.retranslateUi(ReportsWindow)
+        QtCore.QMetaObject.connectSlotsByName(ReportsWindow)
+
+    def retranslateUi(self, ReportsWindow):
+        _translate = QtCore.QCoreApplication.translate
+        ReportsWindow.setWindowTitle(_translate("ReportsWindow", "SWATPlus-IAHRIS Reports"))
+        self.label_3.setText(_translate("ReportsWindow", "Select the "))
+        self.label_2.setText(_translate("ReportsWindow", " reports to print:"))
+        self.checkBox_nat.setText(_translate("ReportsWindow", " NATURAL FLOW CHARACTERIZATION"))
+        self.checkBox_alt.setText(_translate("ReportsWindow", " ALTERED FLOW CHARACTERIZATION"))
+        self.checkBox_nat_alt.setText(_translate("ReportsWindow", " NATURAL AND ALTERED FLOW COMPARISON"))
+        self.checkBox_curves.setText(_translate("ReportsWindow", " FLOW RATES DURATION CURVES"))
+        self.checkBox_habitual.setText(_translate("ReportsWindow", " IHA: HABITUAL VALUES"))
+        self.checkBox_floods.setText(_translate("ReportsWindow", " IHA: FLOODS AND DROUGHTS"))
+        self.checkBox_sign.setText(_translate("ReportsWindow", " ENVIRONMENTAL SIGNIFICANCE OF IHA"))
+        self.pushButton_print.setText(_translate("ReportsWindow", " Print "))
+
+
+# Checked against the .ui file at start-up (see ui_forms)
+UI_SHA1 = "79e4f0afb3e11d2c6c10de6f1e0ad8e873d9bf07"
+UI_CLASS = Ui_ReportsWindow
@@ -0,0 +1,537 @@
+"""
+/***************************************************************************
+ **SWATPlus-IAHRIS
+ **A software that links SWATPlus to IAHRIS to automatically generate reports on Indicators of Hydrologic Alteration in RIverS.
+ **Watch mode: reports generated automatically when the SWAT+ outputs of a scenario change.
+----------------------------------------------------
+        begin                : **May-2025
+        copyright            : **COPYRIGHT
+        email                : **alopbal@upv.es
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 3 of the License, or     *
+ *   any later version.                                                    *
+ *                                                                         *
+ ***************************************************************************/
+
+Usage (same options as the batch mode):
+    python main.py watch --scenarios C:\\Model\\Scenarios --nat Default --alt Reservoir
+        --units all --output C:\\Reports [--debounce 10] [--poll]
+
+Changes of Scenarios/<name>/Results/swatplus_output.sqlite are detected with
+inotify on Linux and by polling the databases otherwise (or with --poll). A
+database is processed once it has not changed for --debounce seconds and SQLite
+has no journal pending. Only the channels whose daily flows changed (compared
+with a digest of every channel kept from the previous scan) are reported: a
+change of the natural scenario affects every alternative, a change of an
+alternative only that one.
+
+'channel_sd_day' is not read again while the database keeps its size and mtime
+(e.g. a Results folder touched by another file). Otherwise a watermark of the
+table (file, table definition, number of rows, largest rowid and SAMPLE_ROWS rows
+read by rowid) tells whether rows were only appended since the previous scan:
+then only the new rows are read. A database or table created again, deleted rows
+or rows of the sample rewritten (a new SWAT+ run imported again) rescan every
+channel; an update in place of a few rows outside the sample goes unnoticed. The
+digest of a channel is the sum of a 64-bit hash of each of its (day, flow) rows,
+so the digests updated with the new rows are those of a full rescan.
+"""
+
+import copy
+import ctypes
+import ctypes.util
+import itertools
+import os
+import select
+import sqlite3
+import struct
+import sys
+import time
+
+import numpy as np
+
+import batch
+import iahris_pipeline as pipeline
+import instrumentation
+import scenario_store
+from flow_series import ymd_to_dates
+from iahris_input import SWATPLUS_ROW
+
+
+# Seconds between two checks of the databases that are being written
+CHECK_SECONDS = 1.0
+
+# inotify events (see inotify(7))
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+EVENT = struct.Struct("iIII")  # wd, mask, cookie, len (then the name)
+
+# Events watched in the Scenarios folder, in a scenario and in its Results folder
+FOLDER_EVENTS = IN_CREATE | IN_MOVED_TO
+RESULTS_EVENTS = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+OUTPUT_FILE = "swatplus_output.sqlite"
+
+# Watermark of 'channel_sd_day' and the rows appended after a rowid (up to another)
+TABLE_QUERY = (
+    "SELECT rootpage, sql FROM sqlite_master WHERE type = 'table' "
+    "AND name = 'channel_sd_day'"
+)
+WATERMARK_QUERY = "SELECT COUNT(*), MAX(rowid) FROM channel_sd_day"
+SAMPLE_QUERY = (
+    "SELECT rowid, unit, yr, mon, day, flo_out FROM channel_sd_day "
+    "WHERE rowid IN ({}) ORDER BY rowid"
+)
+APPENDED_QUERY = """
+SELECT unit, yr, mon, day, flo_out
+FROM channel_sd_day
+WHERE rowid > ? AND rowid <= ?
+"""
+APPENDED_ROW = np.dtype(
+    [
+        ("unit", np.int64),
+        ("yr", np.int32),
+        ("mon", np.int32),
+        ("day", np.int32),
+        ("flo_out", np.float64),
+    ]
+)
+
+# Rows (evenly spread rowids) checked to be unchanged before reading only new rows
+SAMPLE_ROWS = 256
+
+# Multipliers of the splitmix64 finaliser (hash of every row)
+MIX_MULTIPLIERS = (np.uint64(0xBF58476D1CE4E5B9), np.uint64(0x94D049BB133111EB))
+
+
+def file_signature(path):
+    """(size, mtime_ns) of a file, None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def database_signature(sqlite):
+    """Signatures of a SWAT+ database and of its SQLite journal and WAL files"""
+    return tuple(file_signature(sqlite + suffix) for suffix in ("", "-journal", "-wal"))
+
+
+def is_complete(signature):
+    """True if the database exists and SQLite has no transaction pending"""
+    database, journal, wal = signature
+    return database is not None and journal is None and (wal is None or wal[0] == 0)
+
+
+class InotifyWatcher:
+    """Scenarios whose Results folder was touched, from inotify events (Linux)"""
+
+    def __init__(self, scenarios_folder):
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.libc.inotify_add_watch.argtypes = [
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_uint32,
+        ]
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify is not available")
+
+        self.scenarios_folder = scenarios_folder
+        self.watches = {}  # watch descriptor -> (level, scenario)
+        self.add(scenarios_folder, FOLDER_EVENTS, "scenarios", None)
+        for name in os.listdir(scenarios_folder):
+            if os.path.isdir(os.path.join(scenarios_folder, name)):
+                self.add_scenario(name)
+
+    def add(self, folder, events, level, scenario):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(folder), events)
+        if wd >= 0:
+            self.watches[wd] = (level, scenario)
+
+    def add_scenario(self, scenario):
+        folder = os.path.join(self.scenarios_folder, scenario)
+        self.add(folder, FOLDER_EVENTS, "scenario", scenario)
+        self.add_results(scenario)
+
+    def add_results(self, scenario):
+        folder = os.path.join(self.scenarios_folder, scenario, "Results")
+        if os.path.isdir(folder):
+            self.add(folder, RESULTS_EVENTS, "results", scenario)
+
+    def changes(self, timeout):
+        """Scenarios touched within 'timeout' seconds (None waits for an event)"""
+
+        touched = set()
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return touched
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return touched
+
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT.unpack_from(data, offset)
+            name = os.fsdecode(data[offset + EVENT.size : offset + EVENT.size + length])
+            name = name.rstrip("\0")
+            offset += EVENT.size + length
+
+            if mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+            level, scenario = self.watches.get(wd, (None, None))
+
+            # New scenarios and Results folders are watched as they appear (their
+            # database may already be there, e.g. when a folder is moved in)
+            if level == "scenarios" and mask & IN_ISDIR:
+                self.add_scenario(name)
+                touched.add(name)
+            elif level == "scenario" and mask & IN_ISDIR and name == "Results":
+                self.add_results(scenario)
+                touched.add(scenario)
+            elif level == "results" and name.startswith(OUTPUT_FILE):
+                touched.add(scenario)
+        return touched
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Scenarios whose database changed, comparing signatures every 'interval' seconds"""
+
+    def __init__(self, scenarios_folder, interval):
+        self.scenarios_folder = scenarios_folder
+        self.interval = interval
+        self.signatures = self.scan()
+
+    def scan(self):
+        signatures = {}
+        for name in os.listdir(self.scenarios_folder):
+            sqlite = pipeline.scenario_sqlite(self.scenarios_folder, name)
+            signature = database_signature(sqlite)
+            if any(signature):
+                signatures[name] = signature
+        return signatures
+
+    def changes(self, timeout):
+        """Scenarios changed since the previous call (waits at most 'interval')"""
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        signatures = self.scan()
+        touched = {
+            name
+            for name in set(signatures) | set(self.signatures)
+            if signatures.get(name) != self.signatures.get(name)
+        }
+        self.signatures = signatures
+        return touched
+
+    def close(self):
+        pass
+
+
+def make_watcher(args):
+    """inotify watcher if available (unless --poll), polling watcher otherwise"""
+    if not args.poll and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(args.scenarios)
+        except (OSError, AttributeError) as error:
+            print(f"inotify not available ({error}), polling every {args.poll_interval} s")
+    return PollingWatcher(args.scenarios, args.poll_interval)
+
+
+def mix(values):
+    """splitmix64 finaliser of a uint64 array (wrapping arithmetic)"""
+    values = values ^ (values >> np.uint64(30))
+    values = values * MIX_MULTIPLIERS[0]
+    values = values ^ (values >> np.uint64(27))
+    values = values * MIX_MULTIPLIERS[1]
+    return values ^ (values >> np.uint64(31))
+
+
+def row_hashes(days, flows):
+    """64-bit hash of every (epoch day, flow) row"""
+    days = np.ascontiguousarray(days, dtype=np.int64).view(np.uint64)
+    flows = np.ascontiguousarray(flows, dtype=np.float64).view(np.uint64)
+    return mix(mix(days) ^ flows)
+
+
+def channel_digests(sqlite):
+    """Digest (sum of the row hashes, rows) of the daily flows of every channel of a
+    database (one scan, a channel at a time)
+
+    The rows are hashed as they are (a channel with missing days changes too).
+    """
+    digests = {}
+    with instrumentation.stage("channel_digests") as record:
+        record["rows"] = 0
+        cursor = scenario_store.all_channel_rows(sqlite, 0, 9999)
+        for unit, rows in itertools.groupby(cursor, key=lambda row: row[0]):
+            data = np.fromiter((row[1:] for row in rows), dtype=SWATPLUS_ROW)
+            days = ymd_to_dates(data["yr"], data["mon"], data["day"]).astype(np.int64)
+            total = row_hashes(days, data["flo_out"]).sum(dtype=np.uint64)
+            digests[str(unit)] = (int(total), len(data))
+            record["rows"] += len(data)
+    return digests
+
+
+def table_watermark(conn, sqlite):
+    """(identity, rows, largest rowid) of 'channel_sd_day'
+
+    The identity (device and inode of the file, root page and definition of the
+    table) changes when the database file or the table is created again.
+    """
+    stat = os.stat(sqlite)
+    table = conn.execute(TABLE_QUERY).fetchone()
+    rows, max_rowid = conn.execute(WATERMARK_QUERY).fetchone()
+    return (stat.st_dev, stat.st_ino, table), rows, max_rowid or 0
+
+
+def sample_rows(conn, max_rowid):
+    """SAMPLE_ROWS rows of 'channel_sd_day' at evenly spread rowids up to max_rowid
+    (rowids and rows, to be read again at the next scan)"""
+    rowids = np.unique(np.linspace(1, max_rowid, SAMPLE_ROWS).astype(np.int64))
+    rowids = [int(rowid) for rowid in rowids] if max_rowid else []
+    query = SAMPLE_QUERY.format(", ".join("?" * len(rowids)))
+    return rowids, conn.execute(query, rowids).fetchall()
+
+
+def same_sample(conn, sample):
+    """True if the rows of a previous sample are unchanged"""
+    rowids, rows = sample
+    query = SAMPLE_QUERY.format(", ".join("?" * len(rowids)))
+    return conn.execute(query, rowids).fetchall() == rows
+
+
+def appended_digests(conn, after_rowid, max_rowid):
+    """Digests of the rows of every channel with after_rowid < rowid <= max_rowid"""
+
+    with instrumentation.stage("appended_rows") as record:
+        data = np.fromiter(
+            conn.execute(APPENDED_QUERY, (after_rowid, max_rowid)), dtype=APPENDED_ROW
+        )
+        record["rows"] = len(data)
+    if not len(data):
+        return {}
+
+    days = ymd_to_dates(data["yr"], data["mon"], data["day"]).astype(np.int64)
+    hashes = row_hashes(days, data["flo_out"])
+    order = np.argsort(data["unit"], kind="stable")
+    units, starts, counts = np.unique(
+        data["unit"][order], return_index=True, return_counts=True
+    )
+    totals = np.add.reduceat(hashes[order], starts)
+    return {
+        str(unit): (int(total), int(count))
+        for unit, total, count in zip(units, totals, counts)
+    }
+
+
+def scan_channels(sqlite, state):
+    """New scan state of a database and the channels whose flows changed
+
+    'state' is the state of the previous scan (None the first time): signature of
+    the files, watermark and sample of 'channel_sd_day' and digests of the channels.
+    """
+
+    # Nothing to read while the database is unchanged on disk
+    signature = database_signature(sqlite)
+    if state is not None and signature == state["signature"]:
+        return state, set()
+
+    conn = scenario_store.open_read_only(sqlite)
+    try:
+        # One read transaction: the watermark and the new rows are consistent
+        conn.execute("BEGIN")
+        identity, rows, max_rowid = table_watermark(conn, sqlite)
+        previous = {} if state is None else state["digests"]
+        appended = (
+            state is not None
+            and identity == state["identity"]
+            and rows - state["rows"] == max_rowid - state["max_rowid"] >= 0
+            and same_sample(conn, state["sample"])
+        )
+        if appended:
+            # Only the rows added since the previous scan
+            digests = dict(previous)
+            new_rows = appended_digests(conn, state["max_rowid"], max_rowid)
+            for unit, (total, count) in new_rows.items():
+                old_total, old_count = digests.get(unit, (0, 0))
+                digests[unit] = ((old_total + total) % 2**64, old_count + count)
+        sample = sample_rows(conn, max_rowid)
+    finally:
+        conn.close()
+    if not appended:
+        digests = channel_digests(sqlite)
+
+    state = {
+        "signature": signature,
+        "identity": identity,
+        "rows": rows,
+        "max_rowid": max_rowid,
+        "sample": sample,
+        "digests": digests,
+    }
+    changed = {unit for unit, digest in digests.items() if previous.get(unit) != digest}
+    return state, changed
+
+
+def changed_channels(args, scenario, states):
+    """Channels of a scenario whose flows changed since its previous scan"""
+    sqlite = pipeline.scenario_sqlite(args.scenarios, scenario)
+    # Pooled connections to a database that has been rewritten are not kept
+    scenario_store.close_all()
+    states[scenario], changed = scan_channels(sqlite, states.get(scenario))
+    return changed
+
+
+def affected_pairs(args, scenarios, states):
+    """Alternative -> channels to report after changes of some scenarios, and the
+    scenarios whose database could not be read (e.g. replaced during the scan or
+    without 'channel_sd_day' yet)"""
+
+    alts = batch.source_names(args.alt)
+    selected = None if args.units == "all" else set(batch.source_names(args.units))
+
+    affected = {alt: set() for alt in alts}
+    failed = []
+    for scenario in scenarios:
+        try:
+            units = changed_channels(args, scenario, states)
+        except sqlite3.Error as error:
+            print(f"[WARNING] {scenario}: cannot read the channels ({error}), retrying")
+            failed.append(scenario)
+            continue
+        if selected is not None:
+            units &= selected
+        for alt in alts:
+            if scenario in (args.nat, alt):
+                affected[alt] |= units
+    return {alt: units for alt, units in affected.items() if units}, failed
+
+
+def report(args, affected):
+    """Generate the reports of the affected pairs (alternatives with the same
+    channels share one batch run, and so one IAHRIS project per channel)"""
+
+    # Reports go to the same folders whichever alternatives changed
+    watched_alts = batch.source_names(args.alt)
+
+    groups = {}
+    for alt, units in affected.items():
+        groups.setdefault(frozenset(units), []).append(alt)
+
+    for units, alts in groups.items():
+        run_args = copy.copy(args)
+        run_args.alt = ",".join(alts)
+        run_args.alt_folders = len(watched_alts) > 1
+        run_args.units = ",".join(sorted(units, key=lambda unit: (len(unit), unit)))
+        print(f"Reporting {len(units)} channel(s) of {run_args.alt}")
+        try:
+            batch.run(run_args)
+        except (SystemExit, Exception) as error:
+            # A failed run (e.g. a channel with missing days) does not stop the watch
+            print(f"[FAILED] {run_args.alt}: {error}")
+
+
+def watch(args):
+    """Report the changes of the watched scenarios until interrupted"""
+
+    watched = {args.nat, *batch.source_names(args.alt)}
+    watched = {name for name in watched if not batch.is_csv(name)}
+
+    # Databases as they are now (and their channels) are taken as reported, unless
+    # --initial asks for a first report of everything
+    reported, states = {}, {}
+    for scenario in watched:
+        sqlite = pipeline.scenario_sqlite(args.scenarios, scenario)
+        if not args.initial and os.path.exists(sqlite):
+            try:
+                states[scenario], _ = scan_channels(sqlite, None)
+            except sqlite3.Error as error:
+                # Read again (and reported) once the database can be read
+                print(f"[WARNING] {scenario}: cannot read the channels ({error})")
+                continue
+            reported[scenario] = database_signature(sqlite)
+
+    watcher = make_watcher(args)
+    print(f"Watching {', '.join(sorted(watched))} in {args.scenarios} (Ctrl+C to stop)")
+    pending = dict.fromkeys(
+        [s for s in watched if s not in reported], (None, time.monotonic())
+    )
+    try:
+        while True:
+            for scenario in watcher.changes(CHECK_SECONDS if pending else None):
+                if scenario in watched:
+                    pending[scenario] = (None, time.monotonic())
+
+            # Debounce: a database is ready once it stays unchanged and complete
+            ready = []
+            now = time.monotonic()
+            for scenario, (last_signature, since) in list(pending.items()):
+                sqlite = pipeline.scenario_sqlite(args.scenarios, scenario)
+                signature = database_signature(sqlite)
+                if signature != last_signature:
+                    pending[scenario] = (signature, now)
+                elif now - since >= args.debounce and is_complete(signature):
+                    del pending[scenario]
+                    if signature != reported.get(scenario):
+                        reported[scenario] = signature
+                        ready.append(scenario)
+
+            if ready:
+                affected, failed = affected_pairs(args, ready, states)
+                # Unreadable databases are checked again after the debounce time
+                for scenario in failed:
+                    reported.pop(scenario, None)
+                    pending[scenario] = (None, time.monotonic())
+                if affected:
+                    report(args, affected)
+                elif len(failed) < len(ready):
+                    changed = [s for s in ready if s not in failed]
+                    print(f"No channel changed in {', '.join(changed)}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+    return 0
+
+
+def main(argv=None):
+    """Entry point of 'python main.py watch ...'"""
+
+    parser = batch.build_parser("main.py watch")
+    parser.description = "Generate IAHRIS reports when the SWAT+ outputs change."
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=10.0,
+        help="Seconds a database must stay unchanged before it is reported",
+    )
+    parser.add_argument(
+        "--poll", action="store_true", help="Poll the databases instead of inotify"
+    )
+    parser.add_argument(
+        "--poll-interval", type=float, default=5.0, help="Seconds between two polls"
+    )
+    parser.add_argument(
+        "--initial",
+        action="store_true",
+        help="Report every channel at start (otherwise only the later changes)",
+    )
+    args = parser.parse_args(sys.argv[2:] if argv is None else argv)
+    if not args.scenarios:
+        raise SystemExit("--scenarios is required in watch mode")
+    return watch(args)
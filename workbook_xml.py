@@ -0,0 +1,777 @@
+"""
+/***************************************************************************
+ **SWATPlus-IAHRIS
+ **A software that links SWATPlus to IAHRIS to automatically generate reports on Indicators of Hydrologic Alteration in RIverS.
+ **Direct access to the .xlsx package of the IAHRIS reports (no Excel or xlwings).
+----------------------------------------------------
+        begin                : **May-2025
+        copyright            : **COPYRIGHT
+        email                : **alopbal@upv.es
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 3 of the License, or     *
+ *   any later version.                                                    *
+ *                                                                         *
+ ***************************************************************************/
+
+An .xlsx file is a zip of XML parts: xl/workbook.xml lists the sheets and their
+relationship ids, xl/_rels/workbook.xml.rels maps the ids to the sheet parts and
+xl/sharedStrings.xml holds the text of the cells of type 's'.
+"""
+
+import html
+import os
+import posixpath
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+
+NS = {
+    "main": "http://schemas.openxmlformats.org/spreadsheetml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+}
+
+WORKBOOK_PART = "xl/workbook.xml"
+WORKBOOK_RELS_PART = "xl/_rels/workbook.xml.rels"
+SHARED_STRINGS_PART = "xl/sharedStrings.xml"
+
+
+def sheet_parts(workbook, rels):
+    """Sheet name -> part name (e.g. 'xl/worksheets/sheet1.xml') in workbook order
+
+    'workbook' and 'rels' are the contents of xl/workbook.xml and its relationships.
+    """
+
+    workbook = ET.fromstring(workbook)
+    rels = ET.fromstring(rels)
+    targets = {
+        rel.get("Id"): rel.get("Target") for rel in rels.findall("rel:Relationship", NS)
+    }
+
+    parts = {}
+    for sheet in workbook.find("main:sheets", NS):
+        target = targets[sheet.get(f"{{{NS['r']}}}id")]
+        # Targets are relative to xl/ (or absolute from the package root)
+        if target.startswith("/"):
+            part = target.lstrip("/")
+        else:
+            part = posixpath.normpath(posixpath.join("xl", target))
+        parts[sheet.get("name")] = part
+    return parts
+
+
+def shared_strings(package):
+    """Text of the shared strings of an open zip (rich text runs are joined)"""
+    if SHARED_STRINGS_PART not in package.namelist():
+        return []
+    root = ET.fromstring(package.read(SHARED_STRINGS_PART))
+    return [
+        "".join(t.text or "" for t in item.iter(f"{{{NS['main']}}}t"))
+        for item in root.findall("main:si", NS)
+    ]
+
+
+def cell_value(cell, strings):
+    """Value of a <c> element: float, text or None"""
+
+    cell_type = cell.get("t")
+    if cell_type == "inlineStr":
+        return "".join(t.text or "" for t in cell.iter(f"{{{NS['main']}}}t"))
+
+    value = cell.find("main:v", NS)
+    if value is None or value.text is None:
+        return None
+    if cell_type == "s":
+        return strings[int(value.text)]
+    if cell_type in ("str", "e"):
+        return value.text
+    if cell_type == "b":
+        return value.text == "1"
+    return float(value.text)
+
+
+def read_cells(xlsx, sheet_name, refs=None):
+    """Values (cached results of formulas included) of the cells of a sheet
+
+    Returns a dict ref -> value: every cell with a value when 'refs' is None,
+    otherwise only those cells (None for empty or missing ones).
+    """
+
+    refs = None if refs is None else set(refs)
+    values = {} if refs is None else dict.fromkeys(refs)
+    with zipfile.ZipFile(xlsx) as package:
+        strings = shared_strings(package)
+        part = sheet_parts(
+            package.read(WORKBOOK_PART), package.read(WORKBOOK_RELS_PART)
+        )[sheet_name]
+        with package.open(part) as sheet:
+            for _, element in ET.iterparse(sheet):
+                if element.tag == f"{{{NS['main']}}}c":
+                    ref = element.get("r")
+                    if refs is None or ref in refs:
+                        value = cell_value(element, strings)
+                        if refs is not None or value is not None:
+                            values[ref] = value
+                    element.clear()
+    return values
+
+
+# Sheet reference of a formula: 'Quoted name'! or Name!
+# String literals are matched (and ignored) so that their text is never taken for a
+# sheet name, and error values such as #NUM! are not references either
+SHEET_REF = re.compile(r""""(?:[^"]|"")*"|'((?:[^']|'')+)'!|(?<![#\w.])([^\W\d][\w.]*)!""")
+CELL = re.compile(r"<c\b([^>]*?)(?:/>|>(.*?)</c>)", re.S)
+FORMULA = re.compile(r"<f\b([^>]*?)(?:/>|>(.*?)</f>)", re.S)
+RELATIONSHIP = re.compile(r"<Relationship\b[^>]*/>")
+ROOT_RELS_PART = "_rels/.rels"
+CONTENT_TYPES_PART = "[Content_Types].xml"
+
+
+def attribute(element, name):
+    """Unescaped value of an attribute in the text of an XML start tag (None if absent)"""
+    match = re.search(rf'\b{name}="([^"]*)"', element)
+    return html.unescape(match.group(1)) if match else None
+
+
+def quote_sheet(name):
+    """Sheet name as written before '!' in a formula"""
+    if re.fullmatch(r"[^\W\d]\w*", name):
+        return name
+    return "'" + name.replace("'", "''") + "'"
+
+
+def referenced_sheets(formula):
+    """Names of the sheets referenced by a formula (XML-escaped text)"""
+    return {
+        quoted.replace("''", "'") if quoted else plain
+        for quoted, plain in SHEET_REF.findall(html.unescape(formula))
+        if quoted or plain
+    }
+
+
+def rename_references(formula, renames):
+    """Formula (XML-escaped text) with the references to renamed sheets updated"""
+
+    def replace(match):
+        name = match.group(1).replace("''", "'") if match.group(1) else match.group(2)
+        if name is None or name not in renames:
+            return match.group(0)
+        return xml_escape(quote_sheet(renames[name])) + "!"
+
+    return SHEET_REF.sub(
+        replace, formula.replace("&apos;", "'").replace("&quot;", '"')
+    )
+
+
+def xml_escape(text):
+    """Text escaped for XML content and attributes"""
+    return html.escape(text, quote=True).replace("&#x27;", "'")
+
+
+def rels_part(part):
+    """Relationships part of a part ('xl/workbook.xml' -> 'xl/_rels/workbook.xml.rels')"""
+    folder, name = posixpath.split(part)
+    return posixpath.join(folder, "_rels", name + ".rels")
+
+
+def relationship_targets(parts, part):
+    """Parts targeted by the (internal) relationships of a part"""
+
+    rels = parts.get(rels_part(part) if part else ROOT_RELS_PART)
+    if rels is None:
+        return []
+    targets = []
+    for relationship in RELATIONSHIP.findall(rels.decode("utf-8")):
+        if attribute(relationship, "TargetMode") == "External":
+            continue
+        target = attribute(relationship, "Target")
+        if target.startswith("/"):
+            targets.append(target.lstrip("/"))
+        else:
+            folder = posixpath.dirname(part) if part else ""
+            targets.append(posixpath.normpath(posixpath.join(folder, target)))
+    return targets
+
+
+def reachable_parts(parts):
+    """Parts reachable from the package relationships (with their .rels parts)"""
+
+    reachable = {CONTENT_TYPES_PART, ROOT_RELS_PART}
+    pending = relationship_targets(parts, "")
+    while pending:
+        part = pending.pop()
+        if part in reachable or part not in parts:
+            continue
+        reachable.add(part)
+        if rels_part(part) in parts:
+            reachable.add(rels_part(part))
+        pending.extend(relationship_targets(parts, part))
+    return reachable
+
+
+def read_package(xlsx):
+    """Parts of an .xlsx file (name -> bytes) in the order of the zip"""
+    with zipfile.ZipFile(xlsx) as package:
+        return {name: package.read(name) for name in package.namelist()}
+
+
+def write_package(parts, output_path):
+    """Write the parts of an .xlsx file (the content types part first)"""
+    names = [CONTENT_TYPES_PART] + [name for name in parts if name != CONTENT_TYPES_PART]
+    with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as package:
+        for name in names:
+            package.writestr(name, parts[name])
+
+
+def static_cell(attributes, content):
+    """Cell without its formula, keeping the cached value"""
+
+    content = FORMULA.sub("", content or "")
+    if attribute(attributes, "t") == "str":
+        # Text results of formulas become inline strings
+        value = re.search(r"<v>(.*?)</v>", content, re.S)
+        text = value.group(1) if value else ""
+        attributes = re.sub(r'\bt="str"', 't="inlineStr"', attributes)
+        content = re.sub(
+            r"<v>.*?</v>", "", content, flags=re.S
+        ) + f'<is><t xml:space="preserve">{text}</t></is>'
+    return f"<c{attributes}>{content}</c>" if content else f"<c{attributes}/>"
+
+
+def subset_sheet(sheet, removed, renames, selected):
+    """Sheet XML for a workbook without the 'removed' sheets
+
+    Formulas that reference removed sheets keep only their cached value (shared
+    formulas as a whole group); the other references are renamed. Only the first
+    sheet of the new workbook is selected.
+    """
+
+    # Shared formulas whose master cell references a removed sheet
+    broken_groups = set()
+    for attributes, formula in FORMULA.findall(sheet):
+        if formula and attribute(attributes, "t") == "shared":
+            if referenced_sheets(formula) & removed:
+                broken_groups.add(attribute(attributes, "si"))
+
+    def cell(match):
+        attributes, content = match.group(1), match.group(2)
+        if not content or "<f" not in content:
+            return match.group(0)
+        formula = FORMULA.search(content)
+        formula_attributes, text = formula.group(1), formula.group(2) or ""
+        if referenced_sheets(text) & removed or (
+            attribute(formula_attributes, "t") == "shared"
+            and attribute(formula_attributes, "si") in broken_groups
+        ):
+            return static_cell(attributes, content)
+        if renames and text:
+            return match.group(0).replace(text, rename_references(text, renames), 1)
+        return match.group(0)
+
+    sheet = CELL.sub(cell, sheet)
+
+    # Hyperlinks to other sheets
+    def hyperlink(match):
+        location = attribute(match.group(0), "location")
+        if location is None:
+            return match.group(0)
+        if referenced_sheets(location) & removed:
+            return ""
+        return re.sub(
+            r'\blocation="[^"]*"',
+            lambda m: 'location="' + rename_references(m.group(0)[10:-1], renames) + '"',
+            match.group(0),
+        )
+
+    sheet = re.sub(r"<hyperlink\b[^>]*/>", hyperlink, sheet)
+    sheet = sheet.replace("<hyperlinks></hyperlinks>", "")
+
+    # Only the first sheet is selected (several selected tabs would be grouped)
+    sheet = sheet.replace(' tabSelected="1"', "")
+    if selected:
+        sheet = sheet.replace("<sheetView ", '<sheetView tabSelected="1" ', 1)
+    return sheet
+
+
+def subset_chart(chart, removed, renames):
+    """Chart XML: series of removed sheets become literals (cached values), others renamed"""
+
+    def reference(match):
+        kind, body = match.group(1), match.group(2)
+        formula = re.search(r"<c:f>([^<]*)</c:f>", body)
+        if formula is None:
+            return match.group(0)
+        if referenced_sheets(formula.group(1)) & removed:
+            cache = re.search(rf"<c:{kind}Cache>(.*?)</c:{kind}Cache>", body, re.S)
+            return f"<c:{kind}Lit>{cache.group(1) if cache else ''}</c:{kind}Lit>"
+        renamed = rename_references(formula.group(1), renames)
+        return match.group(0).replace(formula.group(0), f"<c:f>{renamed}</c:f>", 1)
+
+    # Series names are single values
+    def series_name(match):
+        if referenced_sheets(match.group(1)) & removed:
+            text = re.search(r"<c:v>(.*?)</c:v>", match.group(2), re.S)
+            return f"<c:tx><c:v>{text.group(1) if text else ''}</c:v></c:tx>"
+        return match.group(0)
+
+    chart = re.sub(
+        r"<c:tx><c:strRef><c:f>([^<]*)</c:f>(.*?)</c:strRef></c:tx>",
+        series_name,
+        chart,
+        flags=re.S,
+    )
+    chart = re.sub(
+        r"<c:(num|str)Ref>(.*?)</c:\1Ref>",
+        reference,
+        chart,
+        flags=re.S,
+    )
+    # Full ranges of filtered series are dropped with the sheets they point to
+    chart = re.sub(
+        r"<c:ext\b[^>]*><c15:fullRef><c15:sqref>(.*?)</c15:sqref></c15:fullRef></c:ext>",
+        lambda m: "" if referenced_sheets(m.group(1)) & removed else m.group(0),
+        chart,
+        flags=re.S,
+    )
+    # Other references (e.g. data label ranges) are only renamed
+    return re.sub(
+        r"(<c15:f>|<c15:sqref>|<cx:f[^>]*>)(.*?)(</c15:f>|</c15:sqref>|</cx:f>)",
+        lambda m: m.group(1) + rename_references(m.group(2), renames) + m.group(3),
+        chart,
+        flags=re.S,
+    )
+
+
+def subset_workbook(workbook, rels, kept, removed, renames):
+    """workbook.xml and its relationships with only the kept sheets"""
+
+    sheets = re.findall(r"<sheet\b[^>]*/>", workbook)
+    names = [attribute(sheet, "name") for sheet in sheets]
+    positions = {name: i for i, name in enumerate(n for n in names if n in kept)}
+    old_positions = {i: name for i, name in enumerate(names)}
+    removed_ids = {
+        attribute(sheet, "r:id") for sheet in sheets if attribute(sheet, "name") in removed
+    }
+
+    # Sheets (renamed)
+    def sheet(match):
+        name = attribute(match.group(0), "name")
+        if name in removed:
+            return ""
+        new_name = renames.get(name, name)
+        return re.sub(r'\bname="[^"]*"', f'name="{xml_escape(new_name)}"', match.group(0))
+
+    workbook = re.sub(r"<sheet\b[^>]*/>", sheet, workbook)
+
+    # Defined names of the kept sheets (local names follow the new sheet positions)
+    def defined_name(match):
+        attributes, formula = match.group(1), match.group(2)
+        local = attribute(attributes, "localSheetId")
+        if local is not None:
+            name = old_positions.get(int(local))
+            if name not in positions:
+                return ""
+            attributes = re.sub(
+                r'\blocalSheetId="\d+"', f'localSheetId="{positions[name]}"', attributes
+            )
+        if referenced_sheets(formula) & removed:
+            return ""
+        return f"<definedName{attributes}>{rename_references(formula, renames)}</definedName>"
+
+    workbook = re.sub(
+        r"<definedName\b([^>]*)>(.*?)</definedName>", defined_name, workbook, flags=re.S
+    )
+    workbook = workbook.replace("<definedNames></definedNames>", "")
+
+    # The first sheet is the active one
+    workbook = re.sub(r'\s(?:activeTab|firstSheet)="\d+"', "", workbook)
+
+    # Relationships without the removed sheets and the calculation chain (rebuilt by Excel)
+    def relationship(match):
+        if attribute(match.group(0), "Id") in removed_ids:
+            return ""
+        if attribute(match.group(0), "Type").endswith("/calcChain"):
+            return ""
+        return match.group(0)
+
+    rels = RELATIONSHIP.sub(relationship, rels)
+    return workbook, rels
+
+
+def subset_app_properties(app, sheet_names):
+    """docProps/app.xml listing only the sheets of the new workbook"""
+
+    heading = re.search(
+        r"<HeadingPairs>.*?<vt:lpstr>(.*?)</vt:lpstr>", app, re.S
+    )
+    label = heading.group(1) if heading else "Worksheets"
+    titles = "".join(f"<vt:lpstr>{xml_escape(name)}</vt:lpstr>" for name in sheet_names)
+    app = re.sub(
+        r"<HeadingPairs>.*?</HeadingPairs>",
+        '<HeadingPairs><vt:vector size="2" baseType="variant"><vt:variant>'
+        f"<vt:lpstr>{label}</vt:lpstr></vt:variant><vt:variant>"
+        f"<vt:i4>{len(sheet_names)}</vt:i4></vt:variant></vt:vector></HeadingPairs>",
+        app,
+        flags=re.S,
+    )
+    return re.sub(
+        r"<TitlesOfParts>.*?</TitlesOfParts>",
+        f'<TitlesOfParts><vt:vector size="{len(sheet_names)}" baseType="lpstr">'
+        f"{titles}</vt:vector></TitlesOfParts>",
+        app,
+        flags=re.S,
+    )
+
+
+def subset_package(parts, sheet_names, renames=None):
+    """Parts of a workbook with only some sheets of another one (renamed with 'renames')"""
+
+    renames = renames or {}
+    sheet_part_names = sheet_parts(parts[WORKBOOK_PART], parts[WORKBOOK_RELS_PART])
+    kept = [name for name in sheet_part_names if name in set(sheet_names)]
+    if not kept:
+        raise ValueError("None of the selected sheets is in the workbook")
+    removed = set(sheet_part_names) - set(kept)
+
+    new_parts = dict(parts)
+    workbook, rels = subset_workbook(
+        parts[WORKBOOK_PART].decode("utf-8"),
+        parts[WORKBOOK_RELS_PART].decode("utf-8"),
+        set(kept),
+        removed,
+        renames,
+    )
+    new_parts[WORKBOOK_PART] = workbook.encode("utf-8")
+    new_parts[WORKBOOK_RELS_PART] = rels.encode("utf-8")
+
+    # Drop every part that is no longer reachable (removed sheets, their drawings...)
+    reachable = reachable_parts(new_parts)
+    new_parts = {name: data for name, data in new_parts.items() if name in reachable}
+
+    for i, name in enumerate(kept):
+        part = sheet_part_names[name]
+        new_parts[part] = subset_sheet(
+            parts[part].decode("utf-8"), removed, renames, selected=(i == 0)
+        ).encode("utf-8")
+    for part in new_parts:
+        if re.fullmatch(r"xl/charts/chart(?:Ex)?\d+\.xml", part):
+            new_parts[part] = subset_chart(
+                new_parts[part].decode("utf-8"), removed, renames
+            ).encode("utf-8")
+
+    # Content types of the remaining parts only
+    content_types = re.sub(
+        r'<Override PartName="/([^"]*)"[^>]*/>',
+        lambda m: m.group(0) if m.group(1) in new_parts else "",
+        parts[CONTENT_TYPES_PART].decode("utf-8"),
+    )
+    new_parts[CONTENT_TYPES_PART] = content_types.encode("utf-8")
+
+    if "docProps/app.xml" in new_parts:
+        new_parts["docProps/app.xml"] = subset_app_properties(
+            new_parts["docProps/app.xml"].decode("utf-8"),
+            [renames.get(name, name) for name in kept],
+        ).encode("utf-8")
+    return new_parts
+
+
+def export_sheets(xlsx, exports, renames=None, done=None):
+    """Write several workbooks with selected sheets of an .xlsx, reading it only once
+
+    'exports' is a list of (sheet names, output path); done(i, output path) is
+    called after each workbook is written.
+    """
+    parts = read_package(xlsx)
+    for i, (sheet_names, output_path) in enumerate(exports):
+        write_package(subset_package(parts, sheet_names, renames), output_path)
+        if done is not None:
+            done(i, output_path)
+
+
+# Tokens of the label formulas of the reports: CONCATENATE/UPPER of strings and cells
+LABEL_TOKEN = re.compile(
+    r"""\s*(?:"((?:[^"]|"")*)"|(CONCATENATE|UPPER)\(|(?:('?)([^'!(),"]+)\3!)?"""
+    r"""\$?([A-Z]{1,3})\$?(\d+)|([(),]))"""
+)
+
+
+def evaluate_label(formula, sheet_name, values):
+    """Text result of a label formula, or None if it is not one
+
+    Only CONCATENATE, UPPER, string literals and references to the cells of
+    'values' ((sheet name, ref) -> text) are understood, and at least one of those
+    cells must be referenced; unqualified references belong to 'sheet_name'.
+    """
+
+    tokens = []
+    position = 0
+    formula = formula.strip()
+    while position < len(formula):
+        match = LABEL_TOKEN.match(formula, position)
+        if match is None:
+            return None
+        tokens.append(match.groups())
+        position = match.end()
+
+    def expression(i):
+        literal, function, _, sheet, column, row, symbol = tokens[i]
+        if literal is not None:
+            return literal.replace('""', '"'), i + 1
+        if column is not None:
+            key = (sheet or sheet_name, column + row)
+            if key not in values:
+                raise ValueError(key)
+            used.add(key)
+            return values[key], i + 1
+        if function is None:
+            raise ValueError(symbol)
+        arguments = []
+        i += 1
+        while tokens[i][6] != ")":
+            if tokens[i][6] == ",":
+                i += 1
+                continue
+            value, i = expression(i)
+            arguments.append(value)
+        text = "".join(arguments)
+        return (text.upper() if function == "UPPER" else text), i + 1
+
+    used = set()
+    try:
+        text, end = expression(0)
+    except (ValueError, IndexError):
+        return None
+    return text if end == len(tokens) and used else None
+
+
+def column_number(ref):
+    """Column of a cell reference as a number ('AB2' -> 28)"""
+    number = 0
+    for letter in re.match(r"[A-Z]+", ref).group(0):
+        number = number * 26 + ord(letter) - 64
+    return number
+
+
+def string_index(strings, si_items, text):
+    """Index of a text in the shared strings, appending it if it is new"""
+    if text in strings:
+        return strings.index(text)
+    strings.append(text)
+    si_items.append(f'<si><t xml:space="preserve">{xml_escape(text)}</t></si>')
+    return len(strings) - 1
+
+
+def set_sheet_cells(sheet, values, strings, si_items):
+    """Sheet XML with text values set ("" clears the cell, keeping its style)
+
+    Returns the new XML and the change of the number of shared string cells.
+    """
+
+    pending = dict(values)
+    count_change = 0
+
+    def cell(match):
+        nonlocal count_change
+        attributes = match.group(1)
+        ref = attribute(attributes, "r")
+        if ref not in pending:
+            return match.group(0)
+        text = pending.pop(ref)
+        if attribute(attributes, "t") == "s":
+            count_change -= 1
+        attributes = re.sub(r'\s+t="[^"]*"', "", attributes)
+        if not text:
+            return f"<c{attributes}/>"
+        count_change += 1
+        index = string_index(strings, si_items, text)
+        return f'<c{attributes} t="s"><v>{index}</v></c>'
+
+    sheet = CELL.sub(cell, sheet)
+
+    # Cells that do not exist yet (inserted in column order, in a new row if needed)
+    for ref, text in pending.items():
+        if not text:
+            continue
+        count_change += 1
+        index = string_index(strings, si_items, text)
+        new_cell = f'<c r="{ref}" t="s"><v>{index}</v></c>'
+        row_number = re.search(r"\d+", ref).group(0)
+        row = re.search(
+            rf'<row\b[^>]*\br="{row_number}"[^>]*?(?:/>|>(.*?)</row>)', sheet, re.S
+        )
+        if row is None:
+            after = [
+                m for m in re.finditer(r'<row\b[^>]*\br="(\d+)"', sheet)
+                if int(m.group(1)) > int(row_number)
+            ]
+            new_row = f'<row r="{row_number}">{new_cell}</row>'
+            if after:
+                sheet = sheet[: after[0].start()] + new_row + sheet[after[0].start():]
+            else:
+                sheet = sheet.replace("</sheetData>", new_row + "</sheetData>", 1)
+                sheet = sheet.replace(
+                    "<sheetData/>", f"<sheetData>{new_row}</sheetData>", 1
+                )
+            continue
+        cells = row.group(1) or ""
+        position = len(cells)
+        for existing in CELL.finditer(cells):
+            if column_number(attribute(existing.group(1), "r")) > column_number(ref):
+                position = existing.start()
+                break
+        cells = cells[:position] + new_cell + cells[position:]
+        start_tag = re.match(r"<row\b[^>]*?(?=/?>)", row.group(0)).group(0)
+        sheet = sheet[: row.start()] + f"{start_tag}>{cells}</row>" + sheet[row.end():]
+    return sheet, count_change
+
+
+def refresh_labels(sheet, sheet_name, values):
+    """Cached results of the label formulas that depend on the changed cells"""
+
+    def cell(match):
+        attributes, content = match.group(1), match.group(2)
+        if not content or "<f>" not in content:
+            return match.group(0)
+        formula = re.search(r"<f>(.*?)</f>", content, re.S).group(1)
+        text = evaluate_label(html.unescape(formula), sheet_name, values)
+        if text is None:
+            return match.group(0)
+        attributes = re.sub(r'\s+t="[^"]*"', "", attributes)
+        return f'<c{attributes} t="str"><f>{formula}</f><v>{xml_escape(text)}</v></c>'
+
+    return CELL.sub(cell, sheet)
+
+
+# Relationship and content type of a new shared strings part
+SHARED_STRINGS_TYPE = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings"
+)
+SHARED_STRINGS_CONTENT_TYPE = (
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"
+)
+
+
+def add_shared_strings_part(contents, changed):
+    """Empty shared strings of a package without them, with their relationship and
+    content type (the relationships and content types go to 'changed')"""
+
+    rels = contents[WORKBOOK_RELS_PART].decode("utf-8")
+    ids = [int(i) for i in re.findall(r'\bId="rId(\d+)"', rels)]
+    relationship = (
+        f'<Relationship Id="rId{max(ids, default=0) + 1}" '
+        f'Type="{SHARED_STRINGS_TYPE}" Target="sharedStrings.xml"/>'
+    )
+    changed[WORKBOOK_RELS_PART] = rels.replace(
+        "</Relationships>", relationship + "</Relationships>", 1
+    )
+
+    types = contents[CONTENT_TYPES_PART].decode("utf-8")
+    override = (
+        f'<Override PartName="/{SHARED_STRINGS_PART}" '
+        f'ContentType="{SHARED_STRINGS_CONTENT_TYPE}"/>'
+    )
+    changed[CONTENT_TYPES_PART] = types.replace("</Types>", override + "</Types>", 1)
+
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f'<sst xmlns="{NS["main"]}" count="0" uniqueCount="0"></sst>'
+    )
+
+
+def set_cells(xlsx, values, sheet_name=None):
+    """Set text cells of a sheet (the first one by default) directly in the .xlsx
+
+    'values' is a dict ref -> text ("" clears the value and keeps the style). The
+    shared strings are extended as needed (and created if the package has none),
+    the cached results of the label formulas (CONCATENATE/UPPER of the changed
+    cells) are refreshed and Excel is asked to recalculate the rest on load. Only
+    the sheets that reference the changed sheet are parsed; the parts that do not
+    change are copied unchanged.
+    """
+
+    with zipfile.ZipFile(xlsx) as package:
+        infos = package.infolist()
+        contents = {info.filename: package.read(info) for info in infos}
+        strings = shared_strings(package)
+    workbook = contents[WORKBOOK_PART].decode("utf-8")
+    sheets = sheet_parts(contents[WORKBOOK_PART], contents[WORKBOOK_RELS_PART])
+    sheet_name = sheet_name or next(iter(sheets))
+
+    # The sheet of the cells and the sheets with formulas that may reference it
+    # (quoted or not, apostrophes escaped or not)
+    references = (sheet_name + "!", "'" + sheet_name.replace("'", "''") + "'!")
+    markers = {
+        text.encode("utf-8")
+        for reference in references
+        for text in (
+            reference,
+            xml_escape(reference),
+            xml_escape(reference).replace("'", "&apos;"),
+        )
+    }
+    sheet_xml = {
+        name: contents[part].decode("utf-8")
+        for name, part in sheets.items()
+        if name == sheet_name or any(marker in contents[part] for marker in markers)
+    }
+
+    # The cells themselves
+    changed = {}
+    si_items = []
+    sheet_xml[sheet_name], count_change = set_sheet_cells(
+        sheet_xml[sheet_name], values, strings, si_items
+    )
+    changed[sheets[sheet_name]] = sheet_xml[sheet_name]
+
+    # Formulas that show the new labels
+    labels = {(sheet_name, ref): text for ref, text in values.items()}
+    for name, sheet in sheet_xml.items():
+        refreshed = refresh_labels(sheet, name, labels)
+        if name == sheet_name or refreshed != sheet:
+            changed[sheets[name]] = refreshed
+
+    # Shared strings: new items and counts (the part only exists when needed)
+    if SHARED_STRINGS_PART in contents:
+        sst = contents[SHARED_STRINGS_PART].decode("utf-8")
+    elif si_items:
+        sst = add_shared_strings_part(contents, changed)
+    else:
+        sst = None
+    if sst is not None and (si_items or count_change):
+        count = int(attribute(re.search(r"<sst\b[^>]*>", sst).group(0), "count") or 0)
+        sst = re.sub(
+            r'(<sst\b[^>]*?\bcount=")\d+', rf"\g<1>{count + count_change}", sst, 1
+        )
+        sst = re.sub(
+            r'(<sst\b[^>]*?\buniqueCount=")\d+', rf"\g<1>{len(strings)}", sst, 1
+        )
+        sst = sst.replace("</sst>", "".join(si_items) + "</sst>", 1)
+        changed[SHARED_STRINGS_PART] = sst
+
+    # Other results (e.g. in charts) are recalculated when Excel opens the file
+    if "fullCalcOnLoad" not in workbook:
+        workbook = re.sub(r"<calcPr\b", '<calcPr fullCalcOnLoad="1"', workbook, 1)
+    changed[WORKBOOK_PART] = workbook
+
+    # Rewrite the package next to it and replace it
+    temporary = xlsx + ".tmp"
+    try:
+        with zipfile.ZipFile(temporary, "w") as package:
+            for info in infos:
+                if info.filename in changed:
+                    package.writestr(info, changed.pop(info.filename).encode("utf-8"))
+                else:
+                    package.writestr(info, contents[info.filename])
+            # New parts (the shared strings of a package that had none)
+            for part, text in changed.items():
+                package.writestr(part, text.encode("utf-8"), zipfile.ZIP_DEFLATED)
+        os.replace(temporary, xlsx)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)